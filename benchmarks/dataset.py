@@ -0,0 +1,91 @@
+# benchmarks/dataset.py
+"""
+產生接近真實使用情況的合成任務資料：中英文混合的內容、備註中的網址、狀態比例與到期日分布。
+相同的 count 與 seed 一定產生相同的資料，方便前後比較。
+
+    python benchmarks/dataset.py 100000 -o /tmp/tasks_100k.json
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from record_calender.data_manager import TaskDataManager
+
+REFERENCE_DAY = date(2025, 6, 1) # 到期日分布的中心；固定日期讓結果可以重現
+STATUS_WEIGHTS = {"Pending": 45, "In progress": 15, "Completed": 30, "Cancelled": 5, "On hold": 5}
+CJK_WORDS = ["買", "牛奶", "報告", "會議", "整理", "文件", "回覆", "郵件", "預約", "醫生", "繳費", "電費",
+             "準備", "簡報", "專案", "進度", "檢查", "備份", "打電話", "給", "客戶", "修理", "腳踏車", "讀書"]
+LATIN_WORDS = ["review", "PR", "deploy", "invoice", "meeting", "with", "team", "fix", "bug", "update", "docs",
+               "call", "plan", "sprint", "release", "Q3", "budget", "draft", "email", "lunch", "API", "test"]
+URL_HOSTS = ["https://example.com", "https://docs.example.org", "https://github.com/example/repo", "https://www.youtube.com"]
+
+def _phrase(rng, min_words, max_words):
+    """中英文混合的短句：大約一半的詞為中文（中文詞之間不加空格）"""
+    parts = []
+    previous_cjk = False
+    for _ in range(rng.randint(min_words, max_words)):
+        cjk = rng.random() < 0.5
+        word = rng.choice(CJK_WORDS if cjk else LATIN_WORDS)
+        parts.append(word if cjk and previous_cjk else " " + word)
+        previous_cjk = cjk
+    return "".join(parts).strip()
+
+def _note(rng):
+    roll = rng.random()
+    if roll < 0.5:
+        return ""
+    if roll < 0.75: # 網址，有時帶查詢字串
+        url = f"{rng.choice(URL_HOSTS)}/{rng.randrange(10 ** 6)}"
+        return url + (f"?ref={rng.randrange(1000)}&lang=zh-TW" if rng.random() < 0.3 else "")
+    if roll < 0.9:
+        return _phrase(rng, 3, 12)
+    # 多行備註，夾雜網址
+    return "\n".join([_phrase(rng, 2, 8), f"{rng.choice(URL_HOSTS)}/item/{rng.randrange(10 ** 5)}", _phrase(rng, 2, 6)])
+
+def generate_tasks(count, seed=0):
+    """
+    產生 count 個任務（與資料檔相同的欄位）。
+    :param seed: 亂數種子
+    :return: 任務列表，ID 為 0..count-1，建立時間遞增
+    """
+    rng = random.Random(seed)
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    reference = REFERENCE_DAY.toordinal()
+    created = datetime(2023, 1, 1)
+    step = max(1, int(2.5 * 365 * 86400 / max(count, 1))) # 建立時間平均分布在約兩年半之間
+    tasks = []
+    for task_id in range(count):
+        created += timedelta(seconds=rng.randint(1, step * 2))
+        if rng.random() < 0.2:
+            due_date = None
+        else: # 大部分集中在參考日前後一個月，少數分散在一年之內
+            spread = 30 if rng.random() < 0.7 else 365
+            due_date = date.fromordinal(reference + int(rng.gauss(0, spread))).isoformat()
+        tasks.append({
+            'id': task_id,
+            'description': _phrase(rng, 1, 8),
+            'due_date': due_date,
+            'status': rng.choices(statuses, weights)[0],
+            'note': _note(rng),
+            'creation_time': created.strftime('%Y-%m-%d %H:%M:%S'),
+            'image_path': f"images/task_{task_id}.png" if rng.random() < 0.02 else None,
+        })
+    return tasks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="產生合成的任務資料檔")
+    parser.add_argument("count", type=int)
+    parser.add_argument("-o", "--output", required=True, help="輸出的資料檔（與 todo_calendar.json 相同格式）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    TaskDataManager(args.output, backup_interval=None).save_tasks(generate_tasks(args.count, args.seed))
+    print(f"wrote {args.count} tasks to {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+if __name__ == "__main__":
+    main()
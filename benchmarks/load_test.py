@@ -0,0 +1,124 @@
+# benchmarks/load_test.py
+"""
+TaskServer 的負載測試：多個 keep-alive 連線同時送出讀寫混合的請求（可 pipelining），
+輸出每秒請求數與延遲的百分位數。
+
+    python benchmarks/load_test.py                       # 在子程序中啟動伺服器（暫存資料檔）
+    python benchmarks/load_test.py --connections 50 --pipeline 8 --write-ratio 0.2
+    python benchmarks/load_test.py --url 127.0.0.1:8765  # 對已在執行的伺服器測試
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager
+
+def encode_request(method, path, data=None):
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8') if data is not None else b''
+    return (f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return int(head.split(b" ", 2)[1])
+
+def make_request(rng, write_ratio, task_count):
+    """隨機產生一個請求：寫入（新增或修改）或讀取（單筆或小範圍查詢）"""
+    if rng.random() < write_ratio:
+        if rng.random() < 0.5 or not task_count:
+            return encode_request("POST", "/tasks", {"description": f"load test {rng.random():.6f}", "due_date": "2025-05-25"})
+        return encode_request("PATCH", f"/tasks/{rng.randrange(task_count)}", {"note": f"note {rng.random():.6f}"})
+    if rng.random() < 0.7 and task_count:
+        return encode_request("GET", f"/tasks/{rng.randrange(task_count)}")
+    return encode_request("GET", "/tasks?status=Pending&due_on=2025-05-25&limit=20")
+
+async def run_connection(host, port, requests, pipeline, write_ratio, task_count, latencies, statuses, seed):
+    """一個連線：最多 pipeline 個請求在途中，記錄每個請求從送出到收到回應的時間"""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    in_flight = asyncio.Semaphore(pipeline)
+    sent_at = []
+    async def receive():
+        for index in range(requests):
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - sent_at[index])
+            statuses[status] = statuses.get(status, 0) + 1
+            in_flight.release()
+    receiver = asyncio.create_task(receive())
+    for _ in range(requests):
+        await in_flight.acquire()
+        sent_at.append(time.perf_counter())
+        writer.write(make_request(rng, write_ratio, task_count))
+    await receiver
+    writer.close()
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+async def start_server_process(task_count):
+    """在子程序中啟動伺服器（暫存資料檔），避免與負載產生端共用 GIL"""
+    data_file = os.path.join(tempfile.mkdtemp(), "tasks.json")
+    task_manager = TaskManager(TaskDataManager(data_file))
+    first_day = date(2025, 1, 1).toordinal()
+    task_manager.add_tasks_bulk({'description': f"seed {i}", 'due_date': date.fromordinal(first_day + i % 365).isoformat()}
+                                for i in range(task_count))
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "record_calender.server", "--port", "0", "--data-file", data_file,
+        stdout=asyncio.subprocess.PIPE, cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    line = (await process.stdout.readline()).decode().strip() # "Serving on http://host:port"
+    host, port = line.rsplit('/', 1)[1].rsplit(':', 1)
+    return process, host, int(port)
+
+async def run(args):
+    process = None
+    if args.url:
+        host, port = args.url.rsplit(':', 1)
+        port = int(port)
+    else:
+        process, host, port = await start_server_process(args.tasks)
+
+    latencies = []
+    statuses = {}
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(run_connection(host, port, args.requests, args.pipeline, args.write_ratio, args.tasks,
+                                              latencies, statuses, seed) for seed in range(args.connections)))
+        elapsed = time.perf_counter() - started
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+    total = len(latencies)
+    print(f"connections={args.connections} pipeline={args.pipeline} write_ratio={args.write_ratio} tasks={args.tasks}")
+    print(f"requests: {total} in {elapsed:.2f} s -> {total / elapsed:,.0f} req/s")
+    print(f"latency: p50 {percentile(latencies, 0.50) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+          f"max {max(latencies) * 1000:.2f} ms")
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TaskServer 負載測試")
+    parser.add_argument("--url", help="已在執行的伺服器 host:port；預設在子程序中啟動")
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="每個連線的請求數")
+    parser.add_argument("--pipeline", type=int, default=4, help="每個連線最多在途的請求數")
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--tasks", type=int, default=1000, help="預先建立的任務數（只在自行啟動伺服器時使用）")
+    asyncio.run(run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
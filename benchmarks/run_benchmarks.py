@@ -0,0 +1,165 @@
+# benchmarks/run_benchmarks.py
+"""
+資料層的效能測試：在不同任務數下計時讀寫檔案、新增/修改/刪除、排序、依狀態篩選與 Excel 匯出。
+結果寫成 JSON（秒），並可與先前儲存的基準比較，標出變慢的項目。
+
+    python benchmarks/run_benchmarks.py                                   # 1k / 10k / 100k
+    python benchmarks/run_benchmarks.py --sizes 1000,10000,100000,1000000 --output results.json
+    python benchmarks/run_benchmarks.py --update-baseline                 # 儲存為 benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --fail-on-regression
+
+新增/修改/刪除/查詢單一任務的數字是每次操作的平均時間（autosave 關閉，儲存另外計時）；其他項目是整個操作的時間。
+每個項目重複 --repeat 次取最短時間。
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dataset import generate_tasks
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager, STATUS_OPTIONS
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SORT_COLUMNS = ('id', 'description', 'due_date', 'status', 'creation_time')
+CRUD_OPERATIONS = 200 # 每種單筆操作執行的次數
+
+def best_of(function, repeat):
+    """重複執行 repeat 次，回傳最短的時間（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def per_operation(function, arguments):
+    """對每個參數呼叫一次 function，回傳平均每次的時間（秒）"""
+    started = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - started) / len(arguments)
+
+def run_size(count, workdir, repeat=3, storage='list', excel=True, log=None):
+    """
+    對 count 個合成任務執行所有項目。
+    :return: {項目名稱: 秒}
+    """
+    results = {}
+    def record(name, seconds):
+        results[name] = seconds
+        if log:
+            log(f"{count:>9,} {name:<40} {seconds * 1000:12.3f} ms")
+
+    tasks = generate_tasks(count)
+    data_manager = TaskDataManager(os.path.join(workdir, f"tasks_{count}.json"), backup_interval=None)
+    record("save_tasks", best_of(lambda tasks=tasks: data_manager.save_tasks(tasks), repeat))
+    record("load_tasks", best_of(data_manager.load_tasks, repeat))
+    del tasks
+
+    task_manager = TaskManager(data_manager, storage=storage)
+    task_manager.autosave = False
+    record("TaskManager.save", best_of(task_manager.save, repeat))
+    task_manager.get_task_by_id(0) # 先建立 ID 索引，單筆操作只計算操作本身
+    operations = range(CRUD_OPERATIONS)
+    step = max(1, count // CRUD_OPERATIONS)
+    record("add_task (per op)", per_operation(lambda i: task_manager.add_task(f"新任務 benchmark {i}", "2025-06-01", "https://example.com"), operations))
+    record("get_task_by_id (per op)", per_operation(task_manager.get_task_by_id, range(0, count, step)))
+    record("update_task (per op)", per_operation(lambda task_id: task_manager.update_task(task_id, status="Completed", note="updated"), range(0, count, step)))
+    record("delete_task (per op)", per_operation(task_manager.delete_task, range(1, count, step)))
+
+    record("get_all_tasks_sorted[default]", best_of(task_manager.get_all_tasks_sorted, repeat))
+    for column in SORT_COLUMNS:
+        record(f"get_all_tasks_sorted[{column}]", best_of(lambda: task_manager.get_all_tasks_sorted(column), repeat))
+    for status in STATUS_OPTIONS:
+        record(f"get_tasks_by_status[{status}]", best_of(lambda: task_manager.get_tasks_by_status(status), repeat))
+
+    if excel:
+        if importlib.util.find_spec("openpyxl") is None: # 只確認是否已安裝
+            if log:
+                log(f"{count:>9,} export_tasks_to_excel                    skipped (openpyxl not installed)")
+        else:
+            from record_calender.exporter import export_tasks_to_excel, iter_tasks
+            filepath = os.path.join(workdir, f"tasks_{count}.xlsx")
+            record("export_tasks_to_excel", best_of(lambda: export_tasks_to_excel(iter_tasks(task_manager), filepath), 1))
+    return results
+
+def compare(results, baseline, threshold, min_delta):
+    """
+    比較本次結果與基準。
+    :param threshold: 變慢超過這個比例（例如 0.2 = 20%）才算退步
+    :param min_delta: 時間差小於這麼多秒時不算退步（避免極短的項目受雜訊影響）
+    :return: (比較表的每一列, 退步的項目列表)；每一列為 (任務數, 項目, 基準秒數, 本次秒數)
+    """
+    rows = []
+    regressions = []
+    for size, items in results.items():
+        for name, seconds in items.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            rows.append((size, name, previous, seconds))
+            if seconds > previous * (1 + threshold) and seconds - previous > min_delta:
+                regressions.append((size, name))
+    return rows, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="資料層效能測試")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="以逗號分隔的任務數")
+    parser.add_argument("--repeat", type=int, default=3, help="每個項目重複的次數（取最短時間）")
+    parser.add_argument("--storage", choices=("list", "columnar"), default="list")
+    parser.add_argument("--no-excel", action="store_true", help="不測 Excel 匯出")
+    parser.add_argument("--output", help="結果 JSON 的路徑")
+    parser.add_argument("--baseline", help=f"要比較的基準 JSON；預設使用 {os.path.relpath(DEFAULT_BASELINE)}（如果存在）")
+    parser.add_argument("--update-baseline", action="store_true", help="將本次結果存為基準")
+    parser.add_argument("--threshold", type=float, default=0.2, help="變慢超過這個比例視為退步")
+    parser.add_argument("--min-delta", type=float, default=0.001, help="時間差小於這麼多秒時不視為退步")
+    parser.add_argument("--fail-on-regression", action="store_true", help="有退步的項目時以結束代碼 1 結束")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    report = {
+        'meta': {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'storage': args.storage,
+            'repeat': args.repeat,
+            'crud_operations': CRUD_OPERATIONS,
+        },
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in sizes:
+            report['results'][str(count)] = run_size(count, workdir, args.repeat, args.storage, not args.no_excel, log=print)
+
+    for path in filter(None, (args.output, DEFAULT_BASELINE if args.update_baseline else None)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"results written to {path}")
+
+    baseline_path = args.baseline or (DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) and not args.update_baseline else None)
+    if baseline_path is None:
+        return 0
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows, regressions = compare(report['results'], baseline['results'], args.threshold, args.min_delta)
+    print(f"\ncompared with {baseline_path} ({baseline['meta']['time']}, Python {baseline['meta']['python']})")
+    for size, name, previous, seconds in rows:
+        change = (seconds / previous - 1) * 100 if previous else 0.0
+        flag = "  REGRESSION" if (size, name) in regressions else ""
+        print(f"{int(size):>9,} {name:<40} {previous * 1000:12.3f} -> {seconds * 1000:12.3f} ms {change:+7.1f}%{flag}")
+    print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+# record_calender/__main__.py
+
+from record_calender.cli import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
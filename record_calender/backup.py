@@ -0,0 +1,178 @@
+# record_calender/backup.py
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from datetime import datetime, timedelta
+from record_calender.data_manager import _json_default
+
+CHUNK_TASKS = 64 # 每個區塊平均的任務數
+SNAPSHOT_ID_FORMAT = "%Y%m%d-%H%M%S-%f"
+# 保留規則：(快照的最大年齡, 每個時間區間保留一份；None 表示全部保留)，超過最後一層的快照會被刪除
+RETENTION = (
+    (timedelta(days=1), None),
+    (timedelta(days=30), timedelta(days=1)),
+    (timedelta(weeks=26), timedelta(weeks=1)),
+)
+_EPOCH = datetime(2000, 1, 1)
+
+def _is_boundary(task_id, chunk_tasks):
+    """區塊邊界只由任務 ID 決定：修改任務不會移動邊界，新增或刪除任務只影響它所在的區塊"""
+    return zlib.crc32(str(task_id).encode('ascii')) % chunk_tasks == 0
+
+def split_chunks(tasks, chunk_tasks=CHUNK_TASKS):
+    """
+    將任務列表切成區塊，每個區塊序列化為緊湊的 JSON。
+    :return: 產生每個區塊的 bytes
+    """
+    chunk = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) >= chunk_tasks * 4 or _is_boundary(task['id'], chunk_tasks):
+            yield json.dumps(chunk, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode('utf-8')
+            chunk = []
+    if chunk:
+        yield json.dumps(chunk, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+def _write_atomic(path, data):
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+class BackupStore:
+    """
+    增量、去重的備份：任務被切成區塊，以內容雜湊為檔名壓縮儲存；每份快照只記錄它用到的區塊清單。
+    沒有變更的區塊在所有快照之間共用，所以一份大資料檔的每小時備份只會寫入有變更的幾個區塊。
+
+    目錄結構：
+        chunks/ab/abcdef...       zlib 壓縮的區塊（任務 JSON 陣列）
+        snapshots/<快照 ID>.json  {"time", "tasks", "chunks": [區塊雜湊, ...]}
+    """
+
+    def __init__(self, directory, chunk_tasks=CHUNK_TASKS):
+        self.directory = directory
+        self.chunk_tasks = chunk_tasks
+        self._chunk_dir = os.path.join(directory, "chunks")
+        self._snapshot_dir = os.path.join(directory, "snapshots")
+        self._lock = threading.Lock()
+
+    def _chunk_path(self, digest):
+        return os.path.join(self._chunk_dir, digest[:2], digest)
+
+    def _snapshot_path(self, snapshot_id):
+        return os.path.join(self._snapshot_dir, f"{snapshot_id}.json")
+
+    def snapshot_ids(self):
+        """所有快照的 ID，由舊到新"""
+        if not os.path.isdir(self._snapshot_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self._snapshot_dir) if name.endswith(".json"))
+
+    def read_snapshot(self, snapshot_id):
+        """讀取快照的描述（時間、任務數、區塊清單）"""
+        try:
+            with open(self._snapshot_path(snapshot_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"Backup snapshot not found: {snapshot_id}") from None
+
+    def latest_time(self):
+        """最新一份快照的時間；沒有快照時為 None"""
+        snapshot_ids = self.snapshot_ids()
+        return datetime.strptime(snapshot_ids[-1], SNAPSHOT_ID_FORMAT) if snapshot_ids else None
+
+    def backup(self, tasks, now=None):
+        """
+        建立一份快照，只寫入目前還不存在的區塊。
+        :param now: 快照時間（預設為現在）
+        :return: 快照 ID；內容與最新的快照完全相同時不建立快照，回傳 None
+        """
+        now = now or datetime.now()
+        with self._lock:
+            snapshot_ids = self.snapshot_ids()
+            digests = []
+            for data in split_chunks(tasks, self.chunk_tasks):
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                digests.append(digest)
+                path = self._chunk_path(digest)
+                if not os.path.exists(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    _write_atomic(path, zlib.compress(data))
+            if snapshot_ids and self.read_snapshot(snapshot_ids[-1])['chunks'] == digests:
+                return None
+            snapshot_id = now.strftime(SNAPSHOT_ID_FORMAT)
+            os.makedirs(self._snapshot_dir, exist_ok=True)
+            # 區塊都寫好之後才寫快照，中途失敗也不會留下引用不存在區塊的快照
+            _write_atomic(self._snapshot_path(snapshot_id), json.dumps(
+                {'time': now.isoformat(timespec='seconds'), 'tasks': len(tasks), 'chunks': digests}).encode('utf-8'))
+            return snapshot_id
+
+    def restore(self, snapshot_id):
+        """
+        還原一份快照。
+        :param snapshot_id: 快照 ID；'latest' 表示最新的一份
+        :return: 任務列表
+        """
+        if snapshot_id == 'latest':
+            snapshot_ids = self.snapshot_ids()
+            if not snapshot_ids:
+                raise ValueError(f"No backups in {self.directory}")
+            snapshot_id = snapshot_ids[-1]
+        tasks = []
+        for digest in self.read_snapshot(snapshot_id)['chunks']:
+            with open(self._chunk_path(digest), 'rb') as f:
+                tasks.extend(json.loads(zlib.decompress(f.read())))
+        return tasks
+
+    def prune(self, now=None, retention=RETENTION):
+        """
+        依保留規則刪除過舊的快照，並刪除不再被任何快照引用的區塊；最新的快照不論多舊都會保留。
+        :return: 被刪除的快照 ID 列表
+        """
+        now = now or datetime.now()
+        with self._lock:
+            kept_buckets = set()
+            removed = []
+            newest_first = self.snapshot_ids()[::-1] # 由新到舊，每個區間保留最新的一份
+            # 最新的一份一定保留：資料長時間沒有變更時不會建立新的快照，它可能是唯一保存目前資料的快照
+            for snapshot_id in newest_first[1:]:
+                taken = datetime.strptime(snapshot_id, SNAPSHOT_ID_FORMAT)
+                tier = next((index for index, (max_age, _) in enumerate(retention) if now - taken <= max_age), None)
+                if tier is not None:
+                    interval = retention[tier][1]
+                    if interval is None:
+                        continue
+                    bucket = (tier, (taken - _EPOCH) // interval)
+                    if bucket not in kept_buckets:
+                        kept_buckets.add(bucket)
+                        continue
+                os.remove(self._snapshot_path(snapshot_id))
+                removed.append(snapshot_id)
+            if removed:
+                self._collect_garbage()
+            return removed
+
+    def _collect_garbage(self):
+        """刪除沒有被任何快照引用的區塊"""
+        referenced = set()
+        for snapshot_id in self.snapshot_ids():
+            referenced.update(self.read_snapshot(snapshot_id)['chunks'])
+        for prefix in os.listdir(self._chunk_dir):
+            prefix_dir = os.path.join(self._chunk_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if digest not in referenced:
+                    os.remove(os.path.join(prefix_dir, digest))
+
+    def disk_usage(self):
+        """備份目錄佔用的位元組數"""
+        total = 0
+        for root, _, names in os.walk(self.directory):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in names)
+        return total
@@ -0,0 +1,184 @@
+# record_calender/calendar_view.py
+
+import calendar
+import tkinter as tk
+from datetime import date, timedelta
+
+MONTH_VIEW = 'month'
+WEEK_VIEW = 'week'
+MONTH_GRID_DAYS = 42 # 月檢視固定顯示 6 週，避免翻頁時格子數量改變
+MAX_TITLES_PER_DAY = 3 # 每一格最多列出的標題數
+FIRST_WEEKDAY = calendar.MONDAY
+WEEKDAY_NAMES = ["一", "二", "三", "四", "五", "六", "日"]
+CLOSED_STATUSES = ("Completed", "Cancelled") # 這些狀態的任務不算逾期
+
+CELL_BG = "#ffffff"
+OTHER_MONTH_BG = "#f2f2f2"
+OVERDUE_BG = "#ffd9d9"
+TODAY_BORDER = "#1f6aa5"
+
+def week_start(day):
+    """回傳 day 所在週的第一天（週一）。"""
+    return day - timedelta(days=(day.weekday() - FIRST_WEEKDAY) % 7)
+
+def month_grid_dates(year, month):
+    """回傳月檢視的 42 個日期（從包含該月 1 日的那一週開始）。"""
+    start = week_start(date(year, month, 1))
+    return [start + timedelta(days=offset) for offset in range(MONTH_GRID_DAYS)]
+
+def week_dates(day):
+    """回傳 day 所在週的 7 個日期。"""
+    start = week_start(day)
+    return [start + timedelta(days=offset) for offset in range(7)]
+
+def shift_month(year, month, delta):
+    """將 (year, month) 平移 delta 個月。"""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+def summarize_day(tasks, day, today, max_titles=MAX_TITLES_PER_DAY):
+    """
+    產生一格日期要顯示的摘要。
+    :param tasks: 該日到期的任務列表
+    :param day: 該格的日期
+    :param today: 今天的日期
+    :return: (任務數, 標題列表, 是否逾期)
+    """
+    titles = [str(task.get('description', '')) for task in tasks[:max_titles]]
+    overdue = day < today and any(task.get('status') not in CLOSED_STATUSES for task in tasks)
+    return len(tasks), titles, overdue
+
+class CalendarView(tk.Frame):
+    """
+    月/週行事曆檢視，每一格顯示當日到期的任務數與標題，逾期的日期會以底色標示，點擊日期可篩選任務。
+    格子只在建立時產生一次，翻頁時只更新文字與顏色；資料由 TaskManager 的每日分組提供，
+    只查詢畫面上的日期範圍，不掃描全部任務。
+    """
+
+    def __init__(self, master, task_manager, on_day_selected=None, **kw):
+        """
+        :param task_manager: TaskManager 實例
+        :param on_day_selected: callable(date)，點擊日期時呼叫
+        """
+        super().__init__(master, **kw)
+        self.task_manager = task_manager
+        self.on_day_selected = on_day_selected
+        self.mode = MONTH_VIEW
+        today = date.today()
+        self.year, self.month = today.year, today.month
+        self.anchor_day = today # 週檢視顯示這一天所在的週
+        self._rendered_state = None
+        self._cell_dates = []
+
+        header = tk.Frame(self)
+        header.pack(fill="x", pady=(0, 5))
+        tk.Button(header, text="◀", width=3, command=lambda: self.page(-1)).pack(side=tk.LEFT)
+        tk.Button(header, text="今天", command=self.go_to_today).pack(side=tk.LEFT, padx=5)
+        tk.Button(header, text="▶", width=3, command=lambda: self.page(1)).pack(side=tk.LEFT)
+        self.title_label = tk.Label(header, text="", font=("Arial", 13, "bold"))
+        self.title_label.pack(side=tk.LEFT, padx=10)
+        self.mode_var = tk.StringVar(value=self.mode)
+        tk.Radiobutton(header, text="週", value=WEEK_VIEW, variable=self.mode_var, indicatoron=False, command=self.on_mode_changed).pack(side=tk.RIGHT)
+        tk.Radiobutton(header, text="月", value=MONTH_VIEW, variable=self.mode_var, indicatoron=False, command=self.on_mode_changed).pack(side=tk.RIGHT)
+
+        self.grid_frame = tk.Frame(self)
+        self.grid_frame.pack(fill="both", expand=True)
+        for column, name in enumerate(WEEKDAY_NAMES):
+            tk.Label(self.grid_frame, text=name).grid(row=0, column=column, sticky="ew")
+            self.grid_frame.grid_columnconfigure(column, weight=1, uniform="day")
+
+        self._cells = []
+        for index in range(MONTH_GRID_DAYS):
+            cell = tk.Frame(self.grid_frame, bg=CELL_BG, highlightthickness=1, highlightbackground="#cccccc", cursor="hand2")
+            day_label = tk.Label(cell, text="", anchor="nw", bg=CELL_BG, font=("Arial", 10, "bold"))
+            body_label = tk.Label(cell, text="", anchor="nw", justify=tk.LEFT, bg=CELL_BG, font=("Arial", 9))
+            day_label.pack(fill="x")
+            body_label.pack(fill="both", expand=True)
+            for widget in (cell, day_label, body_label):
+                widget.bind("<Button-1>", lambda e, i=index: self._on_cell_click(i))
+            cell.bind("<Configure>", lambda e, label=body_label: label.configure(wraplength=max(e.width - 4, 20)))
+            cell.grid(row=index // 7 + 1, column=index % 7, sticky="nsew", padx=1, pady=1)
+            self._cells.append((cell, day_label, body_label))
+        self._layout_rows()
+
+    def visible_dates(self):
+        """目前檢視顯示的日期列表"""
+        if self.mode == WEEK_VIEW:
+            return week_dates(self.anchor_day)
+        return month_grid_dates(self.year, self.month)
+
+    def page(self, delta):
+        """往前或往後翻一個月（週檢視則為一週）"""
+        if self.mode == WEEK_VIEW:
+            self.anchor_day += timedelta(weeks=delta)
+            self.year, self.month = self.anchor_day.year, self.anchor_day.month
+        else:
+            self.year, self.month = shift_month(self.year, self.month, delta)
+            self.anchor_day = date(self.year, self.month, 1)
+        self.refresh()
+
+    def go_to_today(self):
+        """回到今天所在的月份/週"""
+        today = date.today()
+        self.year, self.month, self.anchor_day = today.year, today.month, today
+        self.refresh()
+
+    def on_mode_changed(self):
+        """切換月/週檢視"""
+        self.mode = self.mode_var.get()
+        self._layout_rows()
+        self.refresh()
+
+    def _layout_rows(self):
+        """週檢視只顯示第一列格子，並讓格子填滿高度"""
+        visible_rows = 1 if self.mode == WEEK_VIEW else MONTH_GRID_DAYS // 7
+        for index, (cell, _, _) in enumerate(self._cells):
+            if index // 7 < visible_rows:
+                cell.grid()
+            else:
+                cell.grid_remove()
+        for row in range(MONTH_GRID_DAYS // 7):
+            self.grid_frame.grid_rowconfigure(row + 1, weight=1 if row < visible_rows else 0)
+
+    def refresh(self, force=False):
+        """依目前的月份/週更新格子內容；資料版本與顯示範圍都沒變時直接略過"""
+        dates = self.visible_dates()
+        today = date.today()
+        state = (self.task_manager.data_version, self.mode, dates[0], self.month, today)
+        if not force and state == self._rendered_state:
+            return
+        self._rendered_state = state
+        self._cell_dates = dates
+        tasks_by_day = self.task_manager.get_tasks_by_day(dates[0], dates[-1])
+        max_titles = MAX_TITLES_PER_DAY * 3 if self.mode == WEEK_VIEW else MAX_TITLES_PER_DAY
+
+        if self.mode == WEEK_VIEW:
+            self.title_label.configure(text=f"{dates[0].strftime('%Y-%m-%d')} ~ {dates[-1].strftime('%Y-%m-%d')}")
+        else:
+            self.title_label.configure(text=f"{self.year} 年 {self.month} 月")
+
+        for index, (cell, day_label, body_label) in enumerate(self._cells):
+            if index >= len(dates):
+                break
+            day = dates[index]
+            count, titles, overdue = summarize_day(tasks_by_day.get(day, []), day, today, max_titles)
+            if overdue:
+                bg = OVERDUE_BG
+            elif self.mode == MONTH_VIEW and day.month != self.month:
+                bg = OTHER_MONTH_BG
+            else:
+                bg = CELL_BG
+            lines = [f"{count} 項"] if count else []
+            lines.extend(f"• {title}" for title in titles)
+            if count > len(titles):
+                lines.append(f"… 另有 {count - len(titles)} 項")
+            day_text = f"{day.month}/{day.day}" if self.mode == WEEK_VIEW or day.day == 1 else str(day.day)
+            cell.configure(bg=bg, highlightbackground=TODAY_BORDER if day == today else "#cccccc",
+                           highlightthickness=2 if day == today else 1)
+            day_label.configure(text=day_text, bg=bg)
+            body_label.configure(text="\n".join(lines), bg=bg)
+
+    def _on_cell_click(self, index):
+        """點擊某一格時通知呼叫端篩選該日的任務"""
+        if index < len(self._cell_dates) and self.on_day_selected:
+            self.on_day_selected(self._cell_dates[index])
@@ -0,0 +1,253 @@
+# record_calender/cli.py
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+
+# 只導入資料層；GUI（tkinter、customtkinter）只有在沒有子命令時才會載入
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager, STATUS_OPTIONS
+
+SORT_COLUMNS = ('id', 'description', 'due_date', 'status', 'creation_time')
+
+def _write_tasks(tasks, output_format, out):
+    """依格式輸出任務：tsv（預設，方便 cut/awk）、jsonl 或 json。所有內容一次寫出。"""
+    if output_format == 'json':
+        out.write(json.dumps([dict(task) for task in tasks], ensure_ascii=False, indent=2) + "\n")
+    elif output_format == 'jsonl':
+        out.write(''.join(json.dumps(dict(task), ensure_ascii=False) + "\n" for task in tasks))
+    else:
+        def clean(value):
+            if value is None:
+                return ''
+            value = str(value)
+            if '\t' in value or '\n' in value: # 大多數的值不需要替換
+                value = value.replace('\t', ' ').replace('\n', ' ')
+            return value
+        out.write(''.join(f"{task['id']}\t{task.get('status') or ''}\t{task.get('due_date') or ''}\t{clean(task.get('description'))}\n"
+                          for task in tasks))
+
+def _parse_date(value):
+    from datetime import date
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Invalid date format. Please use YYYY-MM-DD.")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m record_calender", description="待辦事項 & 行事曆工具（不加子命令時開啟視窗）")
+    parser.add_argument("--data-file", help="待辦事項資料檔；預設為 todo_calendar.json")
+    subparsers = parser.add_subparsers(dest="command")
+
+    add_parser = subparsers.add_parser("add", help="新增待辦事項")
+    add_parser.add_argument("description")
+    add_parser.add_argument("--due", help="到期日 YYYY-MM-DD")
+    add_parser.add_argument("--note")
+
+    output_parent = argparse.ArgumentParser(add_help=False)
+    output_parent.add_argument("--format", dest="output_format", choices=("tsv", "jsonl", "json"), default="tsv", help="輸出格式（預設 tsv：ID、狀態、到期日、內容）")
+    output_parent.add_argument("--status", choices=STATUS_OPTIONS)
+    output_parent.add_argument("--sort", choices=SORT_COLUMNS, help="排序欄位；預設依建立時間由新到舊")
+    output_parent.add_argument("--desc", action="store_true", help="由大到小排序")
+    output_parent.add_argument("--limit", type=int, help="最多輸出的筆數")
+
+    list_parser = subparsers.add_parser("list", parents=[output_parent], help="列出待辦事項")
+    list_parser.add_argument("--due-on", type=_parse_date, help="只列出該日 (YYYY-MM-DD) 到期的項目")
+    list_parser.add_argument("--hide-on-hold", action="store_true", help="未指定狀態時不列出 On hold 項目")
+
+    search_parser = subparsers.add_parser("search", parents=[output_parent], help="搜尋內容或備註")
+    search_parser.add_argument("query")
+
+    update_parser = subparsers.add_parser("update", help="修改待辦事項")
+    update_parser.add_argument("id", type=int)
+    update_parser.add_argument("--description")
+    update_parser.add_argument("--due", help="到期日 YYYY-MM-DD；空字串表示清除")
+    update_parser.add_argument("--status", choices=STATUS_OPTIONS)
+    update_parser.add_argument("--note")
+
+    delete_parser = subparsers.add_parser("delete", help="刪除待辦事項")
+    delete_parser.add_argument("ids", type=int, nargs="+")
+
+    from record_calender.task_io import FORMATS # task_io 只依賴標準函式庫
+    from record_calender.ical import COMPONENTS, VTODO
+    export_parser = subparsers.add_parser("export", help="匯出為 CSV / JSON Lines / iCalendar")
+    export_parser.add_argument("file")
+    export_parser.add_argument("--format", dest="file_format", choices=FORMATS, help="檔案格式；預設依副檔名判斷")
+    export_parser.add_argument("--ics-component", choices=COMPONENTS, default=VTODO)
+
+    import_parser = subparsers.add_parser("import", help="從 CSV / JSON Lines / iCalendar 匯入")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--format", dest="file_format", choices=FORMATS, help="檔案格式；預設依副檔名判斷")
+
+    sync_parser = subparsers.add_parser("sync", help="與另一個資料檔雙向同步（三方合併）")
+    sync_parser.add_argument("remote", help="另一台電腦的資料檔（例如放在隨身碟或雲端資料夾中的副本）")
+    sync_parser.add_argument("--prefer", choices=("local", "remote"), default="local", help="同一欄位兩邊都修改時採用哪一邊")
+    sync_parser.add_argument("--base", help="同步基準檔；預設與資料檔放在一起，每個遠端檔案各一份")
+    sync_parser.add_argument("--dry-run", action="store_true", help="只顯示會做的變更，不寫入檔案")
+    sync_parser.add_argument("--full", action="store_true", help="忽略檔案簽章，重新比較所有任務")
+
+    backup_parser = subparsers.add_parser("backup", help="資料檔的增量備份（儲存時每小時自動建立）")
+    backup_commands = backup_parser.add_subparsers(dest="backup_command", required=True)
+    backup_commands.add_parser("list", help="列出快照：ID、時間、任務數")
+    backup_commands.add_parser("create", help="立即建立一份快照並刪除過舊的快照")
+    restore_parser = backup_commands.add_parser("restore", help="還原快照（會先備份目前的資料檔）")
+    restore_parser.add_argument("snapshot", help="快照 ID；latest 表示最新的一份")
+    restore_parser.add_argument("--output", help="寫到這個檔案，而不是覆蓋資料檔")
+    return parser
+
+def main(argv=None, out=None):
+    """
+    命令列進入點。
+    :return: 結束代碼（0 成功、1 失敗）
+    """
+    out = out or sys.stdout
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        from record_calender.main import run_app # 沒有子命令時才載入 GUI
+        run_app([])
+        return 0
+
+    try:
+        if args.command == 'sync': # 直接處理兩個檔案，不需要載入 TaskManager
+            return _command_sync(args, out)
+        if args.command == 'backup':
+            return _command_backup(args, out)
+        task_manager = TaskManager(TaskDataManager(args.data_file))
+        task_manager.autosave = False # 每個子命令自行儲存並檢查結果，儲存失敗時以 1 結束
+        return COMMANDS[args.command](task_manager, args, out)
+    except (ValueError, OSError) as e:
+        print(f"錯誤: {e}", file=sys.stderr)
+        return 1
+
+def _save(task_manager):
+    """儲存任務；失敗時輸出錯誤訊息並回傳 False"""
+    result = task_manager.save()
+    if result is not True:
+        print(f"錯誤: 儲存待辦事項失敗: {result[1]}", file=sys.stderr)
+        return False
+    return True
+
+def _command_add(task_manager, args, out):
+    task = task_manager.add_task(args.description, args.due, args.note)
+    if not _save(task_manager):
+        return 1
+    out.write(f"{task['id']}\n")
+    return 0
+
+def _query_direction(args):
+    return 'descending' if args.desc else 'ascending'
+
+def _command_list(task_manager, args, out):
+    tasks = task_manager.query_tasks(args.status, args.sort, _query_direction(args),
+                                     include_on_hold=not args.hide_on_hold, due_on=args.due_on)
+    _write_tasks(tasks[:args.limit] if args.limit is not None else tasks, args.output_format, out)
+    return 0
+
+def _command_search(task_manager, args, out):
+    tasks = task_manager.query_tasks(args.status, args.sort, _query_direction(args), search=args.query)
+    _write_tasks(tasks[:args.limit] if args.limit is not None else tasks, args.output_format, out)
+    return 0
+
+def _command_update(task_manager, args, out):
+    if task_manager.get_task_by_id(args.id) is None:
+        print(f"錯誤: 找不到 ID 為 {args.id} 的待辦事項", file=sys.stderr)
+        return 1
+    task = task_manager.update_task(args.id, description=args.description, due_date=args.due,
+                                    status=args.status, note=args.note)
+    if task is None:
+        print("沒有任何欄位被修改", file=sys.stderr)
+        return 0
+    return 0 if _save(task_manager) else 1
+
+def _command_delete(task_manager, args, out):
+    missing = [task_id for task_id in args.ids if not task_manager.delete_task(task_id)]
+    for task_id in missing:
+        print(f"錯誤: 找不到 ID 為 {task_id} 的待辦事項", file=sys.stderr)
+    if len(missing) < len(args.ids) and not _save(task_manager): # 全部刪除後只寫一次檔
+        return 1
+    return 1 if missing else 0
+
+def _command_export(task_manager, args, out):
+    from record_calender import task_io
+    count = task_io.export_tasks(task_manager, args.file, args.file_format, component=args.ics_component)
+    print(f"已匯出 {count} 個待辦事項到 {args.file}", file=sys.stderr)
+    return 0
+
+def _command_import(task_manager, args, out):
+    from record_calender import task_io
+    added, skipped, errors = task_io.import_tasks(task_manager, args.file, args.file_format)
+    for line, message in errors:
+        print(f"第 {line} 行: {message}", file=sys.stderr)
+    print(task_io.import_summary(added, skipped, len(errors)), file=sys.stderr)
+    return 1 if errors else 0
+
+def _command_sync(args, out):
+    from record_calender import sync
+    local_path = TaskDataManager(args.data_file).data_file
+    result = sync.sync_files(local_path, args.remote, args.base, args.prefer, args.dry_run, args.full)
+    for conflict in result.conflicts:
+        field = conflict.field or "(deleted)"
+        print(f"衝突: ID {conflict.task_id} {field}: 本機={conflict.local!r} 遠端={conflict.remote!r} -> {conflict.chosen!r}", file=sys.stderr)
+    for old_id, new_id in result.renumbered.items():
+        print(f"遠端新增的任務 ID {old_id} 與本機重複，改為 {new_id}", file=sys.stderr)
+    prefix = "(dry run) " if args.dry_run else ""
+    print(f"{prefix}本機: {len(result.local_updates)} 更新, {len(result.local_deletes)} 刪除; "
+          f"遠端: {len(result.remote_updates)} 更新, {len(result.remote_deletes)} 刪除; "
+          f"比較 {result.compared} 個任務, {len(result.conflicts)} 個衝突", file=sys.stderr)
+    return 0
+
+def _command_backup(args, out):
+    data_manager = TaskDataManager(args.data_file)
+    store = data_manager.backups
+    if args.backup_command == 'list':
+        snapshots = [(snapshot_id, store.read_snapshot(snapshot_id)) for snapshot_id in store.snapshot_ids()]
+        out.write(''.join(f"{snapshot_id}\t{info['time']}\t{info['tasks']}\n" for snapshot_id, info in snapshots))
+        print(f"{len(snapshots)} 份快照，共 {store.disk_usage():,} bytes", file=sys.stderr)
+        return 0
+    if args.backup_command == 'create':
+        # 資料檔無法讀取時拒絕備份（拋出例外），不把讀取失敗當成空的任務列表存成最新的快照
+        snapshot_id = store.backup(data_manager.load_tasks(strict=True))
+        store.prune()
+        print(f"已建立快照 {snapshot_id}" if snapshot_id else "資料沒有變更，未建立快照", file=sys.stderr)
+        return 0
+    tasks = store.restore(args.snapshot)
+    if args.output:
+        TaskDataManager(args.output, backup_interval=None).save_tasks(tasks)
+        print(f"已將 {len(tasks)} 個待辦事項還原到 {args.output}", file=sys.stderr)
+        return 0
+    _preserve_current(data_manager, store) # 先保留目前的資料，還原之後仍可復原
+    result = TaskDataManager(data_manager.data_file, backup_interval=None).save_tasks(tasks)
+    if result is not True:
+        raise result[1]
+    print(f"已將 {len(tasks)} 個待辦事項還原到 {data_manager.data_file}", file=sys.stderr)
+    return 0
+
+def _preserve_current(data_manager, store):
+    """
+    還原前保留目前的資料檔：可以讀取時建立一份快照；無法解析時（還原通常就是為了修復它）改為複製原始檔案，
+    不會把讀取失敗當成空的任務列表存成最新的快照。資料檔不存在時不需要保留。
+    """
+    if not os.path.exists(data_manager.data_file):
+        return
+    try:
+        tasks = data_manager.load_tasks(strict=True)
+    except ValueError as e:
+        corrupt_file = f"{data_manager.data_file}.corrupt-{datetime.now():%Y%m%d-%H%M%S}"
+        shutil.copy2(data_manager.data_file, corrupt_file)
+        print(f"目前的資料檔無法讀取（{e}），已複製到 {corrupt_file}", file=sys.stderr)
+        return
+    store.backup(tasks)
+
+COMMANDS = {
+    'add': _command_add,
+    'list': _command_list,
+    'search': _command_search,
+    'update': _command_update,
+    'delete': _command_delete,
+    'export': _command_export,
+    'import': _command_import,
+}
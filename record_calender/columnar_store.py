@@ -0,0 +1,336 @@
+# record_calender/columnar_store.py
+
+import sys
+from array import array
+from collections.abc import MutableMapping, MutableSequence
+from datetime import date, datetime
+
+# 定義所有可能的狀態，與應用程式同步；索引即為狀態代碼
+STATUS_OPTIONS = ["Pending", "In progress", "Completed", "Cancelled", "On hold"]
+_STATUS_CODES = {status: code for code, status in enumerate(STATUS_OPTIONS)}
+_RAW_STATUS = 255 # 非標準狀態，原始值存放在 extras
+
+CORE_FIELDS = ('id', 'description', 'due_date', 'creation_time', 'status', 'note', 'image_path')
+
+_EPOCH = datetime(1970, 1, 1)
+_NO_DATE = 0 # due_date 為 None
+_RAW_DATE = -1 # due_date 無法解析，原始值存放在 extras
+_NO_TIME = -2 ** 63 # creation_time 為 None
+_RAW_TIME = -2 ** 63 + 1 # creation_time 無法解析，原始值存放在 extras
+
+_INTERN_MAX_LENGTH = 64 # 只 intern 短字串；長備註幾乎不會重複，intern 只會多付雜湊與表格成本
+_MISSING = object()
+
+
+def _intern(value):
+    """對短字串進行 intern，讓重複內容（例如相同的標題或備註）共用同一個物件。"""
+    if type(value) is str and len(value) <= _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _encode_due_date(value):
+    """將 YYYY-MM-DD 轉為序數；無法無損轉換時回傳 _RAW_DATE。"""
+    if value is None:
+        return _NO_DATE
+    if isinstance(value, str):
+        try:
+            parsed = date.fromisoformat(value)
+        except ValueError:
+            return _RAW_DATE
+        if parsed.isoformat() == value:
+            return parsed.toordinal()
+    return _RAW_DATE
+
+
+def _encode_creation_time(value):
+    """將 YYYY-MM-DD HH:MM:SS 轉為秒數；無法無損轉換時回傳 _RAW_TIME。"""
+    if value is None:
+        return _NO_TIME
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return _RAW_TIME
+        if parsed.microsecond == 0 and parsed.tzinfo is None and parsed.isoformat(sep=' ') == value:
+            return (parsed - _EPOCH) // _ONE_SECOND
+    return _RAW_TIME
+
+
+_ONE_SECOND = datetime(1970, 1, 1, 0, 0, 1) - _EPOCH
+
+
+class TaskRow(MutableMapping):
+    """ColumnarTaskStore 中一列的字典視圖，只在存取時才從欄位陣列中讀值。"""
+
+    __slots__ = ('_store', '_key')
+
+    def __init__(self, store, key):
+        self._store = store
+        self._key = key
+
+    def __getitem__(self, field):
+        return self._store._get_field(self._store._index_of_key(self._key), field)
+
+    def __setitem__(self, field, value):
+        self._store._set_field(self._store._index_of_key(self._key), field, value)
+
+    def __delitem__(self, field):
+        if field in CORE_FIELDS:
+            raise KeyError(f"Cannot delete core task field: {field}")
+        extras = self._store._extras[self._store._index_of_key(self._key)]
+        if not extras or field not in extras:
+            raise KeyError(field)
+        del extras[field]
+
+    def __iter__(self):
+        yield from CORE_FIELDS
+        extras = self._store._extras[self._store._index_of_key(self._key)]
+        if extras:
+            for field in extras:
+                if field not in CORE_FIELDS:
+                    yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        """回傳一般的 dict 副本。"""
+        return dict(self)
+
+    def __repr__(self):
+        return f"TaskRow({dict(self)!r})"
+
+
+class ColumnarTaskStore(MutableSequence):
+    """
+    以欄位陣列保存任務的儲存引擎，可直接取代 TaskManager 內部的 list。
+    id 存放在 array('q')，到期日與建立時間存為整數序數/秒數，狀態存為位元組代碼，
+    內容與備註存放在 intern 過的字串列表中；只有在存取時才會產生字典形式的列。
+    """
+
+    def __init__(self, tasks=()):
+        self._ids = array('q')
+        self._due = array('i')
+        self._created = array('q')
+        self._status = bytearray()
+        self._descriptions = []
+        self._notes = []
+        self._image_paths = []
+        self._extras = [] # 每列額外欄位或無法轉換的原始值；大多數為 None
+        self._keys = array('q') # 每列唯一的內部鍵，讓 TaskRow 在其他列被插入或刪除後仍指向正確的列
+        self._key_index = {} # 內部鍵 -> 列位置；中間插入或刪除後設為 None，下次查詢時重建
+        self._next_key = 0
+        for task in tasks:
+            self.append(task)
+
+    # --- 欄位編碼 ---
+
+    def _get_field(self, index, field):
+        extras = self._extras[index]
+        if field == 'id':
+            return self._ids[index]
+        if field == 'description':
+            return self._descriptions[index]
+        if field == 'note':
+            return self._notes[index]
+        if field == 'status':
+            code = self._status[index]
+            return STATUS_OPTIONS[code] if code != _RAW_STATUS else extras['status']
+        if field == 'due_date':
+            ordinal = self._due[index]
+            if ordinal == _NO_DATE:
+                return None
+            if ordinal == _RAW_DATE:
+                return extras['due_date']
+            return date.fromordinal(ordinal).isoformat()
+        if field == 'creation_time':
+            seconds = self._created[index]
+            if seconds == _NO_TIME:
+                return None
+            if seconds == _RAW_TIME:
+                return extras['creation_time']
+            return (_EPOCH + seconds * _ONE_SECOND).isoformat(sep=' ')
+        if field == 'image_path':
+            return self._image_paths[index]
+        if extras and field in extras:
+            return extras[field]
+        raise KeyError(field)
+
+    def _set_raw(self, index, field, value):
+        if self._extras[index] is None:
+            self._extras[index] = {}
+        self._extras[index][field] = value
+
+    def _clear_raw(self, index, field):
+        extras = self._extras[index]
+        if extras and field in extras:
+            del extras[field]
+            if not extras:
+                self._extras[index] = None
+
+    def _set_field(self, index, field, value):
+        if field == 'id':
+            self._ids[index] = int(value)
+        elif field == 'description':
+            self._descriptions[index] = _intern(value)
+        elif field == 'note':
+            self._notes[index] = _intern(value)
+        elif field == 'image_path':
+            self._image_paths[index] = value
+        elif field == 'status':
+            code = _STATUS_CODES.get(value, _RAW_STATUS)
+            self._status[index] = code
+            if code == _RAW_STATUS:
+                self._set_raw(index, 'status', value)
+            else:
+                self._clear_raw(index, 'status')
+        elif field == 'due_date':
+            ordinal = _encode_due_date(value)
+            self._due[index] = ordinal
+            if ordinal == _RAW_DATE:
+                self._set_raw(index, 'due_date', value)
+            else:
+                self._clear_raw(index, 'due_date')
+        elif field == 'creation_time':
+            seconds = _encode_creation_time(value)
+            self._created[index] = seconds
+            if seconds == _RAW_TIME:
+                self._set_raw(index, 'creation_time', value)
+            else:
+                self._clear_raw(index, 'creation_time')
+        else:
+            self._set_raw(index, field, value)
+
+    def _index_of_key(self, key):
+        if self._key_index is None:
+            # 中間插入或刪除會移動後面所有列的位置，重建一次（與移動欄位本身同為 O(n)）
+            self._key_index = {row_key: index for index, row_key in enumerate(self._keys)}
+        index = self._key_index.get(key)
+        if index is None:
+            raise KeyError("Task row has been removed from the store.")
+        return index
+
+    # --- MutableSequence 介面 ---
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("task index out of range")
+        return TaskRow(self, self._keys[index])
+
+    def __setitem__(self, index, task):
+        if isinstance(index, slice):
+            raise TypeError("ColumnarTaskStore does not support slice assignment.")
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("task index out of range")
+        self._extras[index] = None
+        self._write_row(index, task)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            for i in sorted(range(*index.indices(len(self))), reverse=True):
+                del self[i]
+            return
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("task index out of range")
+        key = self._keys[index]
+        for column in (self._ids, self._due, self._created, self._status, self._descriptions,
+                       self._notes, self._image_paths, self._extras, self._keys):
+            del column[index]
+        if self._key_index is not None:
+            if index == len(self):
+                del self._key_index[key] # 刪除最後一列不影響其他列的位置
+            else:
+                self._key_index = None
+
+    def insert(self, index, task):
+        # 與 list.insert 相同：超出範圍的位置視為頭或尾
+        if index < 0:
+            index = max(0, index + len(self))
+        index = min(index, len(self))
+        key = self._next_key
+        self._next_key += 1
+        for column, value in ((self._ids, 0), (self._due, _NO_DATE), (self._created, _NO_TIME), (self._status, 0),
+                              (self._descriptions, ''), (self._notes, ''), (self._image_paths, None),
+                              (self._extras, None), (self._keys, key)):
+            column.insert(index, value)
+        if self._key_index is not None:
+            if index == len(self) - 1:
+                self._key_index[key] = index
+            else:
+                self._key_index = None
+        self._write_row(index, task)
+
+    def _write_row(self, index, task):
+        for field in CORE_FIELDS:
+            value = task.get(field, _MISSING)
+            if value is _MISSING:
+                value = 'Pending' if field == 'status' else ('' if field in ('description', 'note') else None)
+            self._set_field(index, field, value)
+        for field, value in task.items():
+            if field not in CORE_FIELDS:
+                self._set_raw(index, field, value)
+
+    def to_dicts(self):
+        """將所有列實體化為一般 dict 的列表。"""
+        return [dict(row) for row in self]
+
+
+def measure_memory_per_task(task_count=100000):
+    """
+    以 tracemalloc 比較目前的 list-of-dict 表示法與 ColumnarTaskStore 每個任務的記憶體用量。
+    :return: 字典，包含兩種表示法每個任務所占的位元組數
+    """
+    import tracemalloc
+
+    def build_tasks():
+        tasks = []
+        for i in range(task_count):
+            tasks.append({
+                'id': i,
+                'description': f"Task {i}",
+                'due_date': date.fromordinal(738000 + i % 400).isoformat(),
+                'creation_time': (_EPOCH + (1700000000 + i * 37) * _ONE_SECOND).isoformat(sep=' '),
+                'status': STATUS_OPTIONS[i % len(STATUS_OPTIONS)],
+                'note': '' if i % 3 else f"See https://example.com/{i}",
+                'image_path': None,
+            })
+        return tasks
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tasks = build_tasks()
+        dict_bytes = tracemalloc.get_traced_memory()[0] - before
+        del tasks
+
+        before = tracemalloc.get_traced_memory()[0]
+        tasks = build_tasks()
+        store = ColumnarTaskStore(tasks)
+        del tasks # 只保留欄位儲存本身（以及它引用的字串）
+        columnar_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return {
+        'tasks': len(store),
+        'dict_bytes_per_task': dict_bytes / task_count,
+        'columnar_bytes_per_task': columnar_bytes / task_count,
+    }
+
+
+if __name__ == "__main__":
+    report = measure_memory_per_task()
+    print(f"Tasks: {report['tasks']}")
+    print(f"list-of-dict: {report['dict_bytes_per_task']:.1f} bytes/task")
+    print(f"columnar:     {report['columnar_bytes_per_task']:.1f} bytes/task")
@@ -2,38 +2,90 @@
 
 import json
 import os
+import shutil
+import threading
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from record_calender import perf
 
 # 確保 DATA_FILE 能夠從外部設定，或者使用一個安全的預設值
 # 在實際應用中，可以通過配置或在 __init__ 函數中傳入路徑
 DEFAULT_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'todo_calendar.json')
+DEFAULT_BACKUP_INTERVAL = 60 * 60 # 儲存時距離上次備份超過這麼多秒就自動備份
+
+def _json_default(obj):
+    """讓 json 能序列化非 list/dict 的任務容器（例如 ColumnarTaskStore 與其列視圖）。"""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 class TaskDataManager:
-    def __init__(self, data_file=None):
+    def __init__(self, data_file=None, backup_interval=DEFAULT_BACKUP_INTERVAL):
         self.data_file = data_file if data_file else DEFAULT_DATA_FILE
         self._next_id = 0 # 內部追蹤下一個可用的 ID
+        self._id_lock = threading.Lock() # 多個執行緒同時取號時不會拿到相同的 ID
+        self.backup_interval = backup_interval # 秒；None 表示不自動備份
+        self._backups = None
+        self._last_backup = None
+
+    @property
+    def backups(self):
+        """資料檔的增量備份（放在資料檔旁的 <資料檔>.backups 目錄）"""
+        if self._backups is None:
+            from record_calender.backup import BackupStore
+            self._backups = BackupStore(f"{self.data_file}.backups")
+        return self._backups
 
-    def _load_raw_tasks(self):
-        """從檔案載入原始 JSON 數據。"""
+    def _load_raw_tasks(self, strict=False):
+        """
+        從檔案載入原始 JSON 數據。
+        :param strict: True 時檔案不存在、無法讀取或內容不是任務列表都會拋出例外（FileNotFoundError、OSError 或 ValueError），
+                       不會當作空的資料檔；同步與備份必須分辨「沒有任務」與「讀取失敗」
+        """
+        if strict:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                try:
+                    raw_tasks = json.load(f)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Could not decode JSON from {self.data_file}: {e}") from e
+            if not isinstance(raw_tasks, list):
+                raise ValueError(f"{self.data_file} does not contain a list of tasks.")
+            return raw_tasks
         if not os.path.exists(self.data_file):
             return []
         try:
             with open(self.data_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except json.JSONDecodeError:
-            print(f"Warning: Could not decode JSON from {self.data_file}. Starting with empty tasks.")
+            # 保留損壞的檔案，之後的儲存不會覆蓋掉唯一的一份資料
+            corrupt_file = f"{self.data_file}.corrupt-{datetime.now():%Y%m%d-%H%M%S}"
+            try:
+                shutil.copy2(self.data_file, corrupt_file)
+            except OSError as e:
+                corrupt_file = f"(copy failed: {e})"
+            print(f"Warning: Could not decode JSON from {self.data_file}. Starting with empty tasks. "
+                  f"The file was copied to {corrupt_file}; "
+                  f"use 'python -m record_calender backup list' and 'backup restore' to recover from a backup.")
             return []
         except Exception as e:
             print(f"Error loading tasks from {self.data_file}: {e}")
             return []
 
-    def load_tasks(self):
-        """從檔案載入待辦事項並進行必要的數據清洗和 ID 初始化。"""
-        raw_tasks = self._load_raw_tasks()
+    @perf.timed("TaskDataManager.load_tasks")
+    def load_tasks(self, strict=False):
+        """
+        從檔案載入待辦事項並進行必要的數據清洗和 ID 初始化。
+        :param strict: 見 _load_raw_tasks；預設 False，讀取失敗時以空的任務列表開始
+        """
+        raw_tasks = self._load_raw_tasks(strict)
         tasks = []
         current_max_id = -1
         
         # 定義所有可能的狀態，與應用程式同步
         STATUS_OPTIONS = ["Pending", "In progress", "Completed", "Cancelled", "On hold"]
+        status_by_lower = {status.lower(): status for status in STATUS_OPTIONS} # 以字典查詢取代逐一比較
 
         for task in raw_tasks:
             # 確保 task 是字典且有 description
@@ -56,34 +108,58 @@ class TaskDataManager:
             task.setdefault('image_path', None)
 
             # 規範化狀態
-            matched_status = next((s for s in STATUS_OPTIONS if s.lower() == task['status'].lower()), None)
-            task['status'] = matched_status if matched_status else 'Pending'
+            if task['status'] not in STATUS_OPTIONS:
+                task['status'] = status_by_lower.get(task['status'].lower(), 'Pending')
 
             tasks.append(task)
         
         self._next_id = current_max_id + 1 if tasks else 0
         return tasks
 
+    @perf.timed("TaskDataManager.save_tasks")
     def save_tasks(self, tasks):
-        """將待辦事項儲存到檔案。"""
+        """將待辦事項儲存到檔案：先寫到暫存檔再取代，其他執行緒或程序不會讀到寫到一半的檔案。"""
+        temp_file = f"{self.data_file}.{threading.get_ident()}.tmp"
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(tasks, f, indent=4, ensure_ascii=False)
-            return True
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(tasks, f, indent=4, ensure_ascii=False, default=_json_default)
+            os.replace(temp_file, self.data_file)
         except Exception as e:
             print(f"Error saving tasks to {self.data_file}: {e}")
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
             return False, e
+        self._maybe_backup(tasks)
+        return True
+
+    def _maybe_backup(self, tasks):
+        """距離上次備份超過 backup_interval 秒時建立增量備份並刪除過舊的快照；備份失敗不影響儲存。"""
+        if self.backup_interval is None:
+            return
+        now = datetime.now()
+        try:
+            if self._last_backup is None:
+                self._last_backup = self.backups.latest_time() or datetime.min
+            if (now - self._last_backup).total_seconds() < self.backup_interval:
+                return
+            self.backups.backup(tasks, now)
+            self.backups.prune(now)
+            self._last_backup = now
+        except Exception as e:
+            print(f"Warning: Could not back up tasks to {self.backups.directory}: {e}")
 
     def get_next_id(self):
-        """取得下一個可用的唯一 ID。"""
-        task_id = self._next_id
-        self._next_id += 1
-        return task_id
+        """取得下一個可用的唯一 ID（執行緒安全）。"""
+        with self._id_lock:
+            task_id = self._next_id
+            self._next_id += 1
+            return task_id
 
     def set_next_id(self, new_id):
         """為測試目的設定下一個 ID。"""
         if new_id >= 0:
-            self._next_id = new_id
+            with self._id_lock:
+                self._next_id = new_id
         else:
             raise ValueError("Next ID cannot be negative.")
 
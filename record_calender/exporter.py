@@ -0,0 +1,128 @@
+# record_calender/exporter.py
+
+import os
+import threading
+from record_calender.task_manager import STATUS_OPTIONS
+
+EXCEL_HEADERS = ["ID", "內容", "到期日", "狀態", "備註/網址", "建立時間"]
+EXCEL_SHEET_TITLE = "待辦事項"
+PROGRESS_EVERY = 2000 # 每寫入這麼多列回報一次進度並檢查是否取消
+
+class ExportCancelled(Exception):
+    """匯出被使用者取消"""
+
+def task_export_row(task):
+    """將任務轉為匯出的一列（與 EXCEL_HEADERS 對應）。"""
+    return [
+        task.get('id', ''),
+        task.get('description', ''),
+        task.get('due_date') or "",
+        task.get('status') if task.get('status') in STATUS_OPTIONS else "未知狀態",
+        task.get('note') if task.get('note') is not None else "",
+        task.get('creation_time') or "",
+    ]
+
+def iter_tasks(task_manager, task_ids=None):
+    """
+    依序產生要匯出的任務，不複製任務內容。
+    :param task_ids: 要匯出的任務 ID（依匯出順序）；None 表示全部任務
+    """
+    if task_ids is None:
+        yield from task_manager.get_tasks() # 只複製外層列表（參考），任務本身在寫入時才讀取
+        return
+    for task_id in task_ids:
+        task = task_manager.get_task_by_id(task_id)
+        if task is not None: # 匯出期間被刪除的任務直接略過
+            yield task
+
+def export_tasks_to_excel(tasks, filepath, progress=None, cancel_event=None, progress_every=PROGRESS_EVERY):
+    """
+    以 openpyxl 的 write-only 模式串流寫入 Excel 檔，每一列寫入後就不再保留在記憶體中。
+    先寫到暫存檔，完成後才取代目標檔案；取消或失敗時不會留下寫到一半的檔案。
+    :param tasks: 任務的可迭代物件（可以是產生器）
+    :param filepath: 輸出的 .xlsx 路徑
+    :param progress: callable(已寫入列數)，每 progress_every 列呼叫一次（在呼叫端的執行緒中）
+    :param cancel_event: threading.Event，被設定時中止匯出並拋出 ExportCancelled
+    :return: 寫入的任務數
+    """
+    import openpyxl # 延遲導入，只有在需要時才載入
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    def clean(value):
+        # Excel 不接受部分控制字元，直接寫入會讓 openpyxl 拋出 IllegalCharacterError
+        return ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(EXCEL_SHEET_TITLE)
+    sheet.append(EXCEL_HEADERS)
+    count = 0
+    try:
+        for task in tasks:
+            sheet.append([clean(value) for value in task_export_row(task)])
+            count += 1
+            if count % progress_every == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+                if progress:
+                    progress(count)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+    except BaseException:
+        sheet.close() # 關閉工作表的暫存檔，否則中止的匯出會留下開啟中的檔案
+        raise
+
+    temp_path = f"{filepath}.{threading.get_ident()}.tmp"
+    try:
+        workbook.save(temp_path)
+        os.replace(temp_path, filepath)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    if progress:
+        progress(count)
+    return count
+
+class ExportJob:
+    """
+    在背景執行緒執行匯出。進度與結果放在屬性中，由主執行緒以 after() 輪詢讀取，背景執行緒不觸碰任何 Tk 元件。
+    """
+
+    def __init__(self, export_function, total=None):
+        """
+        :param export_function: callable(progress, cancel_event) -> 匯出的任務數
+        :param total: 預計的總數（僅用於顯示進度）
+        """
+        self.total = total
+        self.done = 0
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self._export_function = export_function
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self._export_function(self._set_progress, self.cancel_event)
+        except Exception as e:
+            self.error = e
+
+    def _set_progress(self, done):
+        self.done = done
+
+    def cancel(self):
+        """要求取消；匯出會在下一次檢查時停止"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return isinstance(self.error, ExportCancelled)
+
+    def is_finished(self):
+        return not self._thread.is_alive()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
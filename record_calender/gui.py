@@ -4,37 +4,103 @@ import tkinter as tk
 import tkinter.font as tkfont
 from tkinter import ttk, messagebox, filedialog
 import customtkinter
-from tkcalendar import Calendar
 import os
+import sys
 from datetime import datetime, date
 import threading
-from PIL import Image, ImageTk
-import platform
+import queue
+import time
+import importlib.util
+from pathlib import Path
+# tkcalendar 與 PIL 載入較慢，改在第一次使用時才導入（見 open_calendar_dialog 與 load_icons）
 
 # 導入重構後的模組
 from record_calender.task_manager import TaskManager, STATUS_OPTIONS
 from record_calender.data_manager import TaskDataManager
 from record_calender import utils # 導入 utils 模組
+from record_calender import ui_utils # 依賴 Tkinter 的輔助函數
+from record_calender import exporter
+from record_calender import task_io
+from record_calender import ical
+from record_calender.widgets import VirtualTreeview
+from record_calender.calendar_view import CalendarView
+from record_calender.operation_log import OperationLog, DEFAULT_LOG_FILE
+from record_calender.thumbnails import ThumbnailCache
+from record_calender.reminders import ReminderScheduler, REMINDER_TEXTS
+from record_calender import perf
 
 # 從 main.py 獲取 SCRIPT_DIR
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # 現在 SCRIPT_DIR 指向 record_calender/
 
+RENDER_POLL_MS = 15 # 等待背景資料準備完成的輪詢間隔
+RENDER_CHUNK_SECONDS = 0.012 # 每個時間片最多花在 Treeview 插入上的時間
+SEARCH_DEBOUNCE_MS = 150 # 停止輸入多久後才執行搜尋
+NOTE_WINDOW_CHARS = 20000 # 詳細資訊區每次最多插入的備註字元數；更長的備註捲動到底或按「顯示更多」時才載入下一段
+NOTE_LOAD_MORE_THRESHOLD = 0.95 # 捲動到這個比例以下的位置時自動載入下一段
+TREEVIEW_COLUMNS = ("creation_time", "description", "due_date", "status", "note", "image_path")
+LOG_CAPACITY = 5000 # 記憶體中保留的操作日誌筆數
+LOG_PAGE_SIZE = 200 # 操作日誌視窗每頁顯示的筆數
+ICON_SIZE = (16, 16)
+ICON_CACHE_DIR = os.path.join(SCRIPT_DIR, '..', 'assets', '.cache') # 預先縮放好的圖標，之後啟動不必再載入 PIL
+EXPORT_POLL_MS = 100 # 匯出/匯入進度的更新間隔
+IMPORT_QUEUE_CHUNKS = 4 # 背景讀取最多預先讀好的批次數，讓記憶體用量與檔案大小無關
+IMPORT_ERRORS_SHOWN = 20 # 匯入完成時對話框最多列出的錯誤數（全部錯誤會寫入操作日誌）
+REMINDER_TOAST_MS = 15000 # 提醒視窗自動關閉的時間
+REMINDER_TOAST_LINES = 5 # 提醒視窗最多同時列出的提醒數
+PERF_REFRESH_MS = 1000 # 效能視窗的更新間隔
+
 # 設定 customtkinter 的外觀模式和顏色主題
 customtkinter.set_appearance_mode("System")
 customtkinter.set_default_color_theme("blue")
 
 class TodoApp(customtkinter.CTk):
-    def __init__(self, task_manager: TaskManager):
+    def __init__(self, task_manager: TaskManager = None, load_task_manager=None, startup_timer=None):
+        """
+        :param task_manager: 已載入的 TaskManager 實例
+        :param load_task_manager: 未提供 task_manager 時，在背景執行緒呼叫以載入資料的 callable() -> TaskManager；
+                                  視窗會先顯示，資料載入完成後才填充列表
+        :param startup_timer: 可選的啟動計時器（見 main.StartupTimer），用來記錄首次繪製與首次顯示資料的時間
+        """
         super().__init__()
 
-        self.task_manager = task_manager # 注入 TaskManager 實例
-        self.log_entries = []
+        self.task_manager = task_manager # 注入 TaskManager 實例；背景載入時在完成前為 None
+        self.startup_timer = startup_timer
+        self.operation_log = OperationLog(capacity=LOG_CAPACITY, log_file=DEFAULT_LOG_FILE) # 環狀緩衝區 + 背景寫入輪替日誌檔
         self.editing_task_id = None
         self.save_thread = None
         self.show_on_hold = True
+        self.virtual_list_mode = False # 虛擬清單模式：只渲染可見的列，適合大量任務
         self._sort_direction = {}
         self._sort_column = None
         self._icon_refs = [] # 儲存圖片參考
+        self._render_generation = 0 # 每次渲染請求遞增，用來丟棄過期的背景結果
+        self._render_job = None # 進行中的分段插入工作
+        self._pending_render = None # (Tab, 渲染參數)，渲染完成後寫入快取
+        self._render_started = 0.0 # 目前渲染開始的時間，完成時記錄到效能統計
+        self._render_insert_seconds = 0.0 # 目前渲染花在 Treeview 插入上的時間（不含時間片之間的等待）
+        self._render_progress_text = None
+        self.search_text = "" # 目前套用在 Tab 上的搜尋字串
+        self._search_after_id = None # 等待中的（debounce）搜尋
+        self._search_index_requested = False
+        self._row_cache = {} # 任務 ID -> (任務版本, 顯示值)，背景執行緒與主執行緒共用
+        self._tag_cache = {} # 任務 ID -> (任務版本, 逾期/今日到期標籤)
+        self._today_ordinal = date.today().toordinal() # 快取的「今天」，只在午夜計時器觸發時更新
+        self._midnight_after_id = None
+        self.due_date_filter = None # 從行事曆點選的日期，只顯示該日到期的任務
+        self.calendar_view = None # 行事曆檢視，第一次切換到該 Tab 時才建立
+        self._details_note = "" # 詳細資訊區目前任務的完整備註
+        self._details_note_shown = 0 # 已插入 Textbox 的備註字元數
+        self._details_note_end_index = "1.0" # 已插入文字結尾在 Textbox 中的位置
+        self._details_note_loading = False
+        self._details_task_id = None # 詳細資訊區目前顯示的任務
+        self._details_thumbnail = None # 目前顯示的縮圖 PhotoImage（需保留參考）
+        self.thumbnails = ThumbnailCache() # 附件縮圖：背景解碼 + 記憶體 LRU + 磁碟快取
+        self.reminders = ReminderScheduler(self.after, self.after_cancel, self.on_reminder) # 只掛一個 after() 對準最早的提醒
+        self._reminder_toast = None
+        self._reminder_lines = []
+        self._reminder_toast_after_id = None
+        self._export_job = None # 進行中的背景匯出
+        self._import_state = None # 進行中的匯入
 
         self.title("待辦事項 & 行事曆工具")
         self.geometry("1000x650")
@@ -45,10 +111,10 @@ class TodoApp(customtkinter.CTk):
         self.create_menu()
         self.load_icons()
 
-        self.tab_notebook.bind("<<NotebookTabChanged>>", lambda e: self.populate_treeview())
+        self.tab_notebook.bind("<<NotebookTabChanged>>", lambda e: self.populate_treeview()) # 會取消上一個 Tab 未完成的渲染
         
-        # 綁定快捷鍵 (platform specific)
-        if platform.system() == "Darwin":
+        # 綁定快捷鍵 (platform specific)；sys.platform 不需要導入 platform 模組
+        if sys.platform == "darwin":
             self.bind_all("<Command-KeyPress-s>", self.save_tasks_shortcut)
         else:
             self.bind_all("<Control-KeyPress-s>", self.save_tasks_shortcut)
@@ -56,7 +122,55 @@ class TodoApp(customtkinter.CTk):
         self.bind_all("<Return>", self.handle_return_key)
 
         self.log_operation("應用程式啟動")
-        self.populate_treeview() # 首次啟動時填充 Treeview
+        self.schedule_midnight_rollover()
+        self.after(0, self._mark_first_paint)
+        if self.task_manager is None and load_task_manager is not None:
+            self.start_loading_tasks(load_task_manager)
+        else:
+            self.start_reminders()
+            self.populate_treeview() # 首次啟動時填充 Treeview
+
+    def _mark_first_paint(self):
+        """視窗第一次繪製完成時記錄啟動時間"""
+        if self.startup_timer:
+            self.update_idletasks()
+            self.startup_timer.mark("first_paint")
+
+    def start_loading_tasks(self, load_task_manager):
+        """在背景執行緒載入資料檔，視窗先行顯示"""
+        result_queue = queue.Queue(maxsize=1)
+        def worker():
+            try:
+                result_queue.put((True, load_task_manager()))
+            except Exception as e:
+                result_queue.put((False, e))
+        threading.Thread(target=worker, daemon=True).start()
+        self.set_render_progress("正在載入待辦事項...")
+        self.after(RENDER_POLL_MS, self._poll_loaded_tasks, result_queue)
+
+    def _poll_loaded_tasks(self, result_queue):
+        """主執行緒：等待背景載入完成後填充目前的分頁"""
+        try:
+            ok, result = result_queue.get_nowait()
+        except queue.Empty:
+            self.after(RENDER_POLL_MS, self._poll_loaded_tasks, result_queue)
+            return
+        if not ok:
+            self.update_status(f"載入待辦事項時發生錯誤: {result}")
+            self.log_operation(f"背景載入待辦事項時發生錯誤: {result}")
+            return
+        self.task_manager = result
+        if self.startup_timer:
+            self.startup_timer.mark("tasks_ready")
+        self.start_reminders()
+        self.populate_treeview()
+
+    def tasks_loaded(self):
+        """資料是否已載入；尚未載入時在狀態列提示使用者"""
+        if self.task_manager is None:
+            self.update_status("正在載入待辦事項，請稍候...")
+            return False
+        return True
 
     def setup_main_layout(self):
         """設置主視窗的 Canvas 和 Scrollbar"""
@@ -79,9 +193,7 @@ class TodoApp(customtkinter.CTk):
         icon_path = os.path.join(SCRIPT_DIR, '..', 'assets', 'warning.png')
         try:
             if os.path.exists(icon_path):
-                original_image = Image.open(icon_path)
-                resized_image = original_image.resize((16, 16), Image.Resampling.LANCZOS)
-                self.warning_icon = ImageTk.PhotoImage(resized_image)
+                self.warning_icon = self.load_resized_icon(icon_path, ICON_SIZE)
                 self._icon_refs.append(self.warning_icon)
             else:
                 self.warning_icon = None
@@ -90,12 +202,42 @@ class TodoApp(customtkinter.CTk):
             self.warning_icon = None
             self.log_operation(f"載入警告圖標時發生錯誤: {e}")
 
+    def load_resized_icon(self, icon_path, size):
+        """
+        載入縮放後的圖標。縮放結果以 PNG 快取在 ICON_CACHE_DIR，只要原始檔沒有更新，
+        之後直接交給 tk.PhotoImage 讀取（Tk 8.6 內建 PNG 支援），不必導入 PIL 或重新 LANCZOS 縮放。
+        """
+        name, _ = os.path.splitext(os.path.basename(icon_path))
+        cache_path = os.path.join(ICON_CACHE_DIR, f"{name}_{size[0]}x{size[1]}.png")
+        try:
+            if os.path.getmtime(cache_path) >= os.path.getmtime(icon_path):
+                return tk.PhotoImage(master=self, file=cache_path)
+        except (OSError, tk.TclError):
+            pass # 快取不存在、已過期或無法讀取，重新產生
+
+        from PIL import Image, ImageTk # 只有在快取失效時才需要
+        resized_image = Image.open(icon_path).resize(size, Image.Resampling.LANCZOS)
+        try:
+            os.makedirs(ICON_CACHE_DIR, exist_ok=True)
+            resized_image.save(cache_path, format="PNG")
+        except OSError as e:
+            self.log_operation(f"無法寫入圖標快取 '{cache_path}': {e}")
+        return ImageTk.PhotoImage(resized_image, master=self)
+
     def log_operation(self, message):
-        """記錄操作到日誌列表"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_entry = f"{timestamp} - {message}"
-        self.log_entries.append(log_entry)
-        print(log_entry)
+        """記錄操作到日誌（寫檔在背景執行緒進行）"""
+        self.operation_log.log(message)
+
+    def destroy(self):
+        """關閉視窗時，先把尚未寫入的日誌寫完"""
+        if self._export_job is not None:
+            self._export_job.cancel()
+        if self._import_state is not None:
+            self._import_state['cancel_event'].set()
+        self.reminders.stop()
+        self.operation_log.close()
+        self.thumbnails.shutdown()
+        super().destroy()
 
     def create_menu(self):
         """創建應用程式頂部選單"""
@@ -109,17 +251,22 @@ class TodoApp(customtkinter.CTk):
         self.menubar.add_cascade(label="檔案", menu=filemenu)
         filemenu.add_command(label="儲存 (Ctrl+S)", command=self.save_tasks_shortcut)
         filemenu.add_command(label="匯出為 Excel", command=self.export_to_excel)
+        filemenu.add_command(label="匯出為 CSV / JSON Lines / iCalendar...", command=self.export_to_text_file)
+        filemenu.add_command(label="匯入 CSV / JSON Lines / iCalendar...", command=self.import_from_text_file)
         filemenu.add_separator()
         filemenu.add_command(label="結束", command=self.quit)
 
         viewmenu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="查看", menu=viewmenu)
         viewmenu.add_command(label="操作日誌", command=self.show_log_window)
+        viewmenu.add_command(label="效能 (Performance)", command=self.show_performance_window)
 
         optionsmenu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="設置", menu=optionsmenu)
         self.show_on_hold_var = tk.BooleanVar(value=self.show_on_hold)
         optionsmenu.add_checkbutton(label="顯示 On hold 項目", variable=self.show_on_hold_var, command=self.toggle_show_on_hold)
+        self.virtual_list_var = tk.BooleanVar(value=self.virtual_list_mode)
+        optionsmenu.add_checkbutton(label="虛擬清單模式 (大量資料)", variable=self.virtual_list_var, command=self.toggle_virtual_list_mode)
 
     def show_log_window(self):
         """顯示操作日誌視窗"""
@@ -127,23 +274,104 @@ class TodoApp(customtkinter.CTk):
         log_window.title("操作日誌")
         log_window.geometry("600x400")
 
+        nav_frame = customtkinter.CTkFrame(log_window, fg_color="transparent")
+        nav_frame.pack(padx=10, pady=(10, 0), fill="x")
         log_textbox = customtkinter.CTkTextbox(log_window, wrap="word")
         log_textbox.pack(padx=10, pady=10, fill="both", expand=True)
+        page_label = customtkinter.CTkLabel(nav_frame, text="")
+        current_page = [self.operation_log.page_count(LOG_PAGE_SIZE) - 1] # 預設顯示最新的一頁
+
+        def show_page(page):
+            # 每次只把一頁的內容一次插入 Textbox
+            page_count = self.operation_log.page_count(LOG_PAGE_SIZE)
+            current_page[0] = min(max(page, 0), page_count - 1)
+            entries = self.operation_log.get_page(current_page[0], LOG_PAGE_SIZE)
+            log_textbox.configure(state="normal")
+            log_textbox.delete("1.0", tk.END)
+            log_textbox.insert("1.0", "\n".join(entries))
+            log_textbox.configure(state="disabled")
+            dropped = self.operation_log.total_logged - len(self.operation_log)
+            page_label.configure(text=f"第 {current_page[0] + 1} / {page_count} 頁，共 {len(self.operation_log)} 筆"
+                                      + (f"（已捨棄較舊的 {dropped} 筆，完整紀錄見日誌檔）" if dropped else ""))
+
+        customtkinter.CTkButton(nav_frame, text="最舊", width=60, command=lambda: show_page(0)).pack(side=tk.LEFT, padx=2)
+        customtkinter.CTkButton(nav_frame, text="上一頁", width=70, command=lambda: show_page(current_page[0] - 1)).pack(side=tk.LEFT, padx=2)
+        customtkinter.CTkButton(nav_frame, text="下一頁", width=70, command=lambda: show_page(current_page[0] + 1)).pack(side=tk.LEFT, padx=2)
+        customtkinter.CTkButton(nav_frame, text="最新", width=60, command=lambda: show_page(self.operation_log.page_count(LOG_PAGE_SIZE) - 1)).pack(side=tk.LEFT, padx=2)
+        page_label.pack(side=tk.LEFT, padx=10)
+        show_page(current_page[0])
 
-        for entry in self.log_entries:
-            log_textbox.insert(tk.END, entry + "\n")
-
-        log_textbox.configure(state="disabled")
         log_window.transient(self)
         log_window.grab_set()
         log_window.after(10, log_window.lift)
 
+    def show_performance_window(self):
+        """顯示效能視窗：各熱路徑的次數、p50、p95 與最大耗時，每秒更新；可匯出 JSON 附在問題回報中"""
+        perf_window = customtkinter.CTkToplevel(self)
+        perf_window.title("效能 (Performance)")
+        perf_window.geometry("680x360")
+
+        control_frame = customtkinter.CTkFrame(perf_window, fg_color="transparent")
+        control_frame.pack(padx=10, pady=(10, 0), fill="x")
+        stats_textbox = customtkinter.CTkTextbox(perf_window, wrap="none", font=("Courier New", 12))
+        stats_textbox.pack(padx=10, pady=10, fill="both", expand=True)
+        enabled_var = tk.BooleanVar(value=perf.is_enabled())
+
+        def toggle_enabled():
+            if enabled_var.get():
+                perf.enable()
+            else:
+                perf.disable()
+            self.log_operation(f"切換效能計時為: {'開啟' if enabled_var.get() else '關閉'}。")
+
+        def show_stats():
+            text = perf.format_table() if perf.is_enabled() or perf.stats() else "效能計時目前關閉，勾選「啟用計時」後開始記錄。"
+            stats_textbox.configure(state="normal")
+            stats_textbox.delete("1.0", tk.END)
+            stats_textbox.insert("1.0", text)
+            stats_textbox.configure(state="disabled")
+
+        def refresh():
+            if perf_window.winfo_exists(): # 視窗關閉後停止更新
+                show_stats()
+                perf_window.after(PERF_REFRESH_MS, refresh)
+
+        def export_json():
+            filepath = filedialog.asksaveasfilename(parent=perf_window, defaultextension=".json", filetypes=[("JSON", "*.json")],
+                                                    initialfile=f"performance_{datetime.now():%Y%m%d_%H%M%S}.json")
+            if not filepath:
+                return
+            try:
+                perf.dump(filepath)
+            except OSError as e:
+                messagebox.showerror("匯出失敗", f"無法寫入 {filepath}: {e}", parent=perf_window)
+                return
+            self.log_operation(f"已匯出效能統計到 {filepath}。")
+
+        customtkinter.CTkCheckBox(control_frame, text="啟用計時", variable=enabled_var, command=toggle_enabled).pack(side=tk.LEFT, padx=2)
+        customtkinter.CTkButton(control_frame, text="重設", width=60, command=lambda: (perf.reset(), show_stats())).pack(side=tk.LEFT, padx=2)
+        customtkinter.CTkButton(control_frame, text="匯出 JSON...", width=100, command=export_json).pack(side=tk.LEFT, padx=2)
+        refresh()
+
+        perf_window.transient(self)
+        perf_window.after(10, perf_window.lift)
+
     def toggle_show_on_hold(self):
         """切換顯示或隱藏 On hold 狀態的待辦事項"""
         self.show_on_hold = self.show_on_hold_var.get()
         self.populate_treeview()
         self.log_operation(f"切換顯示 On hold 項目為: {'顯示' if self.show_on_hold else '隱藏'}。")
 
+    def toggle_virtual_list_mode(self):
+        """切換虛擬清單模式，只渲染可見範圍內的列"""
+        self.virtual_list_mode = self.virtual_list_var.get()
+        self.cancel_pending_render()
+        for treeview in self.treeviews.values():
+            treeview.set_virtual(self.virtual_list_mode)
+        self._tab_render_state.clear() # 切換模式會清空列，所有 Tab 都需要重新渲染
+        self.populate_treeview()
+        self.log_operation(f"切換虛擬清單模式為: {'開啟' if self.virtual_list_mode else '關閉'}。")
+
     def handle_return_key(self, event):
         """處理 Enter 鍵事件，判斷是否觸發儲存"""
         focused_widget = self.focus_get()
@@ -180,6 +408,15 @@ class TodoApp(customtkinter.CTk):
         self.save_button = customtkinter.CTkButton(self.action_button_frame, text="新增待辦事項", command=self.save_task_gui)
         self.cancel_edit_button = customtkinter.CTkButton(self.action_button_frame, text="取消編輯", command=self.cancel_edit, fg_color="gray", hover_color="darkgray")
 
+        self.search_frame = customtkinter.CTkFrame(self.inner_frame, fg_color="transparent")
+        self.search_label = customtkinter.CTkLabel(self.search_frame, text="搜尋:")
+        self.search_entry = customtkinter.CTkEntry(self.search_frame, placeholder_text="輸入關鍵字篩選目前分頁 (內容/備註)")
+        self.search_clear_button = customtkinter.CTkButton(self.search_frame, text="清除", width=60, command=self.clear_search)
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+        self.search_entry.bind("<FocusIn>", self.prepare_search_index)
+        self.day_filter_label = customtkinter.CTkLabel(self.search_frame, text="")
+        self.day_filter_clear_button = customtkinter.CTkButton(self.search_frame, text="清除日期篩選", width=100, command=self.clear_due_date_filter)
+
         self.tab_notebook = ttk.Notebook(self.inner_frame)
         self.tabs = {}
         for status in STATUS_OPTIONS:
@@ -191,6 +428,9 @@ class TodoApp(customtkinter.CTk):
         self.tab_notebook.add(self.all_tab_frame, text="All")
         self.tabs["all"] = self.all_tab_frame
 
+        self.calendar_tab_frame = customtkinter.CTkFrame(self.tab_notebook)
+        self.tab_notebook.add(self.calendar_tab_frame, text="行事曆")
+
         self.create_treeview_widgets()
         
         self.button_frame = customtkinter.CTkFrame(self.inner_frame, corner_radius=10)
@@ -220,59 +460,95 @@ class TodoApp(customtkinter.CTk):
                                             fg=self._apply_appearance_mode(customtkinter.ThemeManager.theme["CTkEntry"]["text_color"]),
                                             relief="flat", padx=0, pady=0)
         self.details_note_scrollbar_y = ttk.Scrollbar(self.details_frame, command=self.details_note_textbox.yview)
-        self.details_note_textbox.configure(yscrollcommand=self.details_note_scrollbar_y.set)
-
-        self.status_label = customtkinter.CTkLabel(self.inner_frame, text="", anchor=tk.W, padx=10)
+        self.details_note_textbox.configure(yscrollcommand=self.on_details_note_scrolled)
+        self.details_note_textbox.bind("<Button-3>", lambda e: ui_utils.show_context_menu(e, self.details_note_textbox, self, self._details_note))
+        self.details_note_more_button = customtkinter.CTkButton(self.details_frame, text="顯示更多", width=120, command=self.load_more_note)
+        self.details_image_label = customtkinter.CTkLabel(self.details_frame, text="附件:", anchor=tk.NW)
+        self.details_image_frame = customtkinter.CTkFrame(self.details_frame, fg_color="transparent")
+        self.details_image_preview = tk.Label(self.details_image_frame, text="", anchor=tk.W, cursor="hand2")
+        self.details_image_preview.bind("<Button-1>", lambda e: self.open_task_image())
+        self.details_attach_button = customtkinter.CTkButton(self.details_image_frame, text="附加圖片...", width=100, command=self.attach_image_to_task)
+        self.details_detach_button = customtkinter.CTkButton(self.details_image_frame, text="移除圖片", width=80, command=self.remove_image_from_task, fg_color="gray", hover_color="darkgray")
+
+        self.status_frame = customtkinter.CTkFrame(self.inner_frame, fg_color="transparent")
+        self.status_label = customtkinter.CTkLabel(self.status_frame, text="", anchor=tk.W, padx=10)
+        self.status_cancel_button = customtkinter.CTkButton(self.status_frame, text="取消", width=60, fg_color="gray", hover_color="darkgray")
 
     def create_treeview_widgets(self):
-        """為每個 Tab 創建 Treeview"""
+        """準備各 Tab 的 Treeview 容器；Treeview 本身在第一次切換到該 Tab 時才建立"""
         self.treeviews = {}
-        for status, frame in self.tabs.items():
-            tree_frame = customtkinter.CTkFrame(frame, corner_radius=10)
-            tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-            tree_scrollbar_y = ttk.Scrollbar(tree_frame)
-            tree_scrollbar_x = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL)
-
-            treeview = ttk.Treeview(
-                tree_frame,
-                columns=("creation_time", "description", "due_date", "status", "note"),
-                show="headings",
-                yscrollcommand=tree_scrollbar_y.set,
-                xscrollcommand=tree_scrollbar_x.set,
-            )
-            tree_scrollbar_y.config(command=treeview.yview)
-            tree_scrollbar_x.config(command=treeview.xview)
-
-            treeview.heading("creation_time", text="建立時間", anchor=tk.W, command=lambda c="creation_time": self.on_treeview_heading_click(treeview, c))
-            treeview.heading("description", text="內容", anchor=tk.W, command=lambda c="description": self.on_treeview_heading_click(treeview, c))
-            treeview.heading("due_date", text="到期日", anchor=tk.CENTER, command=lambda c="due_date": self.on_treeview_heading_click(treeview, c))
-            treeview.heading("status", text="狀態", anchor=tk.CENTER, command=lambda c="status": self.on_treeview_heading_click(treeview, c))
-            treeview.heading("note", text="備註/網址", anchor=tk.W, command=lambda c="note": self.on_treeview_heading_click(treeview, c))
-
-            treeview.column("creation_time", width=180, anchor=tk.W, stretch=False)
-            treeview.column("description", width=250, anchor=tk.W, stretch=True)
-            treeview.column("due_date", width=120, anchor=tk.CENTER, stretch=False)
-            treeview.column("status", width=80, anchor=tk.CENTER, stretch=False)
-            treeview.column("note", width=520, anchor=tk.W, stretch=True)
-
-            treeview.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-            tree_scrollbar_y.grid(row=0, column=1, sticky="ns")
-            tree_scrollbar_x.grid(row=1, column=0, sticky="ew")
-
-            frame.grid_columnconfigure(0, weight=1)
-            frame.grid_rowconfigure(0, weight=1)
-
-            treeview.bind("<Double-1>", self.load_task_for_editing)
-            treeview.bind("<<TreeviewSelect>>", self.display_selected_task_details)
-
-            self.treeviews[status] = treeview
-            
+        self._tab_render_state = {} # Tab -> 最近一次渲染時的 (資料版本, 排序, 過濾) 參數
+
+    def get_treeview(self, tab_key):
+        """取得（必要時建立）指定 Tab 的 Treeview"""
+        treeview = self.treeviews.get(tab_key)
+        if treeview is None and tab_key in self.tabs:
+            treeview = self.create_treeview(tab_key, self.tabs[tab_key])
+        return treeview
+
+    def get_current_treeview(self):
+        """取得目前分頁的 Treeview"""
+        current_tab_status = self.get_current_tab_status()
+        return self.get_treeview(current_tab_status if current_tab_status else "all")
+
+    def create_treeview(self, tab_key, frame):
+        """為指定的 Tab 創建 Treeview"""
+        tree_frame = customtkinter.CTkFrame(frame, corner_radius=10)
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        tree_scrollbar_y = ttk.Scrollbar(tree_frame)
+        tree_scrollbar_x = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL)
+
+        treeview = VirtualTreeview(
+            tree_frame,
+            fetch_rows=self.fetch_treeview_rows,
+            columns=TREEVIEW_COLUMNS,
+            show="headings",
+            yscrollcommand=tree_scrollbar_y.set,
+            xscrollcommand=tree_scrollbar_x.set,
+        )
+        tree_scrollbar_y.config(command=treeview.yview)
+        tree_scrollbar_x.config(command=treeview.xview)
+
+        treeview.heading("creation_time", text="建立時間", anchor=tk.W, command=lambda c="creation_time": self.on_treeview_heading_click(treeview, c))
+        treeview.heading("description", text="內容", anchor=tk.W, command=lambda c="description": self.on_treeview_heading_click(treeview, c))
+        treeview.heading("due_date", text="到期日", anchor=tk.CENTER, command=lambda c="due_date": self.on_treeview_heading_click(treeview, c))
+        treeview.heading("status", text="狀態", anchor=tk.CENTER, command=lambda c="status": self.on_treeview_heading_click(treeview, c))
+        treeview.heading("note", text="備註/網址", anchor=tk.W, command=lambda c="note": self.on_treeview_heading_click(treeview, c))
+        treeview.heading("image_path", text="附件", anchor=tk.CENTER, command=lambda c="image_path": self.on_treeview_heading_click(treeview, c))
+
+        treeview.column("creation_time", width=180, anchor=tk.W, stretch=False)
+        treeview.column("description", width=250, anchor=tk.W, stretch=True)
+        treeview.column("due_date", width=120, anchor=tk.CENTER, stretch=False)
+        treeview.column("status", width=80, anchor=tk.CENTER, stretch=False)
+        treeview.column("note", width=520, anchor=tk.W, stretch=True)
+        treeview.column("image_path", width=50, anchor=tk.CENTER, stretch=False)
+
+        treeview.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        tree_scrollbar_y.grid(row=0, column=1, sticky="ns")
+        tree_scrollbar_x.grid(row=1, column=0, sticky="ew")
+
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_rowconfigure(0, weight=1)
+
+        treeview.tag_configure(utils.OVERDUE_TAG, background="#ffd9d9")
+        treeview.tag_configure(utils.DUE_TODAY_TAG, background="#fff3c4")
+
+        treeview.bind("<Double-1>", self.load_task_for_editing)
+        treeview.bind("<<TreeviewSelect>>", self.display_selected_task_details)
+
+        treeview.set_virtual(self.virtual_list_mode)
+        self.treeviews[tab_key] = treeview
+        return treeview
+
     def layout_widgets(self):
         self.input_frame.pack(pady=(10, 5), padx=10, fill="x", expand=False)
         self.button_frame.pack(pady=5, padx=10, fill="x", expand=False)
+        self.search_frame.pack(pady=(5, 0), padx=10, fill="x", expand=False)
         self.tab_notebook.pack(pady=10, padx=10, fill="both", expand=True)
         self.details_frame.pack(pady=5, padx=10, fill="x", expand=False)
+        self.status_frame.pack(pady=(0, 5), padx=10, fill="x", expand=False)
+        self.status_label.pack(side=tk.LEFT, fill="x", expand=True)
 
         self.desc_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
         self.desc_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
@@ -288,6 +564,10 @@ class TodoApp(customtkinter.CTk):
         self.input_frame.grid_columnconfigure(3, weight=0)
         self.input_frame.grid_rowconfigure(2, weight=1)
 
+        self.search_label.pack(side=tk.LEFT, padx=(5, 5))
+        self.search_entry.pack(side=tk.LEFT, padx=5, fill="x", expand=True)
+        self.search_clear_button.pack(side=tk.LEFT, padx=5)
+
         self.status_combobox_label.pack(side=tk.LEFT, padx=(5, 0), pady=10)
         self.status_combobox.pack(side=tk.LEFT, padx=5, pady=10)
         self.set_status_button.pack(side=tk.LEFT, padx=5, pady=10)
@@ -314,12 +594,83 @@ class TodoApp(customtkinter.CTk):
         self.details_note_label.grid(row=r, column=0, padx=5, pady=2, sticky="nw")
         self.details_note_textbox.grid(row=r, column=1, columnspan=2, padx=(5, 0), pady=2, sticky="nsew")
         self.details_note_scrollbar_y.grid(row=r, column=3, padx=(0, 5), pady=2, sticky="ns")
+        self.details_note_more_button.grid(row=r + 1, column=1, padx=5, pady=(0, 5), sticky="w")
+        self.details_note_more_button.grid_remove() # 只有備註沒有完全顯示時才出現
+
+        r += 2
+        self.details_image_label.grid(row=r, column=0, padx=5, pady=2, sticky="nw")
+        self.details_image_frame.grid(row=r, column=1, columnspan=2, padx=5, pady=2, sticky="w")
+        self.details_image_preview.pack(side=tk.LEFT, padx=(0, 10))
+        self.details_attach_button.pack(side=tk.LEFT, padx=5)
+        self.details_detach_button.pack(side=tk.LEFT, padx=5)
         self.details_frame.grid_columnconfigure(1, weight=1)
         self.details_frame.grid_columnconfigure(2, weight=1)
         self.details_frame.grid_columnconfigure(3, weight=0)
 
+    def prepare_search_index(self, event=None):
+        """第一次使用搜尋欄時，在背景執行緒預先建立搜尋索引"""
+        if not self._search_index_requested and self.task_manager is not None:
+            self._search_index_requested = True
+            threading.Thread(target=self.task_manager.build_search_index, daemon=True).start()
+
+    def on_search_changed(self, event=None):
+        """搜尋欄內容改變時，延遲一段時間再套用；持續輸入時只保留最後一次"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        """套用搜尋字串到目前的分頁（進行中的舊查詢會被取消）"""
+        self._search_after_id = None
+        search_text = self.search_entry.get().strip()
+        if search_text == self.search_text:
+            return
+        self.search_text = search_text
+        self.populate_treeview()
+
+    def clear_search(self):
+        """清除搜尋字串"""
+        self.search_entry.delete(0, tk.END)
+        self.on_search_changed()
+
+    def is_calendar_tab_selected(self):
+        """目前是否顯示行事曆分頁"""
+        return self.tab_notebook.select() == str(self.calendar_tab_frame)
+
+    def show_calendar_view(self):
+        """顯示（必要時建立）行事曆檢視；資料沒有改變時不會重新繪製"""
+        if self.task_manager is None:
+            return # 資料載入完成後會再呼叫 populate_treeview
+        if self.calendar_view is None:
+            self.calendar_view = CalendarView(self.calendar_tab_frame, self.task_manager, on_day_selected=self.filter_by_due_date)
+            self.calendar_view.pack(fill="both", expand=True, padx=10, pady=10)
+        self.cancel_pending_render()
+        self.calendar_view.refresh()
+
+    def filter_by_due_date(self, day):
+        """從行事曆點選日期後，切換到 All 分頁並只顯示該日到期的任務"""
+        self.due_date_filter = day
+        self.day_filter_label.configure(text=f"到期日: {day.strftime('%Y-%m-%d')}")
+        if not self.day_filter_label.winfo_ismapped():
+            self.day_filter_label.pack(side=tk.LEFT, padx=5, before=self.search_clear_button)
+            self.day_filter_clear_button.pack(side=tk.LEFT, padx=5)
+        self.log_operation(f"從行事曆篩選到期日為 {day.strftime('%Y-%m-%d')} 的任務。")
+        if self.tab_notebook.select() == str(self.all_tab_frame):
+            self.populate_treeview()
+        else:
+            self.tab_notebook.select(self.all_tab_frame) # 觸發 <<NotebookTabChanged>> 後重新填充
+
+    def clear_due_date_filter(self):
+        """清除行事曆的日期篩選"""
+        self.due_date_filter = None
+        self.day_filter_label.pack_forget()
+        self.day_filter_clear_button.pack_forget()
+        self.populate_treeview()
+
     def open_calendar_dialog(self):
         """打開日曆選擇對話框，並嘗試定位在主視窗旁邊"""
+        from tkcalendar import Calendar # 延遲到第一次選取日期時才導入
+
         def grab_date():
             try:
                 selected_date = cal.selection_get()
@@ -374,6 +725,8 @@ class TodoApp(customtkinter.CTk):
         description = self.desc_entry.get().strip()
         due_date_str = self.date_display_label.cget("text").strip()
         note = self.note_textbox.get("1.0", "end-1c").strip()
+        if not self.tasks_loaded():
+            return
 
         focused_widget = self.focus_get()
         if focused_widget in [self.note_textbox, self.details_note_textbox] and not description and not note and self.editing_task_id is None:
@@ -459,7 +812,7 @@ class TodoApp(customtkinter.CTk):
         # 這裡需要獲取所有 Treeview 的 heading，以便清除之前的箭頭
         all_treeviews = list(self.treeviews.values())
         for tv in all_treeviews:
-            for col_id in ("creation_time", "description", "due_date", "status", "note"):
+            for col_id in TREEVIEW_COLUMNS:
                 current_text_parts = tv.heading(col_id, 'text').split(' ')
                 current_text = current_text_parts[0] if current_text_parts else ""
                 tv.heading(col_id, text=current_text)
@@ -470,85 +823,265 @@ class TodoApp(customtkinter.CTk):
 
         self.log_operation(f"按 '{column_name}' 欄位進行了 {'遞減' if self._sort_direction[column_name] == 'descending' else '遞增'} 排序。")
 
-    def populate_treeview(self):
-        """只清空並填充目前顯示的 Treeview"""
+    def get_current_tab_status(self):
+        """取得目前分頁對應的狀態；All 分頁回傳 None"""
         current_tab_text = self.tab_notebook.tab(self.tab_notebook.select(), "text")
-        current_tab_status = next((s for s in STATUS_OPTIONS if s.lower() == current_tab_text.strip().lower()), None)
+        return next((s for s in STATUS_OPTIONS if s.lower() == current_tab_text.strip().lower()), None)
+
+    def task_row_values(self, task):
+        """將任務轉為 Treeview 一列的顯示值（依任務版本快取）"""
+        return self.format_task_rows([task])[0]
+
+    def format_task_rows(self, tasks):
+        """批次產生顯示值；版本沒有改變的任務直接使用快取，不重新格式化"""
+        return utils.format_rows(tasks, self._row_cache, self.task_manager.get_task_revision)
+
+    def task_row_tags(self, task):
+        """
+        取得任務列的逾期/今日到期標籤。由到期日索引與快取的今天序數計算，並依任務版本快取；
+        跨過午夜時由 on_midnight 只更新受影響的任務。
+        """
+        task_id = task['id']
+        revision = self.task_manager.get_task_revision(task_id)
+        cached = self._tag_cache.get(task_id)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        tags = utils.due_tags(self.task_manager.get_task_due_ordinal(task_id), task.get('status'), self._today_ordinal)
+        self._tag_cache[task_id] = (revision, tags)
+        return tags
+
+    def prepare_treeview_rows(self, tasks):
+        """產生 Treeview 的列 (task_id, values, tags)"""
+        return [(task['id'], values, self.task_row_tags(task)) for task, values in zip(tasks, self.format_task_rows(tasks))]
+
+    def fetch_treeview_rows(self, task_ids):
+        """虛擬清單模式下，只為可見範圍內的任務產生顯示資料"""
+        return self.prepare_treeview_rows(self.task_manager.get_tasks_by_ids(task_ids))
+
+    def schedule_midnight_rollover(self):
+        """安排在下一個本地午夜觸發一次 on_midnight（整個應用程式只有一個計時器）"""
+        if self._midnight_after_id is not None:
+            self.after_cancel(self._midnight_after_id)
+        self._midnight_after_id = self.after(utils.ms_until_midnight(), self.on_midnight)
+
+    def on_midnight(self):
+        """日期改變時，只重新標記到期日落在舊「今天」與新「今天」之間的任務"""
+        self._midnight_after_id = None
+        old_today = self._today_ordinal
+        new_today = date.today().toordinal()
+        if new_today != old_today and self.task_manager is not None:
+            self._today_ordinal = new_today
+            start, end = sorted((old_today, new_today))
+            changed = {}
+            for tasks in self.task_manager.get_tasks_by_day(date.fromordinal(start), date.fromordinal(end)).values():
+                for task in tasks:
+                    if task['id'] in self._tag_cache:
+                        del self._tag_cache[task['id']]
+                        changed[task['id']] = self.task_row_tags(task)
+            for treeview in self.treeviews.values():
+                treeview.update_row_tags(changed)
+            if self.calendar_view is not None and self.is_calendar_tab_selected():
+                self.calendar_view.refresh() # 行事曆的渲染狀態包含今天的日期，會自動重繪
+            self.log_operation(f"日期已變更，重新標記 {len(changed)} 個到期狀態改變的待辦事項。")
+        elif new_today != old_today:
+            self._today_ordinal = new_today
+        self.schedule_midnight_rollover()
+
+    def start_reminders(self):
+        """載入所有任務的提醒，之後由 TaskManager 的變更通知增量更新"""
+        if self.task_manager is None:
+            return
+        task_manager = self.task_manager
+        # 到期日序數取自每日分組的索引，不必重新解析每個任務的 due_date
+        self.reminders.load((task['id'], task_manager.get_task_due_ordinal(task['id']), task.get('status'))
+                            for task in task_manager.get_tasks())
+        task_manager.add_listener(self.on_task_changed)
+
+    def on_task_changed(self, event, task):
+        """TaskManager 的變更通知：只更新該任務的提醒（O(log n)）"""
+        if event == 'deleted':
+            self.reminders.remove_task(task['id'])
+        else:
+            self.reminders.set_task(task['id'], self.task_manager.get_task_due_ordinal(task['id']), task.get('status'))
+
+    def on_reminder(self, task_id, kind, fire_time):
+        """提醒到期：在視窗右下角顯示提示，並記錄到狀態列與日誌"""
+        task = self.task_manager.get_task_by_id(task_id) if self.task_manager is not None else None
+        if task is None:
+            return
+        message = f"{REMINDER_TEXTS.get(kind, kind)}：{task.get('description', '')}"
+        self.update_status(f"提醒 - {message}")
+        self.log_operation(f"提醒 (ID: {task_id}) {message}")
+        self.show_reminder_toast(message)
+
+    def show_reminder_toast(self, message):
+        """顯示（或更新）不會搶走焦點的提醒視窗；同時觸發的提醒合併在同一個視窗"""
+        self._reminder_lines = (self._reminder_lines + [message])[-REMINDER_TOAST_LINES:]
+        if self._reminder_toast is None or not self._reminder_toast.winfo_exists():
+            toast = customtkinter.CTkToplevel(self)
+            toast.overrideredirect(True)
+            toast.attributes("-topmost", True)
+            self._reminder_toast_label = customtkinter.CTkLabel(toast, text="", justify=tk.LEFT, wraplength=320)
+            self._reminder_toast_label.pack(padx=12, pady=(10, 4))
+            customtkinter.CTkButton(toast, text="關閉", width=60, command=self.close_reminder_toast).pack(pady=(0, 8))
+            self._reminder_toast = toast
+        self._reminder_toast_label.configure(text="\n".join(f"⏰ {line}" for line in self._reminder_lines))
+        toast = self._reminder_toast
+        toast.update_idletasks()
+        x = self.winfo_rootx() + self.winfo_width() - toast.winfo_reqwidth() - 20
+        y = self.winfo_rooty() + self.winfo_height() - toast.winfo_reqheight() - 40
+        toast.geometry(f"+{max(x, 0)}+{max(y, 0)}")
+        self.bell()
+        if self._reminder_toast_after_id is not None:
+            self.after_cancel(self._reminder_toast_after_id)
+        self._reminder_toast_after_id = self.after(REMINDER_TOAST_MS, self.close_reminder_toast)
+
+    def close_reminder_toast(self):
+        """關閉提醒視窗"""
+        if self._reminder_toast_after_id is not None:
+            self.after_cancel(self._reminder_toast_after_id)
+            self._reminder_toast_after_id = None
+        if self._reminder_toast is not None and self._reminder_toast.winfo_exists():
+            self._reminder_toast.destroy()
+        self._reminder_toast = None
+        self._reminder_lines = []
+
+    def populate_treeview(self, force=False):
+        """
+        以差異更新的方式填充目前顯示的 Treeview。
+        查詢、排序與列資料的格式化在背景執行緒進行，結果透過 after() 交回主執行緒後分段插入；
+        切換 Tab 或重新排序時會取消尚未完成的渲染。
+        若該 Tab 上次渲染後資料版本與排序/過濾參數都沒有改變，則直接沿用，不重新查詢。
+        """
+        if self.task_manager is None:
+            return # 背景載入完成後會再次呼叫
+        if self.is_calendar_tab_selected():
+            self.show_calendar_view()
+            return
+        current_tab_status = self.get_current_tab_status()
+        tab_key = current_tab_status if current_tab_status else "all"
+        treeview = self.get_treeview(tab_key)
+        if treeview is None:
+            return
+        sort_direction = self._sort_direction.get(self._sort_column, 'ascending')
 
-        if current_tab_text.lower().strip() == "all":
-            all_tasks = self.task_manager.get_all_tasks_sorted(self._sort_column, self._sort_direction.get(self._sort_column, 'ascending'))
-            tasks_to_display = [task for task in all_tasks if self.show_on_hold or task.get('status') != 'On hold']
-            treeview = self.treeviews["all"]
+        render_state = (self.task_manager.data_version, self._sort_column, sort_direction, self.show_on_hold, self.search_text, self.due_date_filter, treeview.virtual)
+        if not force and self._tab_render_state.get(tab_key) == render_state:
+            if self._pending_render and self._pending_render[0] != tab_key:
+                self.cancel_pending_render() # 已切換到其他 Tab
+            return
+        if not force and self._pending_render == (tab_key, render_state):
+            return # 相同的渲染已在進行中
+
+        self.cancel_pending_render()
+        self._render_generation += 1
+        self._pending_render = (tab_key, render_state)
+        self._render_started = time.perf_counter()
+        self._render_insert_seconds = 0.0
+        query = (current_tab_status, self._sort_column, sort_direction, self.show_on_hold, self.search_text, self.due_date_filter, treeview.virtual)
+        result_queue = queue.Queue(maxsize=1)
+        threading.Thread(target=self._prepare_rows_worker, args=(query, self._render_generation, result_queue), daemon=True).start()
+        self.set_render_progress("正在準備資料...")
+        self.after(RENDER_POLL_MS, self._poll_prepared_rows, self._render_generation, treeview, result_queue)
+
+    def cancel_pending_render(self):
+        """取消尚未完成的背景查詢與分段插入"""
+        self._render_generation += 1
+        self._pending_render = None
+        if self._render_job is not None:
+            self._render_job.cancel()
+            self._render_job = None
+
+    def _prepare_rows_worker(self, query, generation, result_queue):
+        """背景執行緒：查詢、排序並準備每一列的顯示資料（不可觸碰任何 Tk 元件）"""
+        status, sort_column, sort_direction, show_on_hold, search_text, due_date_filter, virtual = query
+        try:
+            tasks_to_display = self.task_manager.query_tasks(status, sort_column, sort_direction, include_on_hold=show_on_hold, search=search_text, due_on=due_date_filter)
+            if generation != self._render_generation:
+                return # 查詢已被取代（例如持續輸入搜尋字串），不必再格式化
+            if virtual:
+                # 虛擬清單只需要排序後的 ID，顯示資料在捲動時才按需取得
+                rows = [task['id'] for task in tasks_to_display]
+            else:
+                with perf.span("TodoApp.prepare_rows"):
+                    rows = self.prepare_treeview_rows(tasks_to_display)
+            all_tasks = self.task_manager.get_tasks()
+            on_hold_count = sum(1 for task in all_tasks if task.get('status') == 'On hold')
+            result_queue.put((True, (rows, len(all_tasks), on_hold_count)))
+        except Exception as e:
+            result_queue.put((False, e))
+
+    def _poll_prepared_rows(self, generation, treeview, result_queue):
+        """主執行緒：等待背景執行緒的結果，取得後開始插入"""
+        if generation != self._render_generation:
+            return # 已被取消或被新的渲染取代
+        try:
+            ok, result = result_queue.get_nowait()
+        except queue.Empty:
+            self.after(RENDER_POLL_MS, self._poll_prepared_rows, generation, treeview, result_queue)
+            return
+        if not ok:
+            self._pending_render = None
+            self.update_status(f"載入待辦事項時發生錯誤: {result}")
+            self.log_operation(f"準備 Treeview 資料時發生錯誤: {result}")
+            return
+
+        rows, total_count, on_hold_count = result
+        summary = (len(rows), total_count, on_hold_count)
+        if treeview.virtual:
+            with perf.span("TodoApp.treeview_set_rows"):
+                treeview.set_rows(rows)
+            self._finish_render(summary)
         else:
-            # 獲取特定狀態的任務，並應用排序
-            filtered_tasks = self.task_manager.get_tasks_by_status(current_tab_status)
-            # 在這裡，你可以對 filtered_tasks 應用排序，如果 TaskManager 沒有提供帶狀態的排序方法
-            tasks_to_display = filtered_tasks
-            if self._sort_column:
-                # 重新利用 TaskManager 的排序邏輯來排序當前過濾後的任務
-                # 這是手動應用排序，如果 TaskManager 的 get_tasks_by_status 方法本身就能排序更好
-                # 但為了分離職責，這裡只針對已經獲取到的列表進行排序。
-                sort_col_id = self._sort_column
-                sort_direction = self._sort_direction.get(sort_col_id, 'ascending')
-                
-                # 這是 TaskManager.get_all_tasks_sorted 中的排序邏輯，複製過來
-                def sort_key(task):
-                    value = task.get(sort_col_id)
-                    if sort_col_id in ['due_date', 'creation_time']:
-                        try:
-                            if sort_col_id == 'due_date':
-                                return datetime.strptime(str(value).split(' ')[0], '%Y-%m-%d').date() if value else datetime.max.date()
-                            if sort_col_id == 'creation_time':
-                                return datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S') if value else datetime.max
-                        except (ValueError, IndexError):
-                            return datetime.max.date() if sort_col_id == 'due_date' else datetime.max
-                    elif sort_col_id == 'status':
-                        try:
-                            return STATUS_OPTIONS.index(value)
-                        except ValueError:
-                            return len(STATUS_OPTIONS)
-                    return str(value).lower() if value is not None else ''
-                tasks_to_display.sort(key=sort_key, reverse=(sort_direction == 'descending'))
-
-            treeview = self.treeviews.get(current_tab_status)
-            if treeview is None:
-                return
+            # 只對有差異的列進行更新，保留選取狀態與捲動位置
+            self._render_job = treeview.start_sync(rows)
+            self._run_render_chunk(generation, summary)
 
-        for item in treeview.get_children():
-            treeview.delete(item)
-
-        for task in tasks_to_display:
-            status_display = task.get("status", "未知狀態") if task.get("status") in STATUS_OPTIONS else "未知狀態"
-            due_date_display = utils.format_date_with_weekday(task.get("due_date"))
-            note_preview = (
-                str(task.get("note", "")[:60].replace("\n", " ") + "...")
-                if len(str(task.get("note", ""))) > 60
-                else str(task.get("note", "")).replace("\n", " ")
-            )
-            creation_time_display = utils.format_datetime(task.get("creation_time"))
-
-            treeview.insert(
-                "",
-                "end",
-                iid=str(task.get("id")),
-                values=(
-                    creation_time_display,
-                    task.get("description", ""),
-                    due_date_display,
-                    status_display,
-                    note_preview,
-                ),
-            )
-
-        on_hold_count = sum(1 for task in self.task_manager.get_tasks() if task.get('status') == 'On hold')
-        if not self.show_on_hold and on_hold_count > 0:
+    def _run_render_chunk(self, generation, summary):
+        """以時間片方式套用一部分列操作，剩餘的交給下一次 after()"""
+        if generation != self._render_generation or self._render_job is None:
+            return
+        job = self._render_job
+        started = time.perf_counter()
+        finished = job.step(RENDER_CHUNK_SECONDS)
+        self._render_insert_seconds += time.perf_counter() - started
+        if not finished:
+            self.set_render_progress(f"載入中... {job.done}/{job.total}")
+            self.after(1, self._run_render_chunk, generation, summary)
+            return
+        self._render_job = None
+        perf.record("TodoApp.treeview_insert", self._render_insert_seconds)
+        self._finish_render(summary)
+
+    def _finish_render(self, summary):
+        """記錄渲染完成的狀態，並更新狀態列"""
+        shown_count, total_count, on_hold_count = summary
+        tab_key, render_state = self._pending_render
+        self._tab_render_state[tab_key] = render_state
+        self._pending_render = None
+        # 從要求渲染到最後一列插入完成的總時間（包含背景查詢與分段插入之間的等待）
+        perf.record("TodoApp.populate_treeview", time.perf_counter() - self._render_started)
+        if self.startup_timer and not self.startup_timer.finished:
+            self.startup_timer.mark("first_rows")
+            self.startup_timer.finish()
+
+        # 若渲染期間呼叫端已經顯示了自己的訊息，則不覆蓋
+        current_status_text = self.status_label.cget("text")
+        if current_status_text != self._render_progress_text:
+            return
+        if self.search_text:
+            self.update_status(f"搜尋「{self.search_text}」：目前分頁找到 {shown_count} 個待辦事項。")
+        elif self.due_date_filter:
+            self.update_status(f"{self.due_date_filter.strftime('%Y-%m-%d')} 到期：目前分頁有 {shown_count} 個待辦事項。")
+        elif not self.show_on_hold and on_hold_count > 0:
             self.status_label.configure(text=f"已隱藏 {on_hold_count} 個 On hold 項目。")
-        else:
-            current_status_text = self.status_label.cget("text")
-            if "儲存中" not in current_status_text and "已儲存" not in current_status_text:
-                self.update_status(f"總計 {len(self.task_manager.get_tasks())} 個待辦事項。")
+        elif "儲存中" not in current_status_text and "已儲存" not in current_status_text:
+            self.update_status(f"總計 {total_count} 個待辦事項。")
 
-        # self.log_operation(f"Treeview 已重新填充並應用過濾/排序 ({len(tasks_to_display)}/{len(self.task_manager.get_tasks())} 總數顯示)。")
+    def set_render_progress(self, message):
+        """在狀態列顯示渲染進度"""
+        self._render_progress_text = message
+        self.update_status(message)
 
     def load_task_for_editing(self, event=None):
         """從 Treeview 載入選取的任務到輸入框進行編輯"""
@@ -597,8 +1130,7 @@ class TodoApp(customtkinter.CTk):
              if self.cancel_edit_button.winfo_manager() == 'pack':
                  self.cancel_edit_button.pack_forget()
 
-             current_tab = self.tab_notebook.tab(self.tab_notebook.select(), "text").lower()
-             treeview = self.treeviews.get(current_tab)
+             treeview = self.get_current_treeview()
              if treeview:
                  selected_items = treeview.selection()
                  if selected_items:
@@ -609,9 +1141,7 @@ class TodoApp(customtkinter.CTk):
 
     def set_selected_task_status(self):
         """標記選取的待辦事項狀態為下拉選單的值"""
-        current_tab_text = self.tab_notebook.tab(self.tab_notebook.select(), "text")
-        current_tab_status = next((s for s in STATUS_OPTIONS if s.lower() == current_tab_text.strip().lower()), None)
-        treeview = self.treeviews.get(current_tab_status if current_tab_status else "all") # 確保拿到正確的 treeview
+        treeview = self.get_current_treeview() # 確保拿到正確的 treeview
 
         selected_items_iid = treeview.selection()
         if not selected_items_iid:
@@ -653,9 +1183,7 @@ class TodoApp(customtkinter.CTk):
 
     def delete_selected_task(self):
         """刪除選取的待辦事項"""
-        current_tab_text = self.tab_notebook.tab(self.tab_notebook.select(), "text")
-        current_tab_status = next((s for s in STATUS_OPTIONS if s.lower() == current_tab_text.strip().lower()), None)
-        treeview = self.treeviews.get(current_tab_status if current_tab_status else "all")
+        treeview = self.get_current_treeview()
 
         selected_items_iid = treeview.selection()
         if not selected_items_iid:
@@ -727,15 +1255,120 @@ class TodoApp(customtkinter.CTk):
         else:
             self.status_combobox.set("Pending") # 預設回 Pending
         
+        self._details_task_id = task.get('id')
+        self.show_task_thumbnail(task)
+
         self.details_note_textbox.configure(state="normal")
         self.details_note_textbox.delete("1.0", tk.END)
-        self.details_note_textbox.insert("1.0", task.get('note', ''))
+        self._details_note = task.get('note') or ''
+        self._details_note_shown = 0
+        self._details_note_end_index = "1.0"
+        self.load_more_note() # 只插入第一段，成本與備註總長度無關
+
+    def show_task_thumbnail(self, task):
+        """顯示任務附件的縮圖；不在記憶體快取中時交給背景執行緒解碼，完成後才更新"""
+        image_path = task.get('image_path')
+        self._details_thumbnail = None
+        if not image_path:
+            self.details_image_preview.configure(image="", text="無")
+            return
+        image = self.thumbnails.get(image_path)
+        if image is not None:
+            self._set_thumbnail(image)
+            return
+        self.details_image_preview.configure(image="", text="縮圖載入中...")
+        future = self.thumbnails.load_async(image_path)
+        self.after(RENDER_POLL_MS, self._poll_thumbnail, task.get('id'), image_path, future)
+
+    def _poll_thumbnail(self, task_id, image_path, future):
+        """主執行緒：等待縮圖完成；若使用者已選取其他任務則丟棄結果"""
+        if not future.done():
+            self.after(RENDER_POLL_MS, self._poll_thumbnail, task_id, image_path, future)
+            return
+        if task_id != self._details_task_id:
+            return
+        try:
+            image = future.result()
+        except Exception as e:
+            self.details_image_preview.configure(image="", text=f"無法顯示圖片: {os.path.basename(image_path)}")
+            self.log_operation(f"載入附件縮圖失敗 '{image_path}': {e}")
+            return
+        self._set_thumbnail(image)
+
+    def _set_thumbnail(self, image):
+        """將 PIL 縮圖轉為 PhotoImage 顯示（必須在主執行緒）"""
+        from PIL import ImageTk
+        self._details_thumbnail = ImageTk.PhotoImage(image, master=self)
+        self.details_image_preview.configure(image=self._details_thumbnail, text="")
+
+    def attach_image_to_task(self):
+        """為詳細資訊區目前的任務選擇附件圖片"""
+        if self._details_task_id is None:
+            messagebox.showinfo("提示", "請先選取一個待辦事項。")
+            return
+        image_path = filedialog.askopenfilename(
+            title="選擇附件圖片",
+            filetypes=[("圖片檔案", "*.png *.jpg *.jpeg *.gif *.bmp *.webp"), ("所有檔案", "*.*")],
+        )
+        if image_path:
+            self._update_task_image(image_path)
 
-        utils.find_and_tag_urls(self.details_note_textbox)
-        # 為詳細資訊備註框添加右鍵菜單
-        self.details_note_textbox.bind("<Button-3>", lambda e: utils.show_context_menu(e, self.details_note_textbox, self))
+    def remove_image_from_task(self):
+        """移除詳細資訊區目前任務的附件圖片"""
+        if self._details_task_id is not None:
+            self._update_task_image("")
 
-        self.details_note_textbox.configure(state="disabled")
+    def _update_task_image(self, image_path):
+        """更新目前任務的附件並重新整理縮圖與清單"""
+        try:
+            task = self.task_manager.update_task(self._details_task_id, image_path=image_path)
+        except ValueError as e:
+            messagebox.showwarning("附件錯誤", str(e))
+            return
+        if task:
+            self.log_operation(f"{'更新' if image_path else '移除'}待辦事項 (ID: {task['id']}) 的附件圖片。")
+            self.show_task_thumbnail(task)
+            self.populate_treeview()
+
+    def open_task_image(self):
+        """以系統預設程式開啟附件圖片"""
+        task = self.task_manager.get_task_by_id(self._details_task_id) if self._details_task_id is not None else None
+        if task and task.get('image_path'):
+            utils.open_url(Path(os.path.abspath(task['image_path'])).as_uri())
+
+    def load_more_note(self):
+        """將備註的下一段插入詳細資訊區，並只為這一段標記網址"""
+        note = self._details_note
+        start = self._details_note_shown
+        if start >= len(note) and start:
+            return
+        end = utils.note_window_end(note, start, NOTE_WINDOW_CHARS)
+        chunk = note[start:end]
+        start_index = self._details_note_end_index
+        self.details_note_textbox.configure(state="normal")
+        self.details_note_textbox.insert(tk.END, chunk)
+        ui_utils.find_and_tag_urls(self.details_note_textbox, chunk, start_index) # 網址位置依內容快取；會把 Textbox 設回 disabled
+        self._details_note_shown = end
+        self._details_note_end_index = utils.text_end_index(start_index, chunk)
+
+        remaining = len(note) - end
+        if remaining > 0:
+            self.details_note_more_button.configure(text=f"顯示更多 (剩餘 {remaining} 字元)")
+            self.details_note_more_button.grid()
+        else:
+            self.details_note_more_button.grid_remove()
+
+    def on_details_note_scrolled(self, first, last):
+        """備註捲動時更新捲軸；捲動到接近底部且還有未顯示的內容時，載入下一段"""
+        self.details_note_scrollbar_y.set(first, last)
+        if (float(last) >= NOTE_LOAD_MORE_THRESHOLD and self._details_note_shown < len(self._details_note)
+                and not self._details_note_loading):
+            self._details_note_loading = True
+            self.after_idle(self._load_more_note_idle)
+
+    def _load_more_note_idle(self):
+        self._details_note_loading = False
+        self.load_more_note()
 
     def clear_details_display(self):
         """清空詳細資訊顯示區域"""
@@ -747,15 +1380,35 @@ class TodoApp(customtkinter.CTk):
         self.details_note_textbox.delete("1.0", tk.END)
         self.details_note_textbox.tag_remove("url", "1.0", tk.END)
         self.details_note_textbox.configure(state="disabled")
+        self._details_note = ""
+        self._details_note_shown = 0
+        self._details_note_end_index = "1.0"
+        self.details_note_more_button.grid_remove()
+        self._details_task_id = None
+        self._details_thumbnail = None
+        self.details_image_preview.configure(image="", text="")
 
     def export_to_excel(self):
-        """將待辦事項匯出為 Excel 檔案 (.xlsx)"""
-        all_tasks = self.task_manager.get_tasks() # 獲取所有任務
-        if not all_tasks:
+        """
+        將待辦事項匯出為 Excel 檔案 (.xlsx)。
+        匯出在背景執行緒以 write-only 模式串流寫入，狀態列顯示進度並可取消；可選擇只匯出目前分頁（含搜尋、篩選與排序）。
+        """
+        if not self.tasks_loaded():
+            return
+        if self._export_job is not None:
+            self.update_status("已有匯出正在進行中。")
+            return
+        if not self.task_manager.task_count():
             messagebox.showinfo("匯出", "目前沒有待辦事項可匯出。")
             self.log_operation("嘗試匯出到 Excel 失敗：沒有待辦事項。")
             return
 
+        scope = messagebox.askyesnocancel("匯出範圍", "只匯出目前分頁顯示的待辦事項（依目前的搜尋、篩選與排序）？\n\n選擇「否」匯出全部待辦事項。")
+        if scope is None:
+            self.update_status("匯出已取消。")
+            self.log_operation("匯出到 Excel 操作已取消。")
+            return
+
         filepath = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
             filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
@@ -767,41 +1420,222 @@ class TodoApp(customtkinter.CTk):
             self.log_operation("匯出到 Excel 操作已取消。")
             return
 
-        self.update_status(f"匯出到 Excel 中...")
-        self.log_operation(f"開始匯出到 Excel 檔案：{filepath}")
-        try:
-            import openpyxl # 延遲導入，只有在需要時才載入
-
-            workbook = openpyxl.Workbook()
-            sheet = workbook.active
-            sheet.title = "待辦事項"
-
-            headers = ["ID", "內容", "到期日", "狀態", "備註/網址", "建立時間"]
-            sheet.append(headers)
-
-            for task in all_tasks:
-                task_id = task.get('id', '')
-                description = task.get('description', '')
-                due_date = task.get('due_date') if task.get('due_date') else ""
-                status = task.get('status') if task.get('status') in STATUS_OPTIONS else "未知狀態"
-                note = task.get('note') if task.get('note') is not None else ""
-                creation_time = task.get('creation_time') if task.get('creation_time') else ""
-
-                sheet.append([task_id, description, due_date, status, note, creation_time])
-
-            workbook.save(filepath)
+        if importlib.util.find_spec("openpyxl") is None: # 只確認是否已安裝，缺少時直接提示
+            messagebox.showerror("匯出錯誤", "匯出 Excel 需要 'openpyxl' 庫。請運行 'pip install openpyxl'。")
+            self.log_operation("匯出到 Excel 失敗：缺少 openpyxl 庫。")
+            return
 
-            self.update_status(f"待辦事項已成功匯出到 {filepath}")
+        task_manager = self.task_manager
+        query = self.current_view_query() if scope else None
+        def export(progress, cancel_event):
+            # 目前分頁的查詢與排序也在背景執行緒進行
+            task_ids = task_manager.query_task_ids(**query) if query is not None else None
+            job.total = len(task_ids) if task_ids is not None else task_manager.task_count()
+            return exporter.export_tasks_to_excel(exporter.iter_tasks(task_manager, task_ids), filepath, progress, cancel_event)
+        job = self._export_job = exporter.ExportJob(export)
+        job.start()
+        self.show_status_cancel(self.cancel_export)
+        self.update_status("匯出到 Excel 中...")
+        self.log_operation(f"開始匯出到 Excel 檔案：{filepath}（{'目前分頁' if scope else '全部待辦事項'}）")
+        self.after(EXPORT_POLL_MS, self._poll_export, filepath)
+
+    def current_view_query(self):
+        """目前分頁的查詢參數（搜尋、篩選與排序），可直接傳給 TaskManager.query_task_ids"""
+        return {
+            'status': self.get_current_tab_status(),
+            'sort_column': self._sort_column,
+            'sort_direction': self._sort_direction.get(self._sort_column, 'ascending'),
+            'include_on_hold': self.show_on_hold,
+            'search': self.search_text,
+            'due_on': self.due_date_filter,
+        }
+
+    def cancel_export(self):
+        """取消進行中的匯出"""
+        if self._export_job is not None:
+            self._export_job.cancel()
+            self.update_status("正在取消匯出...")
+
+    def _poll_export(self, filepath, label="Excel"):
+        """主執行緒：更新匯出進度，完成後顯示結果"""
+        job = self._export_job
+        if job is None:
+            return
+        if not job.is_finished():
+            if not job.cancel_event.is_set() and job.total is not None:
+                self.update_status(f"匯出到 {label} 中... {job.done}/{job.total}")
+            self.after(EXPORT_POLL_MS, self._poll_export, filepath, label)
+            return
+        self._export_job = None
+        self.hide_status_cancel()
+        if job.cancelled:
+            self.update_status("匯出已取消。")
+            self.log_operation(f"匯出到 {label} 已取消：{filepath}")
+        elif job.error is not None:
+            self.update_status(f"匯出 {label} 時發生錯誤: {job.error}")
+            messagebox.showerror("匯出錯誤", f"匯出 {label} 時發生錯誤:\n{job.error}")
+            self.log_operation(f"匯出到 {label} 失敗：{job.error}")
+        else:
+            self.update_status(f"{job.result} 個待辦事項已成功匯出到 {filepath}")
             messagebox.showinfo("匯出成功", f"待辦事項已成功匯出到\n{filepath}")
-            self.log_operation(f"成功匯出到 Excel 檔案：{filepath}")
+            self.log_operation(f"成功匯出 {job.result} 個待辦事項到 {label} 檔案：{filepath}")
 
-        except ImportError:
-            messagebox.showerror("匯出錯誤", "匯出 Excel 需要 'openpyxl' 庫。請運行 'pip install openpyxl'。")
-            self.log_operation("匯出到 Excel 失敗：缺少 openpyxl 庫。")
-        except Exception as e:
-            self.update_status(f"匯出 Excel 時發生錯誤: {e}")
-            messagebox.showerror("匯出錯誤", f"匯出 Excel 時發生錯誤:\n{e}")
-            self.log_operation(f"匯出到 Excel 失敗：{e}")
+    def export_to_text_file(self):
+        """將全部待辦事項匯出為 CSV、JSON Lines 或 iCalendar（依副檔名），在背景執行緒串流寫入"""
+        if not self.tasks_loaded():
+            return
+        if self._export_job is not None:
+            self.update_status("已有匯出正在進行中。")
+            return
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl"), ("iCalendar files", "*.ics"), ("All files", "*.*")],
+            title="匯出待辦事項為 CSV / JSON Lines / iCalendar"
+        )
+        if not filepath:
+            self.update_status("匯出已取消。")
+            return
+        try:
+            file_format = task_io.detect_format(filepath)
+        except ValueError as e:
+            messagebox.showerror("匯出錯誤", str(e))
+            return
+        component = ical.VTODO
+        if file_format == task_io.ICS_FORMAT and messagebox.askyesno("匯出 iCalendar", "以整天的行事曆事件 (VEVENT) 匯出？\n\n選擇「否」匯出為待辦事項 (VTODO)。只會匯出有到期日的待辦事項。"):
+            component = ical.VEVENT
+        task_manager = self.task_manager
+        def export(progress, cancel_event):
+            return task_io.export_tasks(task_manager, filepath, file_format, component=component,
+                                        progress=progress, cancel_event=cancel_event)
+        job = self._export_job = exporter.ExportJob(export, total=task_manager.task_count())
+        job.start()
+        self.show_status_cancel(self.cancel_export)
+        label = file_format.upper()
+        self.update_status(f"匯出到 {label} 中...")
+        self.log_operation(f"開始匯出到 {label} 檔案：{filepath}")
+        self.after(EXPORT_POLL_MS, self._poll_export, filepath, label)
+
+    def import_from_text_file(self):
+        """
+        從 CSV、JSON Lines 或 iCalendar 匯入待辦事項（.ics 依 UID 略過重複的項目）。檔案在背景執行緒逐批讀取（佇列有上限，記憶體用量固定），
+        主執行緒每次 after() 驗證並加入一批，狀態列顯示進度並可取消；無效的資料會被略過並列出。
+        """
+        if not self.tasks_loaded():
+            return
+        if self._import_state is not None:
+            self.update_status("已有匯入正在進行中。")
+            return
+        filepath = filedialog.askopenfilename(
+            filetypes=[("CSV / JSON Lines / iCalendar", "*.csv *.jsonl *.ndjson *.ics"), ("All files", "*.*")],
+            title="匯入待辦事項"
+        )
+        if not filepath:
+            return
+        try:
+            file_format = task_io.detect_format(filepath)
+        except ValueError as e:
+            messagebox.showerror("匯入錯誤", str(e))
+            return
+
+        chunk_queue = queue.Queue(maxsize=IMPORT_QUEUE_CHUNKS)
+        cancel_event = threading.Event()
+        task_manager = self.task_manager
+        def reader():
+            def put(item):
+                while not cancel_event.is_set():
+                    try:
+                        chunk_queue.put(item, timeout=0.1)
+                        return True
+                    except queue.Full:
+                        continue
+                return False
+            try:
+                existing_uids = ical.task_uids(task_manager.get_tasks()) if file_format == task_io.ICS_FORMAT else None
+                for chunk in task_io.iter_record_chunks(filepath, file_format, existing_uids=existing_uids):
+                    if not put(('chunk', chunk)):
+                        return
+                put(('done', None))
+            except Exception as e:
+                put(('error', e))
+        threading.Thread(target=reader, daemon=True).start()
+        self._import_state = {'filepath': filepath, 'queue': chunk_queue, 'cancel_event': cancel_event,
+                              'processed': 0, 'added': 0, 'skipped': 0, 'errors': [], 'error_count': 0}
+        self.show_status_cancel(self.cancel_import)
+        self.update_status("匯入中...")
+        self.log_operation(f"開始匯入檔案：{filepath}")
+        self.after(EXPORT_POLL_MS, self._poll_import)
+
+    def cancel_import(self):
+        """取消進行中的匯入；已加入的待辦事項會保留並儲存"""
+        if self._import_state is not None:
+            self._import_state['cancel_event'].set()
+            self._finish_import(cancelled=True)
+
+    def _poll_import(self):
+        """主執行緒：在一個時間片內加入背景讀好的資料批次"""
+        state = self._import_state
+        if state is None:
+            return
+        deadline = time.perf_counter() + RENDER_CHUNK_SECONDS * 2
+        waiting = False
+        while time.perf_counter() < deadline:
+            try:
+                kind, payload = state['queue'].get_nowait()
+            except queue.Empty:
+                waiting = True # 背景還在讀取，稍後再檢查
+                break
+            if kind == 'error':
+                self._finish_import(error=payload)
+                return
+            if kind == 'done':
+                self._finish_import()
+                return
+            added, skipped, errors = task_io.add_record_chunk(self.task_manager, payload)
+            state['processed'] += len(payload)
+            state['added'] += added
+            state['skipped'] += skipped
+            # 錯誤在讀到時就寫入操作日誌，只保留前 IMPORT_ERRORS_SHOWN 筆供對話框顯示，記憶體用量不隨錯誤數增加
+            for line, message in errors:
+                self.log_operation(f"匯入 {state['filepath']} 第 {line} 行: {message}")
+            state['errors'].extend(errors[:IMPORT_ERRORS_SHOWN - len(state['errors'])])
+            state['error_count'] += len(errors)
+        self.update_status(f"匯入中... 已處理 {state['processed']} 筆，新增 {state['added']} 個待辦事項")
+        self.after(EXPORT_POLL_MS if waiting else 1, self._poll_import)
+
+    def _finish_import(self, cancelled=False, error=None):
+        """儲存已匯入的待辦事項並顯示結果"""
+        state, self._import_state = self._import_state, None
+        self.hide_status_cancel()
+        if state['added']:
+            self.task_manager.save()
+            self.populate_treeview()
+        errors = state['errors']
+        error_count = state['error_count']
+        summary = task_io.import_summary(state['added'], state['skipped'], error_count)
+        if error is not None:
+            self.update_status(f"匯入時發生錯誤: {error}")
+            messagebox.showerror("匯入錯誤", f"匯入時發生錯誤:\n{error}\n\n{summary}")
+            self.log_operation(f"匯入失敗：{error}（{summary}）")
+            return
+        if cancelled:
+            summary = f"匯入已取消。{summary}"
+        self.update_status(summary)
+        self.log_operation(f"匯入 {state['filepath']}：{summary}")
+        if errors:
+            details = "\n".join(f"第 {line} 行: {message}" for line, message in errors)
+            if error_count > len(errors):
+                details += f"\n… 其餘 {error_count - len(errors)} 筆請見操作日誌"
+            messagebox.showwarning("匯入完成", f"{summary}\n\n{details}")
+        elif not cancelled:
+            messagebox.showinfo("匯入完成", summary)
+
+    def show_status_cancel(self, command):
+        """在狀態列顯示「取消」按鈕"""
+        self.status_cancel_button.configure(command=command)
+        self.status_cancel_button.pack(side=tk.RIGHT, padx=10)
+
+    def hide_status_cancel(self):
+        self.status_cancel_button.pack_forget()
 
     def clear_input_fields(self):
         """清空輸入框內容"""
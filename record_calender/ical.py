@@ -0,0 +1,286 @@
+# record_calender/ical.py
+
+from datetime import date, datetime, timedelta, timezone
+
+VTODO = 'VTODO'
+VEVENT = 'VEVENT'
+COMPONENTS = (VTODO, VEVENT)
+PRODID = "-//Record_calender//待辦事項 & 行事曆工具//ZH"
+UID_DOMAIN = "record-calender"
+STATUS_PROPERTY = "X-RECORD-CALENDER-STATUS" # 保留原始狀態（例如 On hold），讓匯出再匯入時不遺失
+MAX_LINE_OCTETS = 75 # RFC 5545：每行（不含 CRLF）最多 75 個位元組
+
+# 任務狀態 <-> VTODO STATUS
+TODO_STATUS = {
+    "Pending": "NEEDS-ACTION",
+    "In progress": "IN-PROCESS",
+    "Completed": "COMPLETED",
+    "Cancelled": "CANCELLED",
+    "On hold": "NEEDS-ACTION",
+}
+TODO_STATUS_REVERSE = {
+    "NEEDS-ACTION": "Pending",
+    "IN-PROCESS": "In progress",
+    "COMPLETED": "Completed",
+    "CANCELLED": "Cancelled",
+}
+
+def escape_text(value):
+    """依 RFC 5545 跳脫 TEXT 值。"""
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+def unescape_text(value):
+    """還原 escape_text 的跳脫。"""
+    if '\\' not in value:
+        return value
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            char = next(chars, '')
+            result.append('\n' if char in 'nN' else char)
+        else:
+            result.append(char)
+    return ''.join(result)
+
+def fold_line(line):
+    """
+    將一行內容折行：每段最多 75 個位元組（不在 UTF-8 多位元組字元中間切斷），後續段落以空白開頭。
+    :return: 以 CRLF 結尾的字串
+    """
+    if len(line) * 4 <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+    data = line.encode('utf-8')
+    if len(data) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while len(data) - start > limit:
+        end = start + limit
+        while data[end] & 0xC0 == 0x80: # 不在 UTF-8 的延續位元組上切斷
+            end -= 1
+        parts.append(data[start:end])
+        start = end
+        limit = MAX_LINE_OCTETS - 1 # 後續段落開頭的空白佔一個位元組
+    parts.append(data[start:])
+    return b"\r\n ".join(parts).decode('utf-8') + "\r\n"
+
+def unfold_lines(lines):
+    """
+    將折行的內容還原為邏輯行，逐行產生，不需要讀入整個檔案。
+    :param lines: 實體行的可迭代物件（例如開啟的檔案）
+    :return: 產生 (邏輯行開始的行號, 邏輯行) 的產生器
+    """
+    current = None
+    start = 0
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current.append(line[1:])
+            continue
+        if current is not None:
+            yield start, ''.join(current)
+        current = [line] if line else None
+        start = number
+    if current is not None:
+        yield start, ''.join(current)
+
+def parse_content_line(line):
+    """
+    解析一個內容行 NAME;PARAM=VALUE:VALUE。
+    :return: (名稱（大寫）, 參數字典, 值)
+    """
+    index = line.find(':')
+    if index < 0:
+        raise ValueError(f"Invalid content line: {line[:40]}")
+    if '"' in line[:index]:
+        # 參數值以引號包住時可以含有冒號，只有這種情況才逐字元掃描
+        in_quotes = False
+        for index, char in enumerate(line):
+            if char == '"':
+                in_quotes = not in_quotes
+            elif char == ':' and not in_quotes:
+                break
+        else:
+            raise ValueError(f"Invalid content line: {line[:40]}")
+    head, value = line[:index], line[index + 1:]
+    name, *raw_params = head.split(';')
+    params = {}
+    for raw_param in raw_params:
+        key, _, param_value = raw_param.partition('=')
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+def parse_date(value):
+    """取 DATE 或 DATE-TIME 值的日期部分（YYYYMMDD...）；無法解析時回傳 None。"""
+    try:
+        return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+    except (ValueError, IndexError):
+        return None
+
+def parse_datetime(value):
+    """將 DATE-TIME 值（YYYYMMDDTHHMMSS[Z]）轉為 'YYYY-MM-DD HH:MM:SS'；不轉換時區。無法解析時回傳 None。"""
+    if len(value) < 15 or value[8] not in 'Tt':
+        return None
+    try:
+        datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]), int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    except ValueError:
+        return None
+    return f"{value[0:4]}-{value[4:6]}-{value[6:8]} {value[9:11]}:{value[11:13]}:{value[13:15]}"
+
+def format_datetime(value):
+    """將 'YYYY-MM-DD HH:MM:SS' 轉為浮動時間的 DATE-TIME 值；無法解析時回傳 None。"""
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S').strftime('%Y%m%dT%H%M%S')
+    except ValueError:
+        return None
+
+def task_uid(task):
+    """任務的 UID：從 iCalendar 匯入的任務保留原本的 UID，其餘由 ID 與建立時間產生。"""
+    uid = task.get('uid')
+    if uid:
+        return uid
+    stamp = ''.join(char for char in str(task.get('creation_time') or '') if char.isdigit())
+    return f"{task.get('id')}-{stamp}@{UID_DOMAIN}"
+
+def task_uids(tasks):
+    """現有任務的 UID 集合，匯入時用來排除重複的項目。"""
+    return {task_uid(task) for task in tasks}
+
+def component_lines(task, component=VTODO, dtstamp=None):
+    """
+    產生一個任務對應的 VTODO/VEVENT 內容行（未折行）；沒有有效到期日的任務不產生任何內容。
+    """
+    due = parse_date(str(task.get('due_date') or '').replace('-', ''))
+    if due is None:
+        return []
+    status = task.get('status')
+    lines = [f"BEGIN:{component}", f"UID:{escape_text(task_uid(task))}", f"DTSTAMP:{dtstamp}",
+             f"SUMMARY:{escape_text(task.get('description') or '')}"]
+    if task.get('note'):
+        lines.append(f"DESCRIPTION:{escape_text(task['note'])}")
+    created = format_datetime(task.get('creation_time'))
+    if created:
+        lines.append(f"CREATED:{created}")
+    if component == VTODO:
+        lines.append(f"DUE;VALUE=DATE:{due.strftime('%Y%m%d')}")
+        lines.append(f"STATUS:{TODO_STATUS.get(status, 'NEEDS-ACTION')}")
+    else:
+        # 整天的事件：DTEND 為隔天（不包含）
+        lines.append(f"DTSTART;VALUE=DATE:{due.strftime('%Y%m%d')}")
+        lines.append(f"DTEND;VALUE=DATE:{(due + timedelta(days=1)).strftime('%Y%m%d')}")
+        lines.append(f"STATUS:{'CANCELLED' if status == 'Cancelled' else 'CONFIRMED'}")
+    if status:
+        lines.append(f"{STATUS_PROPERTY}:{escape_text(status)}")
+    lines.append(f"END:{component}")
+    return lines
+
+def write_ics(tasks, fileobj, component=VTODO):
+    """
+    將有到期日的任務逐筆寫成 iCalendar，不在記憶體中組出整份內容。
+    :param fileobj: 以文字模式（newline=''）開啟的檔案
+    :param component: 'VTODO'（待辦事項）或 'VEVENT'（整天的事件）
+    :return: 寫入的元件數
+    """
+    if component not in COMPONENTS:
+        raise ValueError(f"Invalid component: {component}. Must be one of {COMPONENTS}.")
+    dtstamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    write = fileobj.write
+    for line in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN"):
+        write(fold_line(line))
+    count = 0
+    for task in tasks:
+        lines = component_lines(task, component, dtstamp)
+        if lines:
+            write(''.join(map(fold_line, lines)))
+            count += 1
+    write(fold_line("END:VCALENDAR"))
+    return count
+
+def iter_components(lines, kinds=COMPONENTS):
+    """
+    逐一產生 VTODO/VEVENT 元件，每次只保留目前元件的屬性；巢狀元件（例如 VALARM）會被略過。
+    :param lines: 實體行的可迭代物件
+    :return: 產生 (元件開始的行號, 元件名稱, {屬性名稱: (參數, 值)}, 錯誤訊息或 None) 的產生器
+    """
+    component = None
+    properties = None
+    start = 0
+    error = None
+    depth = 0 # 目前元件內巢狀元件的深度
+    for number, line in unfold_lines(lines):
+        try:
+            name, params, value = parse_content_line(line)
+        except ValueError as e:
+            if component is not None and error is None:
+                error = str(e)
+            continue
+        if name == 'BEGIN':
+            value = value.upper()
+            if component is not None:
+                depth += 1
+            elif value in kinds:
+                component, properties, start, error = value, {}, number, None
+        elif name == 'END':
+            if component is None:
+                continue
+            if depth:
+                depth -= 1
+            elif value.upper() == component:
+                yield start, component, properties, error
+                component = properties = None
+        elif component is not None and not depth:
+            properties.setdefault(name, (params, value)) # 重複的屬性只取第一個
+
+def component_record(kind, properties):
+    """
+    將元件的屬性轉為 TaskManager.add_tasks_bulk 可接受的資料字典。
+    :return: 資料字典；缺少 UID 時以 None 表示 uid
+    """
+    def text(name):
+        prop = properties.get(name)
+        return unescape_text(prop[1]) if prop is not None else None
+
+    due_prop = properties.get('DUE') if kind == VTODO else None
+    due_prop = due_prop or properties.get('DTSTART')
+    due = parse_date(due_prop[1]) if due_prop is not None else None
+    created_prop = properties.get('CREATED')
+    status = text(STATUS_PROPERTY)
+    if status is None:
+        ical_status = (text('STATUS') or '').upper()
+        if kind == VTODO:
+            status = TODO_STATUS_REVERSE.get(ical_status, "Pending")
+        else:
+            status = "Cancelled" if ical_status == 'CANCELLED' else "Pending"
+    return {
+        'uid': text('UID'),
+        'description': text('SUMMARY'),
+        'note': text('DESCRIPTION'),
+        'due_date': due.isoformat() if due else None,
+        'status': status,
+        'creation_time': parse_datetime(created_prop[1]) if created_prop is not None else None,
+    }
+
+def iter_records(path, existing_uids=None, kinds=COMPONENTS):
+    """
+    逐筆讀取 .ics 檔，轉為匯入用的資料，並依 UID 排除重複（包含與現有任務重複、以及檔案內重複）。
+    :param existing_uids: 已存在的 UID 集合（見 task_uids）；會被就地更新
+    :return: 產生 (行號, 資料字典或 None, 錯誤訊息或 None) 的產生器，與 task_io.iter_records 相同；
+             重複的 UID 是預期中的情況（例如再次匯入同一個檔案），以 (行號, None, None) 表示略過，不算錯誤
+    """
+    seen = existing_uids if existing_uids is not None else set()
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for line, kind, properties, error in iter_components(f, kinds):
+            if error is not None:
+                yield line, None, error
+                continue
+            record = component_record(kind, properties)
+            uid = record['uid']
+            if uid:
+                if uid in seen:
+                    yield line, None, None
+                    continue
+                seen.add(uid)
+            yield line, record, None
@@ -1,21 +1,74 @@
 # record_calender/main.py
 
-import os
+import argparse
+import time
+_START_TIME = time.perf_counter() # 盡早記錄，讓啟動計時包含後續的導入
+
 from record_calender.data_manager import TaskDataManager
-from record_calender.task_manager import TaskManager
-from record_calender.gui import TodoApp
-
-def run_app():
-    # 確保數據檔案路徑正確，相對於項目根目錄
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # data_file_path = os.path.join(script_dir, '..', 'todo_calendar.json')
-    # 為了與 data_manager.py 的 DEFAULT_DATA_FILE 保持一致，讓它自己決定
+
+class StartupTimer:
+    """記錄啟動各階段的時間（相對於程式開始或各自的耗時），並在完成時輸出摘要。"""
+
+    def __init__(self, start_time=None, output=print):
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.output = output
+        self.marks = [] # (名稱, 距離開始的秒數)
+        self.durations = [] # (名稱, 耗時秒數)
+        self.finished = False
+
+    def mark(self, name):
+        """記錄某個時間點（距離開始的時間）"""
+        self.marks.append((name, time.perf_counter() - self.start_time))
+
+    def record(self, name, seconds):
+        """記錄某個階段本身的耗時（例如在背景執行緒中載入資料）"""
+        self.durations.append((name, seconds))
+
+    def report(self):
+        """回傳啟動時間摘要的文字列"""
+        lines = [f"  {name:<12} {seconds * 1000:8.1f} ms (自啟動起)" for name, seconds in self.marks]
+        lines.extend(f"  {name:<12} {seconds * 1000:8.1f} ms (耗時)" for name, seconds in self.durations)
+        return ["啟動時間:"] + lines
+
+    def finish(self):
+        """輸出摘要（只輸出一次）"""
+        if not self.finished:
+            self.finished = True
+            for line in self.report():
+                self.output(line)
+
+def load_task_manager(data_manager, startup_timer=None):
+    """載入並清洗資料檔、建立 TaskManager；可在背景執行緒呼叫。"""
+    from record_calender.task_manager import TaskManager
+    started = time.perf_counter()
+    task_manager = TaskManager(data_manager)
+    if startup_timer:
+        startup_timer.record("load", time.perf_counter() - started)
+    return task_manager
+
+def run_app(argv=None):
+    parser = argparse.ArgumentParser(description="待辦事項 & 行事曆工具")
+    parser.add_argument("--startup-timing", action="store_true", help="在終端機輸出啟動時間分析（導入、載入資料、首次繪製）")
+    parser.add_argument("--perf", action="store_true", help="啟用熱路徑計時（也可以在「查看 > 效能」視窗中開啟）")
+    parser.add_argument("--perf-dump", metavar="FILE", help="結束時將效能統計寫成 JSON 檔（隱含 --perf）")
+    args = parser.parse_args(argv)
+    if args.perf or args.perf_dump:
+        from record_calender import perf
+        perf.enable()
+    startup_timer = StartupTimer(_START_TIME) if args.startup_timing else None
+
     # data_manager 已經處理了相對路徑，不需要這裡再處理
     data_manager = TaskDataManager()
-    task_manager = TaskManager(data_manager)
-    
-    app = TodoApp(task_manager)
+
+    from record_calender.gui import TodoApp # 導入 GUI 相關套件佔啟動時間的大部分，單獨計時
+    if startup_timer:
+        startup_timer.mark("import")
+
+    # 視窗先行顯示，資料檔在背景執行緒載入
+    app = TodoApp(load_task_manager=lambda: load_task_manager(data_manager, startup_timer), startup_timer=startup_timer)
     app.mainloop()
+    if args.perf_dump:
+        perf.dump(args.perf_dump)
 
 if __name__ == "__main__":
-    run_app()
\ No newline at end of file
+    run_app()
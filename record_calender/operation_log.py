@@ -0,0 +1,104 @@
+# record_calender/operation_log.py
+
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+DEFAULT_LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'operations.log')
+DEFAULT_CAPACITY = 5000 # 記憶體中最多保留的日誌筆數
+DEFAULT_MAX_BYTES = 1024 * 1024 # 日誌檔超過這個大小就輪替
+DEFAULT_BACKUP_COUNT = 3 # 保留的舊日誌檔數量
+
+class OperationLog:
+    """
+    操作日誌：最近的項目保存在固定容量的環狀緩衝區 (deque)，超過容量時自動丟棄最舊的項目；
+    寫檔交給 QueueListener 的背景執行緒與 RotatingFileHandler，呼叫端只需把紀錄放進佇列。
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, log_file=None, max_bytes=DEFAULT_MAX_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT, echo=False):
+        """
+        :param capacity: 記憶體中保留的筆數
+        :param log_file: 日誌檔路徑；None 表示不寫檔
+        :param max_bytes: 日誌檔輪替的大小上限
+        :param backup_count: 保留的舊日誌檔數量
+        :param echo: 是否同時輸出到 stdout（除錯用）
+        """
+        if capacity <= 0:
+            raise ValueError("Log capacity must be positive.")
+        self.capacity = capacity
+        self.echo = echo
+        self.total_logged = 0 # 啟動以來的總筆數（包含已被丟棄的）
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._listener = None
+        self._queue_handler = None
+        if log_file:
+            file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+            log_queue = queue.SimpleQueue()
+            self._listener = QueueListener(log_queue, file_handler)
+            self._listener.start()
+            # 直接交給 QueueHandler，不註冊全域 logger，避免與其他 logging 設定互相干擾
+            self._queue_handler = QueueHandler(log_queue)
+
+    def log(self, message):
+        """
+        記錄一筆操作。
+        :return: 加上時間戳記後的日誌字串
+        """
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        log_entry = f"{timestamp} - {message}"
+        with self._lock:
+            self._entries.append(log_entry)
+            self.total_logged += 1
+        queue_handler = self._queue_handler # close() 可能在其他執行緒同時執行
+        if queue_handler is not None:
+            # 只放進佇列，實際寫檔在背景執行緒
+            queue_handler.handle(logging.makeLogRecord({'msg': log_entry, 'levelno': logging.INFO, 'levelname': 'INFO'}))
+        if self.echo:
+            print(log_entry)
+        return log_entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self):
+        """回傳緩衝區內所有項目的副本（由舊到新）"""
+        with self._lock:
+            return list(self._entries)
+
+    def page_count(self, page_size):
+        """以 page_size 分頁時的總頁數（至少 1 頁）"""
+        return max(1, -(-len(self._entries) // page_size))
+
+    def get_page(self, page, page_size):
+        """
+        取得某一頁的項目（由舊到新），只複製該頁的內容。
+        :param page: 頁碼，從 0 開始；超出範圍時取最接近的一頁
+        :return: 日誌字串列表
+        """
+        with self._lock:
+            last_page = max(0, (len(self._entries) - 1) // page_size)
+            page = min(max(page, 0), last_page)
+            start = page * page_size
+            # deque 沒有切片，依頁面位置從較近的一端走訪，避免從頭複製整個緩衝區
+            if start <= len(self._entries) // 2:
+                return list(islice(self._entries, start, start + page_size))
+            items = list(islice(reversed(self._entries), len(self._entries) - start))
+            items.reverse()
+            return items[:page_size]
+
+    def close(self):
+        """停止背景寫檔執行緒，並把佇列中剩餘的紀錄寫完"""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+            self._queue_handler = None
@@ -0,0 +1,157 @@
+# record_calender/perf.py
+
+# 熱路徑的計時：以 span / timed 標記要計時的區段，每個名稱保留最近 WINDOW 次的耗時，計算次數、p50、p95 與最大值。
+# 預設關閉；關閉時 span() 只回傳共用的空 context manager，timed() 包裝的函式只多一次旗標檢查。
+# 啟用方式：perf.enable()、環境變數 RECORD_CALENDER_PERF=1，或主程式的 --perf 參數。
+#
+#     with perf.span("TodoApp.treeview_insert"): ...
+#
+#     @perf.timed("TaskDataManager.load_tasks")
+#     def load_tasks(self): ...
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+ENV_VAR = "RECORD_CALENDER_PERF"
+WINDOW = 1000 # 每個名稱保留最近的耗時筆數，百分位數只以這些計算
+
+_enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+_stats = {}
+_lock = threading.Lock()
+
+class SpanStats:
+    """單一名稱的統計：總次數、總耗時，以及最近 WINDOW 次耗時的環狀緩衝區"""
+    __slots__ = ('count', 'total', 'recent')
+
+    def __init__(self, window=WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def summary(self):
+        """
+        :return: {'count', 'total_ms', 'p50_ms', 'p95_ms', 'max_ms', 'last_ms'}；百分位數與最大值只看最近的 WINDOW 次
+        """
+        recent = sorted(self.recent)
+        def percentile(fraction):
+            return recent[min(len(recent) - 1, int(len(recent) * fraction))] * 1000 if recent else 0.0
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'max_ms': recent[-1] * 1000 if recent else 0.0,
+            'last_ms': self.recent[-1] * 1000 if self.recent else 0.0,
+        }
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def record(name, seconds):
+    """記錄一次耗時（秒）；關閉時不做任何事"""
+    if not _enabled:
+        return
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = SpanStats()
+        stats.add(seconds)
+
+class _Span:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.started)
+        return False
+
+class _NullSpan:
+    """關閉時使用的空 context manager（共用一個實例，不配置物件）"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name):
+    """計時 with 區塊的 context manager"""
+    return _Span(name) if _enabled else _NULL_SPAN
+
+def timed(name):
+    """計時整個函式的裝飾器；是否計時在每次呼叫時判斷，執行期間可以隨時開關"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+def stats():
+    """
+    取得目前的統計。
+    :return: {名稱: summary()}，依名稱排序
+    """
+    with _lock:
+        return {name: _stats[name].summary() for name in sorted(_stats)}
+
+def reset():
+    """清除所有統計"""
+    with _lock:
+        _stats.clear()
+
+def format_table(summaries=None):
+    """以固定寬度的文字表格呈現統計，供效能視窗與終端機使用"""
+    summaries = stats() if summaries is None else summaries
+    lines = [f"{'span':<36}{'count':>8}{'p50 ms':>11}{'p95 ms':>11}{'max ms':>11}"]
+    lines.extend(f"{name:<36}{item['count']:>8}{item['p50_ms']:>11.2f}{item['p95_ms']:>11.2f}{item['max_ms']:>11.2f}"
+                 for name, item in summaries.items())
+    return "\n".join(lines)
+
+def dump(path):
+    """將統計與執行環境寫成 JSON 檔，方便附在問題回報中"""
+    import platform # 只有輸出報告時才需要，不放在 GUI 啟動時的導入路徑上
+    report = {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'enabled': _enabled,
+        'window': WINDOW,
+        'spans': stats(),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
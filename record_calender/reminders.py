@@ -0,0 +1,165 @@
+# record_calender/reminders.py
+
+import heapq
+from datetime import datetime, time, timedelta
+
+DUE_TODAY = 'due_today'
+DUE_SOON = 'due_soon'
+DEADLINE_OFFSET = timedelta(hours=18) # 到期日沒有時間，以當天 18:00 作為截止時間
+# (提醒種類, 相對於到期日 00:00 的時間)
+DEFAULT_REMINDERS = (
+    (DUE_TODAY, timedelta(hours=9)), # 當天早上提醒「今天到期」
+    (DUE_SOON, DEADLINE_OFFSET - timedelta(hours=1)), # 截止前 1 小時
+)
+REMINDER_TEXTS = {DUE_TODAY: "今天到期", DUE_SOON: "1 小時後到期"}
+CLOSED_STATUSES = ("Completed", "Cancelled") # 這些狀態的任務不需要提醒
+MAX_TIMER_MS = 60 * 60 * 1000 # 計時器最長的等待時間；較遠的提醒會分段等待，也能應付系統休眠或時鐘調整
+COMPACT_RATIO = 2 # 堆積中失效項目超過有效項目的這個倍數時重建堆積
+
+class ReminderScheduler:
+    """
+    以最小堆積 (heapq) 排程到期提醒。每個任務的提醒依觸發時間放入堆積，
+    任務修改或刪除時不從堆積中移除舊項目，而是遞增該任務的世代編號，彈出時再略過過期的項目（lazy deletion）；
+    每次變更的成本為 O(log n)。整個排程器只掛一個計時器，對準最早的提醒。
+    """
+
+    def __init__(self, arm_timer, cancel_timer, on_reminder, reminders=DEFAULT_REMINDERS, clock=datetime.now):
+        """
+        :param arm_timer: callable(delay_ms, callback) -> handle，例如 Tk 的 after
+        :param cancel_timer: callable(handle)，例如 Tk 的 after_cancel
+        :param on_reminder: callable(task_id, kind, fire_time)，提醒觸發時呼叫
+        :param reminders: ((種類, 相對於到期日 00:00 的 timedelta), ...)
+        :param clock: 回傳目前時間的 callable，測試時可替換
+        """
+        self._arm_timer = arm_timer
+        self._cancel_timer = cancel_timer
+        self.on_reminder = on_reminder
+        self.reminders = tuple(reminders)
+        self.clock = clock
+        self._heap = [] # (觸發時間, 序號, 任務 ID, 世代, 種類)
+        self._generations = {} # 任務 ID -> 目前的世代；不在字典中表示沒有提醒
+        self._pending = {} # 任務 ID -> 堆積中仍有效的提醒數
+        self._live = 0 # 堆積中仍有效的項目數
+        self._counter = 0 # 相同觸發時間時維持插入順序，並避免比較任務 ID
+        self._timer = None
+        self._armed_at = None # 目前計時器對準的觸發時間
+
+    def __len__(self):
+        return self._live
+
+    def _fire_times(self, due_ordinal, status, now):
+        """計算一個任務尚未到達的提醒時間"""
+        if due_ordinal is None or status in CLOSED_STATUSES:
+            return []
+        midnight = datetime.combine(datetime.fromordinal(due_ordinal).date(), time.min)
+        return [(midnight + offset, kind) for kind, offset in self.reminders if midnight + offset > now]
+
+    def load(self, items):
+        """
+        一次載入所有任務（O(n) 建立堆積），取代目前的排程。
+        :param items: (task_id, due_ordinal, status) 的可迭代物件
+        """
+        now = self.clock()
+        heap = []
+        self._generations = {}
+        self._pending = {}
+        for task_id, due_ordinal, status in items:
+            generation = self._generations.get(task_id, 0) + 1
+            self._generations[task_id] = generation
+            fire_times = self._fire_times(due_ordinal, status, now)
+            self._pending[task_id] = len(fire_times)
+            for fire_time, kind in fire_times:
+                self._counter += 1
+                heap.append((fire_time, self._counter, task_id, generation, kind))
+        heapq.heapify(heap)
+        self._heap = heap
+        self._live = len(heap)
+        self._rearm()
+
+    def set_task(self, task_id, due_ordinal, status):
+        """新增或更新一個任務的提醒；舊的提醒會失效"""
+        self._invalidate(task_id)
+        generation = self._generations.get(task_id, 0) + 1
+        self._generations[task_id] = generation
+        fire_times = self._fire_times(due_ordinal, status, self.clock())
+        for fire_time, kind in fire_times:
+            self._counter += 1
+            heapq.heappush(self._heap, (fire_time, self._counter, task_id, generation, kind))
+        self._pending[task_id] = len(fire_times)
+        self._live += len(fire_times)
+        self._compact_if_needed()
+        self._rearm()
+
+    def remove_task(self, task_id):
+        """移除一個任務的所有提醒"""
+        self._invalidate(task_id)
+        self._generations.pop(task_id, None)
+        self._compact_if_needed()
+        self._rearm()
+
+    def _invalidate(self, task_id):
+        """讓任務目前在堆積中的提醒失效：不搜尋堆積，只遞增世代並更新計數"""
+        if task_id in self._generations:
+            self._generations[task_id] += 1
+            self._live -= self._pending.pop(task_id, 0)
+
+    def _is_live(self, entry):
+        return self._generations.get(entry[2]) == entry[3]
+
+    def _compact_if_needed(self):
+        """失效項目過多時重建堆積，避免記憶體隨編輯次數無限成長"""
+        if len(self._heap) > 64 and len(self._heap) > (self._live + 1) * (COMPACT_RATIO + 1):
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+
+    def _peek(self):
+        """回傳最早的有效項目，順便丟棄堆積頂端的失效項目"""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _rearm(self):
+        """讓唯一的計時器對準最早的提醒；最早的提醒沒變時不重新設定"""
+        entry = self._peek()
+        fire_time = entry[0] if entry else None
+        if fire_time == self._armed_at and (self._timer is not None or fire_time is None):
+            return
+        if self._timer is not None:
+            self._cancel_timer(self._timer)
+            self._timer = None
+        self._armed_at = fire_time
+        if fire_time is None:
+            return
+        delay_ms = int((fire_time - self.clock()).total_seconds() * 1000)
+        self._timer = self._arm_timer(min(max(delay_ms, 0), MAX_TIMER_MS), self._on_timer)
+
+    def _on_timer(self):
+        """計時器觸發：送出所有已到時間的提醒，再對準下一個"""
+        self._timer = None
+        self._armed_at = None
+        now = self.clock()
+        due = []
+        while True:
+            entry = self._peek()
+            if entry is None or entry[0] > now:
+                break
+            heapq.heappop(self._heap)
+            self._live -= 1
+            self._pending[entry[2]] -= 1
+            due.append(entry)
+        for fire_time, _, task_id, _, kind in due:
+            self.on_reminder(task_id, kind, fire_time)
+        self._rearm()
+
+    def next_fire_time(self):
+        """最早的提醒時間（沒有提醒時為 None）"""
+        entry = self._peek()
+        return entry[0] if entry else None
+
+    def stop(self):
+        """取消計時器"""
+        if self._timer is not None:
+            self._cancel_timer(self._timer)
+            self._timer = None
+            self._armed_at = None
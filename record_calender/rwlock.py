@@ -0,0 +1,111 @@
+# record_calender/rwlock.py
+
+import threading
+
+class ReadWriteLock:
+    """
+    讀寫鎖：多個讀取者可以同時持有，寫入者獨占。有寫入者在等待時，新的讀取者會等待，避免寫入者飢餓。
+
+    - 可重入：已持有讀取鎖的執行緒可以再次取得讀取鎖（即使有寫入者在等待也不會死結）；
+      持有寫入鎖的執行緒可以再次取得寫入鎖或讀取鎖。
+    - 不支援升級：持有讀取鎖時要求寫入鎖會拋出 RuntimeError（兩個讀取者同時升級必定死結）。
+
+    用法：
+        with lock.read(): ...
+        with lock.write(): ...
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._cond = threading.Condition(self._mutex) # 直接以 with self._mutex 進入，比 Condition 的 __enter__ 快
+        self._readers = 0 # 持有讀取鎖的執行緒數
+        self._writer = None # 持有寫入鎖的執行緒 ID
+        self._write_depth = 0 # 寫入者的重入次數（包含它取得的讀取鎖）
+        self._writers_waiting = 0
+        self._local = threading.local() # 每個執行緒持有讀取鎖的次數
+        self._read_guard = _Guard(self.acquire_read, self.release_read)
+        self._write_guard = _Guard(self.acquire_write, self.release_write)
+
+    def read(self):
+        """取得讀取鎖的 context manager"""
+        return self._read_guard
+
+    def write(self):
+        """取得寫入鎖的 context manager"""
+        return self._write_guard
+
+    def acquire_read(self):
+        if self._writer == threading.get_ident():
+            self._write_depth += 1 # 寫入者讀取：視為重入寫入鎖
+            return
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if depth:
+            local.depth = depth + 1 # 已經是讀取者，直接重入，不等待排隊中的寫入者
+            return
+        with self._mutex:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        local.depth = 1
+
+    def release_read(self):
+        if self._writer == threading.get_ident():
+            self.release_write()
+            return
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if not depth:
+            raise RuntimeError("Cannot release a read lock that is not held.")
+        local.depth = depth - 1
+        if depth == 1:
+            with self._mutex:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if getattr(self._local, 'depth', 0):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock.")
+        with self._mutex:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        if self._writer != threading.get_ident():
+            raise RuntimeError("Cannot release a write lock that is not held.")
+        self._write_depth -= 1
+        if not self._write_depth:
+            with self._mutex:
+                self._writer = None
+                self._cond.notify_all()
+
+    def is_write_locked(self):
+        """目前的執行緒是否持有寫入鎖"""
+        return self._writer == threading.get_ident()
+
+class _Guard:
+    """不需要產生器的輕量 context manager"""
+    __slots__ = ('_acquire', '_release')
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._release()
+        return False
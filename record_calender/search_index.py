@@ -0,0 +1,131 @@
+# record_calender/search_index.py
+
+from array import array
+from bisect import bisect_left
+
+NGRAM_SIZE = 3
+MAX_INDEXED_CHARS = 4000 # 每個任務最多索引的字元數；超過的任務改列入 overflow，查詢時逐一驗證
+
+def normalize_text(text):
+    """搜尋用的正規化：轉小寫（對 CJK 文字沒有影響）。"""
+    return text.casefold() if text else ''
+
+def _grams(text):
+    """取得文字中所有不重複的 n-gram；短於 NGRAM_SIZE 的文字本身即為一個 gram。"""
+    if len(text) < NGRAM_SIZE:
+        return {text} if text else set()
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+class SearchIndex:
+    """
+    以 n-gram 倒排索引支援子字串搜尋（適用於中英文混合內容）。
+    每個 gram 對應一個排序過的 array('q') ID 列表，每筆 (gram, ID) 只佔 8 bytes；
+    查詢時取各 gram 的交集作為候選，再由呼叫端提供的文字做最後的子字串驗證。
+    """
+
+    def __init__(self):
+        self._postings = {} # gram -> 排序過的 array('q')
+        self._overflow = set() # 內容過長、只索引了前段的任務 ID
+
+    def __len__(self):
+        return len(self._postings)
+
+    def add_many(self, items):
+        """
+        批次索引多個任務，比逐一 add 快得多（用於第一次建立索引）。
+        :param items: (task_id, text) 的可迭代物件
+        """
+        collected = {}
+        for task_id, text in items:
+            text = normalize_text(text)
+            if len(text) > MAX_INDEXED_CHARS:
+                self._overflow.add(task_id)
+                text = text[:MAX_INDEXED_CHARS]
+            for gram in _grams(text):
+                ids = collected.get(gram)
+                if ids is None:
+                    collected[gram] = [task_id]
+                else:
+                    ids.append(task_id)
+        for gram, ids in collected.items():
+            existing = self._postings.get(gram)
+            if existing is not None:
+                ids.extend(existing)
+            self._postings[gram] = array('q', sorted(set(ids)))
+
+    def add(self, task_id, text):
+        """索引一個任務的文字；重複加入同一個 ID 不會產生重複項目。"""
+        text = normalize_text(text)
+        if len(text) > MAX_INDEXED_CHARS:
+            self._overflow.add(task_id)
+            text = text[:MAX_INDEXED_CHARS]
+        for gram in _grams(text):
+            posting = self._postings.get(gram)
+            if posting is None:
+                self._postings[gram] = array('q', [task_id])
+                continue
+            position = bisect_left(posting, task_id)
+            if position == len(posting) or posting[position] != task_id:
+                posting.insert(position, task_id)
+
+    def remove(self, task_id, text):
+        """移除一個任務在索引中的項目；text 必須是當初索引時的文字。"""
+        text = normalize_text(text)
+        self._overflow.discard(task_id)
+        for gram in _grams(text[:MAX_INDEXED_CHARS]):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            position = bisect_left(posting, task_id)
+            if position < len(posting) and posting[position] == task_id:
+                del posting[position]
+                if not posting:
+                    del self._postings[gram]
+
+    def candidates(self, query):
+        """
+        回傳可能包含 query 的任務 ID 集合（需再驗證）。
+        :param query: 已正規化的查詢字串
+        """
+        if len(query) < NGRAM_SIZE:
+            # 短查詢：合併所有包含該字串的 gram
+            result = set()
+            for gram, posting in self._postings.items():
+                if query in gram:
+                    result.update(posting)
+            return result | self._overflow
+
+        postings = [self._postings.get(gram) for gram in _grams(query)]
+        if any(posting is None for posting in postings):
+            return set(self._overflow)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result | self._overflow
+
+    def search(self, query, get_text):
+        """
+        搜尋包含 query 的任務。
+        :param query: 查詢字串（不區分大小寫）
+        :param get_text: callable(task_id) -> 任務目前的文字，用於驗證候選結果；回傳 None 表示任務不存在
+        :return: 符合的任務 ID 集合
+        """
+        query = normalize_text(query)
+        if not query:
+            return set()
+        candidates = self.candidates(query)
+        if len(query) <= NGRAM_SIZE:
+            # 查詢不長於一個 gram 時，候選結果本身就是精確的；只有 overflow 的任務需要驗證
+            exact = candidates - self._overflow
+            to_verify = candidates & self._overflow
+        else:
+            exact, to_verify = set(), candidates
+        matches = set()
+        for task_id in to_verify:
+            text = get_text(task_id)
+            if text is not None and query in normalize_text(text):
+                matches.add(task_id)
+        return exact | matches
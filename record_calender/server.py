@@ -0,0 +1,367 @@
+# record_calender/server.py
+
+import argparse
+import asyncio
+import json
+from collections import deque
+from itertools import islice
+from datetime import date
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_HOST = '127.0.0.1' # 只接受本機連線
+DEFAULT_PORT = 8765
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH = 1000 # 寫入執行緒每批最多套用的操作數（之後只儲存一次）
+CHANGE_LOG_SIZE = 10000 # 記憶體中保留的變更筆數；更舊的 since 會收到 reset
+DEFAULT_POLL_TIMEOUT = 25.0 # 長輪詢預設的等待秒數
+MAX_POLL_TIMEOUT = 120.0
+
+class HttpError(Exception):
+    """以指定的 HTTP 狀態碼回應的錯誤"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _task_json(task):
+    """任務的 JSON 表示（欄位式儲存的列視圖也轉成一般字典）"""
+    return dict(task) if task is not None else None
+
+def _query_value(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+def _parse_bool(value, name):
+    if value is None:
+        return None
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise HttpError(HTTPStatus.BAD_REQUEST, f"Invalid {name}: {value}")
+
+def _parse_int(value, name):
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Invalid {name}: {value}")
+
+class TaskServer:
+    """
+    以 asyncio streams 實作的本機 HTTP/JSON API，讓其他工具不必各自載入資料檔就能讀寫待辦事項。
+
+    - 所有請求都在事件迴圈的執行緒中處理；讀取直接查詢 TaskManager。
+    - 新增/修改/刪除放入佇列，由唯一的寫入工作依序套用（single writer）。
+      佇列中累積的操作一起套用後只儲存一次（在執行緒池中寫檔），儲存完成才回應這一批請求，
+      因此回應成功的變更一定已經寫入檔案；同時有多個客戶端寫入時，寫檔次數遠少於請求數。
+    - 同一連線上的請求依序處理與回應，支援 HTTP/1.1 keep-alive 與 pipelining。
+    - GET /changes?since=N 為長輪詢：沒有更新的變更時等待，直到有變更或逾時。
+
+    端點：
+      GET    /tasks?status=&sort=&direction=&search=&due_on=&include_on_hold=&offset=&limit=
+      GET    /tasks/{id}
+      POST   /tasks          {"description", "due_date", "note"}
+      PATCH  /tasks/{id}     {"description", "due_date", "status", "note"} 中的任意欄位
+      DELETE /tasks/{id}
+      GET    /changes?since=N&timeout=秒
+    """
+
+    def __init__(self, task_manager, host=DEFAULT_HOST, port=DEFAULT_PORT, max_batch=MAX_BATCH,
+                 change_log_size=CHANGE_LOG_SIZE):
+        self.task_manager = task_manager
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.version = 0 # 已儲存並公開的最新變更序號
+        self.batches = 0 # 已儲存的批次數（統計用）
+        self._changes = deque(maxlen=change_log_size) # (序號, 事件, 任務)
+        self._unpublished = [] # 已套用但尚未儲存的變更
+        self._changed = None # asyncio.Event，有新的變更公開時設定並換成新的
+        self._queue = None
+        self._writer_task = None
+        self._server = None
+        self._connections = set()
+
+    async def start(self):
+        """開始監聽；port 為 0 時由系統分配，實際的埠號見 self.port"""
+        self.task_manager.autosave = False # 改由寫入工作批次儲存
+        self.task_manager.add_listener(self._on_task_changed)
+        self._queue = asyncio.Queue()
+        self._changed = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def stop(self):
+        """停止接受連線、關閉現有連線，並等待已排入佇列的寫入完成與儲存"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self._connections):
+            writer.close()
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        self.task_manager.remove_listener(self._on_task_changed)
+        self.task_manager.autosave = True
+
+    # --- 寫入 ---
+
+    def _on_task_changed(self, event, task):
+        self._unpublished.append((event, _task_json(task)))
+
+    def _submit(self, operation):
+        """將一個變更交給寫入工作；回傳在該批儲存完成後得到結果的 future"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future))
+        return future
+
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            results = []
+            for operation, future in batch:
+                try:
+                    results.append((future, operation(), None))
+                except Exception as e: # 驗證錯誤只影響該請求
+                    results.append((future, None, e))
+            save_error = None
+            if self._unpublished:
+                # 寫入工作在儲存完成前不會套用下一批，因此背景執行緒序列化時資料不會被修改
+                saved = await loop.run_in_executor(None, self.task_manager.save)
+                if saved is not True:
+                    save_error = HttpError(HTTPStatus.INTERNAL_SERVER_ERROR, f"Failed to save tasks: {saved[1]}")
+                self.batches += 1
+                self._publish()
+            for future, result, error in results:
+                if not future.done():
+                    if error is not None or save_error is not None:
+                        future.set_exception(error or save_error)
+                    else:
+                        future.set_result(result)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _publish(self):
+        """公開已儲存的變更，喚醒等待中的長輪詢"""
+        for event, task in self._unpublished:
+            self.version += 1
+            self._changes.append((self.version, event, task))
+        self._unpublished = []
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def changes_since(self, since):
+        """
+        :return: (since 之後的變更列表, 是否需要重新載入)；
+                 since 早於保留的最舊變更，或大於目前的序號（伺服器已重新啟動）時需要重新載入
+        """
+        oldest = self.version - len(self._changes) # 保留的最舊變更之前的序號
+        if since < oldest or since > self.version:
+            return [], True
+        changes = islice(self._changes, len(self._changes) - (self.version - since), None)
+        return [{'version': version, 'event': event, 'task': task} for version, event, task in changes], False
+
+    # --- HTTP ---
+
+    async def _handle_connection(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {'error': e.message}
+                except ValueError as e:
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': str(e)}
+                except Exception as e: # 不讓單一請求的意外錯誤中斷連線
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(e).__name__}: {e}"}
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            self._write_response(writer, e.status, {'error': e.message}, False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader):
+        """讀取一個請求；連線結束時回傳 None"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Incomplete request")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request header too large")
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid request line")
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        length = _parse_int(headers.get('content-length', '0'), 'Content-Length')
+        if length < 0 or length > MAX_BODY_BYTES:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, headers, body
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        status = HTTPStatus(status)
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+    async def _dispatch(self, method, target, body):
+        """依路徑與方法處理請求；回傳 (狀態碼, JSON 內容)"""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+        if parts == ['tasks']:
+            if method == 'GET':
+                return HTTPStatus.OK, self._list_tasks(query)
+            if method == 'POST':
+                data = self._parse_body(body)
+                task = await self._submit(lambda: self.task_manager.add_task(
+                    data.get('description'), data.get('due_date'), data.get('note')))
+                return HTTPStatus.CREATED, _task_json(task)
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Method not allowed: {method}")
+        if len(parts) == 2 and parts[0] == 'tasks':
+            task_id = _parse_int(parts[1], 'task ID')
+            if method == 'GET':
+                return HTTPStatus.OK, self._get_task(task_id)
+            if method == 'PATCH':
+                data = self._parse_body(body)
+                fields = {name: data[name] for name in ('description', 'due_date', 'status', 'note') if name in data}
+                return HTTPStatus.OK, await self._submit(lambda: self._update_task(task_id, fields))
+            if method == 'DELETE':
+                deleted = await self._submit(lambda: self.task_manager.delete_task(task_id))
+                if not deleted:
+                    raise HttpError(HTTPStatus.NOT_FOUND, f"Task not found: {task_id}")
+                return HTTPStatus.OK, {'deleted': task_id}
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Method not allowed: {method}")
+        if parts == ['changes'] and method == 'GET':
+            return HTTPStatus.OK, await self._poll_changes(query)
+        raise HttpError(HTTPStatus.NOT_FOUND, f"Not found: {url.path}")
+
+    @staticmethod
+    def _parse_body(body):
+        try:
+            data = json.loads(body or b'{}')
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        for name in ('description', 'due_date', 'status', 'note'):
+            if data.get(name) is not None and not isinstance(data[name], str):
+                raise HttpError(HTTPStatus.BAD_REQUEST, f"Field '{name}' must be a string")
+        return data
+
+    def _list_tasks(self, query):
+        due_on = _query_value(query, 'due_on')
+        if due_on is not None:
+            try:
+                due_on = date.fromisoformat(due_on)
+            except ValueError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid due_on format. Please use YYYY-MM-DD.")
+        include_on_hold = _parse_bool(_query_value(query, 'include_on_hold'), 'include_on_hold')
+        tasks = self.task_manager.query_tasks(
+            status=_query_value(query, 'status'),
+            sort_column=_query_value(query, 'sort'),
+            sort_direction=_query_value(query, 'direction', 'ascending'),
+            include_on_hold=True if include_on_hold is None else include_on_hold,
+            search=_query_value(query, 'search'),
+            due_on=due_on,
+        )
+        total = len(tasks)
+        offset = _parse_int(_query_value(query, 'offset'), 'offset') or 0
+        limit = _parse_int(_query_value(query, 'limit'), 'limit')
+        tasks = tasks[offset:offset + limit] if limit is not None else tasks[offset:]
+        return {'version': self.version, 'total': total, 'tasks': [_task_json(task) for task in tasks]}
+
+    def _get_task(self, task_id):
+        task = self.task_manager.get_task_by_id(task_id)
+        if task is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Task not found: {task_id}")
+        return _task_json(task)
+
+    def _update_task(self, task_id, fields):
+        """在寫入工作中執行：找不到任務時回報 404，沒有修改時回傳目前的任務"""
+        if self.task_manager.get_task_by_id(task_id) is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Task not found: {task_id}")
+        task = self.task_manager.update_task(task_id, **fields)
+        return _task_json(task if task is not None else self.task_manager.get_task_by_id(task_id))
+
+    async def _poll_changes(self, query):
+        since = _parse_int(_query_value(query, 'since'), 'since') or 0
+        timeout = float(_query_value(query, 'timeout', DEFAULT_POLL_TIMEOUT))
+        timeout = min(max(timeout, 0.0), MAX_POLL_TIMEOUT)
+        if since == self.version and timeout > 0:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        changes, reset = self.changes_since(since)
+        return {'version': self.version, 'reset': reset, 'changes': changes}
+
+def main(argv=None):
+    """命令列：python -m record_calender.server [--host] [--port] [--data-file]"""
+    from record_calender.data_manager import TaskDataManager
+    from record_calender.task_manager import TaskManager
+
+    parser = argparse.ArgumentParser(description="待辦事項的本機 HTTP/JSON API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data-file", help="待辦事項資料檔；預設為 todo_calendar.json")
+    args = parser.parse_args(argv)
+
+    async def run():
+        server = await TaskServer(TaskManager(TaskDataManager(args.data_file)), args.host, args.port).start()
+        print(f"Serving on http://{server.host}:{server.port}", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+# record_calender/sync.py
+
+import hashlib
+import json
+import os
+import threading
+from record_calender.data_manager import TaskDataManager
+
+PREFER_LOCAL = 'local'
+PREFER_REMOTE = 'remote'
+PREFERENCES = (PREFER_LOCAL, PREFER_REMOTE)
+BASE_FORMAT_VERSION = 1
+_canonical_json = json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode
+
+def task_hash(task):
+    """任務內容的雜湊（欄位順序不影響結果）"""
+    return hashlib.blake2b(_canonical_json(dict(task)).encode('utf-8'), digest_size=16).hexdigest()
+
+def manifest(tasks):
+    """
+    計算每個任務的雜湊。
+    :return: {任務 ID: 雜湊}；重複的 ID 只取第一個
+    """
+    result = {}
+    for task in tasks:
+        if task['id'] not in result:
+            result[task['id']] = task_hash(task)
+    return result
+
+def changed_ids(current, base):
+    """
+    比較兩份雜湊清單。
+    :return: 新增、修改或刪除（與 base 不同）的任務 ID 集合
+    """
+    changed = {task_id for task_id, digest in current.items() if base.get(task_id) != digest}
+    changed.update(task_id for task_id in base if task_id not in current)
+    return changed
+
+def default_base_path(local_path, remote_path):
+    """同步基準檔的預設位置：與本機資料檔放在一起，每個遠端檔案各一份"""
+    remote_key = hashlib.blake2b(os.path.abspath(remote_path).encode('utf-8'), digest_size=6).hexdigest()
+    return f"{local_path}.sync-{remote_key}.json"
+
+def file_signature(path):
+    """檔案的 (大小, 修改時間 ns)；用來判斷檔案自上次同步後是否被修改過。不存在時為 None"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+def read_base_header(path):
+    """只讀取基準檔的第一行（格式版本與兩個檔案在上次同步後的簽章）；沒有基準檔時回傳 None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline() or '{}')
+    if header.get('version') != BASE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported sync base format in {path}.")
+    return header
+
+def load_base(path):
+    """
+    讀取上次同步的結果。基準檔為 JSON Lines：標頭、雜湊清單，之後每行一個任務。
+    :return: (任務列表, 雜湊清單 {ID: 雜湊})；沒有基準檔時兩者皆為空
+    """
+    if read_base_header(path) is None:
+        return [], {}
+    with open(path, 'r', encoding='utf-8') as f:
+        f.readline()
+        hashes = {int(task_id): digest for task_id, digest in json.loads(f.readline())['hashes'].items()}
+        tasks = [json.loads(line) for line in f if line.strip()]
+    return tasks, hashes
+
+def save_base(path, tasks, hashes, signatures):
+    """以暫存檔加取代的方式寫入同步基準"""
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'version': BASE_FORMAT_VERSION, 'files': signatures}) + "\n")
+            f.write(json.dumps({'hashes': {str(task_id): digest for task_id, digest in hashes.items()}}) + "\n")
+            f.writelines(json.dumps(task, ensure_ascii=False) + "\n" for task in tasks)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+class Conflict:
+    """同一欄位在兩邊被改成不同的值（或一邊修改、另一邊刪除）"""
+    __slots__ = ('task_id', 'field', 'local', 'remote', 'chosen')
+
+    def __init__(self, task_id, field, local, remote, chosen):
+        self.task_id = task_id
+        self.field = field # None 表示整個任務（修改與刪除衝突）
+        self.local = local
+        self.remote = remote
+        self.chosen = chosen
+
+    def __repr__(self):
+        return f"Conflict(task_id={self.task_id!r}, field={self.field!r}, local={self.local!r}, remote={self.remote!r}, chosen={self.chosen!r})"
+
+class SyncResult:
+    """同步的結果：各自需要套用的變更與衝突"""
+
+    def __init__(self):
+        self.local_updates = {} # ID -> 要寫入本機的任務
+        self.local_deletes = set()
+        self.remote_updates = {}
+        self.remote_deletes = set()
+        self.conflicts = []
+        self.renumbered = {} # 遠端新增的任務與本機新增的任務 ID 相同時，遠端任務的新 ID：舊 ID -> 新 ID
+        self.compared = 0 # 實際比較內容的任務數
+
+    @property
+    def local_changed(self):
+        return bool(self.local_updates or self.local_deletes)
+
+    @property
+    def remote_changed(self):
+        return bool(self.remote_updates or self.remote_deletes)
+
+def merge_task(task_id, local, remote, base, prefer, conflicts):
+    """
+    欄位層級的三方合併。只有一邊修改的欄位採用修改後的值；兩邊改成不同值時依 prefer 決定並記錄衝突。
+    :param base: 上次同步時的任務；None 表示沒有共同基準（只做雙方比較）
+    """
+    merged = {}
+    base = base or {}
+    for field in list(local) + [field for field in remote if field not in local]:
+        local_value = local.get(field)
+        remote_value = remote.get(field)
+        if local_value == remote_value:
+            value = local_value
+        elif field in base and base[field] == local_value:
+            value = remote_value
+        elif field in base and base[field] == remote_value:
+            value = local_value
+        else:
+            value = local_value if prefer == PREFER_LOCAL else remote_value
+            conflicts.append(Conflict(task_id, field, local_value, remote_value, value))
+        merged[field] = value
+    return merged
+
+def reconcile(local_tasks, remote_tasks, base_tasks, local_hashes, remote_hashes, base_hashes, prefer=PREFER_LOCAL):
+    """
+    三方合併兩份任務清單。只有雜湊與基準不同的任務會被比較與合併，
+    所需時間與變更的數量成正比，而不是與任務總數成正比。
+    :param local_tasks: {ID: 任務}（本機）
+    :param remote_tasks: {ID: 任務}（遠端）
+    :param base_tasks: {ID: 任務}（上次同步的結果）
+    :return: SyncResult
+    """
+    if prefer not in PREFERENCES:
+        raise ValueError(f"Invalid preference: {prefer}. Must be one of {PREFERENCES}.")
+    result = SyncResult()
+    local_changed = changed_ids(local_hashes, base_hashes)
+    remote_changed = changed_ids(remote_hashes, base_hashes)
+    next_id = max(list(local_hashes) + list(remote_hashes) + list(base_hashes), default=-1) + 1
+
+    for task_id in sorted(local_changed | remote_changed):
+        result.compared += 1
+        local = local_tasks.get(task_id)
+        remote = remote_tasks.get(task_id)
+        base = base_tasks.get(task_id)
+        if local_hashes.get(task_id) == remote_hashes.get(task_id):
+            continue # 兩邊做了相同的修改（或都刪除了）
+        if task_id not in local_changed: # 只有遠端變更
+            if remote is None:
+                result.local_deletes.add(task_id)
+            else:
+                result.local_updates[task_id] = remote
+            continue
+        if task_id not in remote_changed: # 只有本機變更
+            if local is None:
+                result.remote_deletes.add(task_id)
+            else:
+                result.remote_updates[task_id] = local
+            continue
+        # 兩邊都變更
+        if local is None or remote is None:
+            # 一邊刪除、另一邊修改：保留修改過的任務
+            kept = local if local is not None else remote
+            result.conflicts.append(Conflict(task_id, None, local, remote, kept))
+            if local is None:
+                result.local_updates[task_id] = remote
+            else:
+                result.remote_updates[task_id] = local
+            continue
+        if base is None and local.get('creation_time') != remote.get('creation_time'):
+            # 兩邊各自新增了不同的任務卻拿到相同的 ID：保留本機的，遠端的改用新的 ID
+            moved = dict(remote, id=next_id)
+            result.renumbered[task_id] = next_id
+            result.local_updates[next_id] = moved
+            result.remote_updates[task_id] = local
+            result.remote_updates[next_id] = moved
+            next_id += 1
+            continue
+        merged = merge_task(task_id, local, remote, base, prefer, result.conflicts)
+        if merged != local:
+            result.local_updates[task_id] = merged
+        if merged != remote:
+            result.remote_updates[task_id] = merged
+    return result
+
+def apply_changes(tasks, updates, deletes):
+    """將變更套用到任務列表：就地更新的任務保持原本的位置，新任務依 ID 附加在最後"""
+    seen = set()
+    merged = []
+    for task in tasks:
+        task_id = task['id']
+        if task_id in deletes:
+            continue
+        if task_id in updates:
+            if task_id in seen:
+                continue
+            task = updates[task_id]
+        seen.add(task_id)
+        merged.append(task)
+    merged.extend(updates[task_id] for task_id in sorted(updates) if task_id not in seen)
+    return merged
+
+def _index_by_id(tasks):
+    index = {}
+    for task in tasks:
+        index.setdefault(task['id'], task)
+    return index
+
+def _load_tasks(path, first_sync):
+    """
+    嚴格讀取一邊的資料檔：無法讀取或解析時拋出例外並中止同步，不會當作空的資料檔（否則另一邊的任務會被當成已刪除）。
+    只有第一次同步（沒有基準）時，不存在的檔案才視為空的，讓同步可以建立新的遠端檔案。
+    """
+    if first_sync and not os.path.exists(path):
+        return []
+    return TaskDataManager(path, backup_interval=None).load_tasks(strict=True)
+
+def _save_tasks(path, tasks):
+    """儲存一邊的資料檔，失敗時拋出例外；同步不在資料檔旁建立自動備份"""
+    result = TaskDataManager(path, backup_interval=None).save_tasks(tasks)
+    if result is not True:
+        raise result[1]
+
+def sync_files(local_path, remote_path, base_path=None, prefer=PREFER_LOCAL, dry_run=False, full=False):
+    """
+    同步兩個任務資料檔，並把合併後的結果記錄為下一次同步的基準。
+    基準中記錄了兩個檔案同步後的大小與修改時間：兩邊都沒被修改時只比較檔案簽章就結束；
+    只有一邊被修改時，另一邊直接沿用基準的內容與雜湊，不必讀取與計算。
+    :param base_path: 同步基準檔；None 表示使用 default_base_path
+    :param prefer: 同一欄位兩邊都修改時採用哪一邊（'local' 或 'remote'）
+    :param dry_run: 只計算結果，不寫入任何檔案
+    :param full: 不信任檔案簽章，重新讀取並計算兩邊所有任務的雜湊
+    :return: SyncResult
+    :raises ValueError, OSError: 任一邊的資料檔無法讀取或儲存時；此時不寫入基準
+    """
+    base_path = base_path or default_base_path(local_path, remote_path)
+    header = read_base_header(base_path)
+    signatures = (header or {}).get('files', {})
+    local_unchanged = not full and header is not None and signatures.get('local') == file_signature(local_path)
+    remote_unchanged = not full and header is not None and signatures.get('remote') == file_signature(remote_path)
+    if local_unchanged and remote_unchanged:
+        return SyncResult()
+
+    base_list, base_hashes = load_base(base_path)
+    base_tasks = _index_by_id(base_list)
+    first_sync = header is None
+    if local_unchanged:
+        local_list, local_hashes = base_list, base_hashes
+    else:
+        local_list = _load_tasks(local_path, first_sync)
+        local_hashes = manifest(local_list)
+    if remote_unchanged:
+        remote_list, remote_hashes = base_list, base_hashes
+    else:
+        remote_list = _load_tasks(remote_path, first_sync)
+        remote_hashes = manifest(remote_list)
+
+    result = reconcile(_index_by_id(local_list), _index_by_id(remote_list), base_tasks,
+                       local_hashes, remote_hashes, base_hashes, prefer)
+    if dry_run:
+        return result
+
+    merged_local = apply_changes(local_list, result.local_updates, result.local_deletes)
+    if result.local_changed:
+        _save_tasks(local_path, merged_local)
+    if result.remote_changed:
+        _save_tasks(remote_path, apply_changes(remote_list, result.remote_updates, result.remote_deletes))
+    # 兩邊都儲存成功後才寫入基準（中途失敗時保留舊的基準，下次同步會重新比較）
+    # 新的基準等於合併後的結果；只重新計算有變更的任務的雜湊
+    merged_hashes = dict(local_hashes)
+    for task_id in result.local_deletes:
+        merged_hashes.pop(task_id, None)
+    for task_id, task in result.local_updates.items():
+        merged_hashes[task_id] = task_hash(task)
+    save_base(base_path, merged_local, merged_hashes,
+              {'local': file_signature(local_path), 'remote': file_signature(remote_path)})
+    return result
@@ -1,19 +1,117 @@
 # record_calender/task_manager.py
 
-from datetime import datetime
+import os
+import re
+import threading
+from datetime import datetime, date
 from record_calender.data_manager import TaskDataManager # 導入資料管理員
+from record_calender.search_index import SearchIndex
+from record_calender.rwlock import ReadWriteLock
+from record_calender import perf
 
 # 定義所有可能的狀態，與應用程式同步
 STATUS_OPTIONS = ["Pending", "In progress", "Completed", "Cancelled", "On hold"]
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+def _matches_format(value, pattern, date_format):
+    """檢查字串是否符合 date_format；常見的補零格式走 fromisoformat 快速路徑，其餘交給 strptime。"""
+    if pattern.fullmatch(value):
+        try:
+            datetime.fromisoformat(value)
+            return True
+        except ValueError:
+            return False
+    try:
+        datetime.strptime(value, date_format)
+        return True
+    except ValueError:
+        return False
+
+def _search_text(task):
+    """任務中可被搜尋的文字：內容與備註。"""
+    return f"{task.get('description') or ''}\n{task.get('note') or ''}"
+
+def _due_ordinal(due_date):
+    """將到期日轉為日序數（只取日期部分）；沒有或無法解析的日期回傳 None。"""
+    if not due_date:
+        return None
+    try:
+        return date.fromisoformat(str(due_date).split(' ')[0]).toordinal()
+    except ValueError:
+        return None
+
+def _task_sort_key(sort_column):
+    """回傳指定欄位的排序鍵函數，供 TaskManager 的各種排序查詢共用。"""
+    def sort_key(task):
+        value = task.get(sort_column)
+        if sort_column in ['due_date', 'creation_time']:
+            try:
+                # 對日期時間字串進行轉換以便正確排序
+                if sort_column == 'due_date':
+                    return datetime.strptime(str(value).split(' ')[0], '%Y-%m-%d').date() if value else datetime.max.date()
+                if sort_column == 'creation_time':
+                    return datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S') if value else datetime.max
+            except (ValueError, IndexError):
+                # 對於無效日期，將其視為最大值，使其排在末尾
+                return datetime.max.date() if sort_column == 'due_date' else datetime.max
+        elif sort_column == 'status':
+            try:
+                # 根據預定義的狀態順序進行排序
+                return STATUS_OPTIONS.index(value)
+            except ValueError:
+                return len(STATUS_OPTIONS) # 未知狀態排在最後
+        # 對於其他字串類型，進行小寫轉換以實現不區分大小寫的排序
+        return str(value).lower() if value is not None else ''
+    return sort_key
 
 class TaskManager:
-    def __init__(self, data_manager: TaskDataManager):
+    def __init__(self, data_manager: TaskDataManager, storage='list'):
+        """
+        :param data_manager: 負責讀寫檔案的 TaskDataManager
+        :param storage: 記憶體中的儲存方式，'list' (list of dict) 或 'columnar' (ColumnarTaskStore)
+        """
         self.data_manager = data_manager
-        self._tasks = self.data_manager.load_tasks()
+        tasks = self.data_manager.load_tasks()
+        if storage == 'columnar':
+            from record_calender.columnar_store import ColumnarTaskStore # 延遲導入，只有在需要時才載入
+            tasks = ColumnarTaskStore(tasks)
+        elif storage != 'list':
+            raise ValueError(f"Invalid storage: {storage}. Must be 'list' or 'columnar'.")
+        self._tasks = tasks
+        self.data_version = 0 # 每次新增/修改/刪除都會遞增，供 GUI 判斷快取是否過期
+        self._id_index = None # ID -> 任務 的索引，第一次查詢時才建立
+        self._search_index = None # 全文搜尋索引，第一次搜尋（或呼叫 build_search_index）時才建立
+        self._search_index_lock = threading.Lock() # 允許在背景執行緒建立搜尋索引
+        self._day_buckets = None # 日序數 -> 到期任務 ID 集合，供行事曆檢視使用，第一次查詢時才建立
+        self._task_days = None # 任務 ID -> 日序數，讓增量更新不必重新解析舊的到期日
+        self._day_buckets_lock = threading.Lock()
+        self._revisions = {} # 任務 ID -> 修改次數，供顯示快取判斷是否需要重新格式化；未修改過的任務為 0
+        self._listeners = [] # 任務變更時呼叫的 callable(event, task)
+        self.autosave = True # 新增/修改/刪除後立即儲存；設為 False 時由呼叫端批次呼叫 save()（例如 API 伺服器）
+        # 保護 _tasks 與各索引：查詢取得讀取鎖（可同時進行），新增/修改/刪除取得寫入鎖（依序進行）。
+        # 儲存與通知監聽器在釋放寫入鎖之後才進行，儲存時只持有讀取鎖，不阻擋其他查詢。
+        self._lock = ReadWriteLock()
+        self._save_lock = threading.Lock() # 同一時間只有一個執行緒寫檔
+
+    def _get_id_index(self):
+        """取得（必要時建立）ID 索引；重複 ID 時保留第一個，與線性搜尋的結果一致。"""
+        if self._id_index is None:
+            index = {}
+            for task in self._tasks:
+                index.setdefault(task['id'], task)
+            self._id_index = index
+        return self._id_index
 
     def get_tasks(self):
         """獲取所有任務的副本，避免外部直接修改內部列表。"""
-        return list(self._tasks)
+        with self._lock.read():
+            return list(self._tasks)
+
+    def task_count(self):
+        """任務總數；不複製任務列表"""
+        with self._lock.read():
+            return len(self._tasks)
 
     def add_task(self, description, due_date=None, note=None):
         """
@@ -34,20 +132,104 @@ class TaskManager:
             except ValueError:
                 raise ValueError("Invalid due date format. Please use YYYY-MM-DD.")
 
+        with self._lock.write():
+            task = {
+                'id': self.data_manager.get_next_id(),
+                'description': description,
+                'due_date': due_date,
+                'status': 'Pending',
+                'note': note if note is not None else '',
+                'creation_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'image_path': None
+            }
+            self._tasks.append(task)
+            task = self._tasks[-1] # 欄位式儲存會回傳對應列的視圖
+            if self._id_index is not None:
+                self._id_index.setdefault(task['id'], task)
+            self._reindex_search(task['id'], None, _search_text(task))
+            self._rebucket(task['id'], task.get('due_date'))
+            self._bump_revision(task['id'])
+            self.data_version += 1
+        if self.autosave:
+            self.save() # 立即儲存
+        self._notify('added', task)
+        return task
+
+    def add_tasks_bulk(self, records, save=True):
+        """
+        批次新增待辦事項（例如匯入）：逐筆驗證，有錯誤的資料略過並回報，其餘一次加入、只儲存一次。
+        :param records: 任務資料字典的可迭代物件，可包含 description、due_date、status、note、creation_time、uid；
+                        原本的 id 會被忽略，一律分配新的 ID
+        :param save: 是否在新增後立即儲存；分段匯入時可在最後一段才儲存（見 save()）
+        :return: (新增的任務列表, [(資料的索引, 錯誤訊息), ...])
+        """
+        valid = []
+        errors = []
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for index, record in enumerate(records): # 驗證不需要持有鎖
+            try:
+                valid.append(self._validate_record(record, now))
+            except ValueError as e:
+                errors.append((index, str(e)))
+        if not valid:
+            return [], errors
+        added = []
+        with self._lock.write():
+            for task in valid:
+                task['id'] = self.data_manager.get_next_id()
+                self._tasks.append(task)
+                added.append(self._tasks[-1]) # 欄位式儲存會回傳對應列的視圖
+            for task in added:
+                if self._id_index is not None:
+                    self._id_index.setdefault(task['id'], task)
+                self._reindex_search(task['id'], None, _search_text(task))
+                self._rebucket(task['id'], task.get('due_date'))
+                self._bump_revision(task['id'])
+            self.data_version += 1
+        if save and self.autosave:
+            self.save()
+        for task in added:
+            self._notify('added', task)
+        return added, errors
+
+    @staticmethod
+    def _validate_record(record, default_creation_time):
+        """驗證一筆匯入的資料並轉為任務字典；資料無效時拋出 ValueError。"""
+        if not isinstance(record, dict):
+            raise ValueError("Record must be an object.")
+        description = record.get('description')
+        if not isinstance(description, str) or not description.strip():
+            raise ValueError("Task description cannot be empty.")
+        due_date = record.get('due_date') or None
+        if due_date is not None and not _matches_format(str(due_date), _DATE_RE, '%Y-%m-%d'):
+            raise ValueError("Invalid due date format. Please use YYYY-MM-DD.")
+        status = record.get('status') or 'Pending'
+        matched_status = next((option for option in STATUS_OPTIONS if option.lower() == str(status).lower()), None)
+        if matched_status is None:
+            raise ValueError(f"Invalid status: {status}. Must be one of {STATUS_OPTIONS}")
+        creation_time = record.get('creation_time') or default_creation_time
+        if not _matches_format(str(creation_time), _DATETIME_RE, '%Y-%m-%d %H:%M:%S'):
+            raise ValueError("Invalid creation time format. Please use YYYY-MM-DD HH:MM:SS.")
+        note = record.get('note')
         task = {
-            'id': self.data_manager.get_next_id(),
+            'id': None,
             'description': description,
-            'due_date': due_date,
-            'status': 'Pending',
-            'note': note if note is not None else '',
-            'creation_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'due_date': str(due_date) if due_date is not None else None,
+            'status': matched_status,
+            'note': str(note) if note is not None else '',
+            'creation_time': str(creation_time),
             'image_path': None
         }
-        self._tasks.append(task)
-        self.data_manager.save_tasks(self._tasks) # 立即儲存
+        if record.get('uid'):
+            task['uid'] = str(record['uid']) # 來自其他行事曆的識別碼，再次匯入時用來排除重複
         return task
 
-    def update_task(self, task_id, description=None, due_date=None, status=None, note=None):
+    def save(self):
+        """將目前的任務寫入檔案；寫檔期間持有讀取鎖，任務不會被修改，但其他查詢可以同時進行。"""
+        with self._save_lock, self._lock.read():
+            return self.data_manager.save_tasks(self._tasks)
+
+    def update_task(self, task_id, description=None, due_date=None, status=None, note=None, image_path=None):
         """
         更新一個現有的待辦事項。
         :param task_id: 任務的 ID
@@ -55,42 +237,51 @@ class TaskManager:
         :param due_date: 新的到期日期 (str, YYYY-MM-DD), 可選
         :param status: 新的狀態 (str), 必須是 STATUS_OPTIONS 中的一個, 可選
         :param note: 新的備註 (str), 可選
+        :param image_path: 附件圖片的路徑 (str), 可選；空字串表示移除附件
         :return: 更新後的任務字典，如果找不到或更新失敗則為 None
         """
-        task_to_edit = next((task for task in self._tasks if task['id'] == task_id), None)
-        if not task_to_edit:
-            return None
-
-        updated = False
-        if description is not None:
-            if not description.strip():
-                raise ValueError("Task description cannot be empty.")
-            task_to_edit['description'] = description
-            updated = True
-        
-        if due_date is not None:
-            if due_date: # Only validate if not None/empty
-                try:
-                    datetime.strptime(due_date, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError("Invalid due date format. Please use YYYY-MM-DD.")
-            task_to_edit['due_date'] = due_date
-            updated = True
-
-        if status is not None:
-            if status not in STATUS_OPTIONS:
-                raise ValueError(f"Invalid status: {status}. Must be one of {STATUS_OPTIONS}")
-            task_to_edit['status'] = status
-            updated = True
-            
-        if note is not None:
-            task_to_edit['note'] = note
-            updated = True
-
-        if updated:
-            self.data_manager.save_tasks(self._tasks) # 立即儲存
-            return task_to_edit
-        return None # 沒有任何東西被更新
+        with self._lock.write():
+            task_to_edit = self._get_id_index().get(task_id)
+            if not task_to_edit:
+                return None
+            # 先驗證所有參數，全部通過後才修改，驗證失敗時任務與各索引都保持原樣
+            changes = {}
+            if description is not None:
+                if not description.strip():
+                    raise ValueError("Task description cannot be empty.")
+                changes['description'] = description
+            if due_date is not None:
+                if due_date: # Only validate if not None/empty
+                    try:
+                        datetime.strptime(due_date, '%Y-%m-%d')
+                    except ValueError:
+                        raise ValueError("Invalid due date format. Please use YYYY-MM-DD.")
+                changes['due_date'] = due_date
+            if status is not None:
+                if status not in STATUS_OPTIONS:
+                    raise ValueError(f"Invalid status: {status}. Must be one of {STATUS_OPTIONS}")
+                changes['status'] = status
+            if note is not None:
+                changes['note'] = note
+            if image_path is not None:
+                if image_path and not os.path.isfile(image_path):
+                    raise ValueError(f"Image file not found: {image_path}")
+                changes['image_path'] = image_path or None
+            if not changes:
+                return None # 沒有任何東西被更新
+
+            old_search_text = _search_text(task_to_edit)
+            for field, value in changes.items():
+                task_to_edit[field] = value
+            if 'due_date' in changes:
+                self._rebucket(task_to_edit['id'], due_date)
+            self._reindex_search(task_to_edit['id'], old_search_text, _search_text(task_to_edit))
+            self._bump_revision(task_to_edit['id'])
+            self.data_version += 1
+        if self.autosave:
+            self.save() # 立即儲存
+        self._notify('updated', task_to_edit)
+        return task_to_edit
 
     def delete_task(self, task_id):
         """
@@ -98,31 +289,230 @@ class TaskManager:
         :param task_id: 任務的 ID
         :return: True 如果刪除成功，False 如果任務不存在
         """
-        initial_len = len(self._tasks)
-        self._tasks = [task for task in self._tasks if task['id'] != task_id]
-        if len(self._tasks) < initial_len:
-            self.data_manager.save_tasks(self._tasks) # 立即儲存
-            return True
-        return False
-        
+        with self._lock.write():
+            # 就地刪除，讓不同的儲存方式（list 或 ColumnarTaskStore）都能使用
+            indices = [index for index, task in enumerate(self._tasks) if task['id'] == task_id]
+            if not indices:
+                return False
+            deleted_task = None
+            for index in reversed(indices):
+                self._reindex_search(task_id, _search_text(self._tasks[index]), None)
+                deleted_task = dict(self._tasks[index]) # 欄位式儲存的列視圖在刪除後會失效，先複製
+                del self._tasks[index]
+            self._rebucket(task_id, None)
+            self._bump_revision(task_id) # 保留遞增後的版本，即使 ID 被重複使用也不會沿用舊的快取
+            if self._id_index is not None:
+                # 只移除被刪除的 ID；其他項目不受影響（欄位式儲存的列視圖以內部鍵定位，位置改變時由儲存引擎自行重建對照）
+                self._id_index.pop(task_id, None)
+            self.data_version += 1
+        if self.autosave:
+            self.save() # 立即儲存
+        self._notify('deleted', deleted_task)
+        return True
+
+    def add_listener(self, callback):
+        """
+        註冊任務變更的監聽器。
+        :param callback: callable(event, task)，event 為 'added'、'updated' 或 'deleted'；
+                         在執行變更的執行緒中、資料儲存之後呼叫
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """移除監聽器（不存在時忽略）"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, task):
+        for callback in list(self._listeners):
+            callback(event, task)
+
+    def _bump_revision(self, task_id):
+        self._revisions[task_id] = self._revisions.get(task_id, 0) + 1
+
+    def get_task_revision(self, task_id):
+        """
+        取得任務的版本；任務每次新增、修改或刪除都會遞增。
+        :param task_id: 任務的 ID
+        :return: 版本 (int)
+        """
+        return self._revisions.get(task_id, 0)
+
     def get_task_by_id(self, task_id):
         """
         根據 ID 獲取一個任務。
         :param task_id: 任務的 ID
         :return: 任務字典，如果找不到則為 None
         """
-        return next((task for task in self._tasks if task['id'] == task_id), None)
+        with self._lock.read():
+            return self._get_id_index().get(task_id)
+
+    def get_tasks_by_ids(self, task_ids):
+        """
+        根據 ID 列表批次獲取任務，保持傳入的順序。
+        :param task_ids: 任務 ID 的可迭代物件
+        :return: 任務列表（找不到的 ID 會被略過）
+        """
+        with self._lock.read():
+            index = self._get_id_index()
+            return [index[task_id] for task_id in task_ids if task_id in index]
+
+    def _reindex_search(self, task_id, old_text, new_text):
+        """任務新增/修改/刪除後，增量更新已建立的搜尋索引。"""
+        with self._search_index_lock:
+            if self._search_index is None:
+                return
+            if old_text is not None:
+                self._search_index.remove(task_id, old_text)
+            if new_text is not None:
+                self._search_index.add(task_id, new_text)
+
+    def build_search_index(self):
+        """建立全文搜尋索引（已建立則直接返回）；可在背景執行緒預先呼叫，避免第一次搜尋時等待。"""
+        with self._lock.read(), self._search_index_lock:
+            if self._search_index is None:
+                index = SearchIndex()
+                index.add_many((task['id'], _search_text(task)) for task in list(self._tasks))
+                self._search_index = index
+            return self._search_index
+
+    def search_task_ids(self, query):
+        """
+        搜尋內容或備註包含 query 的任務（不區分大小寫），由 n-gram 索引提供候選結果。
+        :param query: 查詢字串
+        :return: 符合的任務 ID 集合
+        """
+        with self._lock.read():
+            index = self.build_search_index()
+            id_index = self._get_id_index()
+            def get_text(task_id):
+                task = id_index.get(task_id)
+                return _search_text(task) if task is not None else None
+            return index.search(query, get_text)
 
-    def get_tasks_by_status(self, status):
+    def _rebucket(self, task_id, due_date):
+        """任務的到期日改變（或任務被刪除時傳入 None）後，增量更新已建立的每日分組。"""
+        with self._day_buckets_lock:
+            if self._day_buckets is None:
+                return
+            old_day = self._task_days.pop(task_id, None)
+            if old_day is not None:
+                bucket = self._day_buckets[old_day]
+                bucket.discard(task_id)
+                if not bucket:
+                    del self._day_buckets[old_day]
+            new_day = _due_ordinal(due_date)
+            if new_day is not None:
+                self._task_days[task_id] = new_day
+                self._day_buckets.setdefault(new_day, set()).add(task_id)
+
+    def build_day_buckets(self):
+        """依到期日建立每日分組（已建立則直接返回）；每個任務的到期日只會在這裡或變更時解析一次。"""
+        with self._lock.read(), self._day_buckets_lock:
+            if self._day_buckets is None:
+                buckets = {}
+                task_days = {}
+                for task in list(self._tasks):
+                    day = _due_ordinal(task.get('due_date'))
+                    if day is not None and task['id'] not in task_days:
+                        task_days[task['id']] = day
+                        buckets.setdefault(day, set()).add(task['id'])
+                self._task_days = task_days
+                self._day_buckets = buckets
+            return self._day_buckets
+
+    def get_task_due_ordinal(self, task_id):
+        """
+        從每日分組的索引取得任務到期日的序數，不需重新解析 due_date。
+        :return: date.toordinal()，沒有（或無法解析的）到期日時為 None
+        """
+        with self._lock.read():
+            self.build_day_buckets()
+            return self._task_days.get(task_id)
+
+    def get_task_ids_due_on(self, day):
+        """
+        取得某一天到期的任務 ID。
+        :param day: datetime.date
+        :return: 任務 ID 集合（副本）
+        """
+        with self._lock.read():
+            buckets = self.build_day_buckets()
+            with self._day_buckets_lock:
+                return set(buckets.get(day.toordinal(), ()))
+
+    def get_tasks_by_day(self, start_date, end_date):
+        """
+        取得一段日期範圍內（含頭尾）每天到期的任務，只查詢範圍內的每日分組，不掃描所有任務。
+        :param start_date: 起始日期 (datetime.date)
+        :param end_date: 結束日期 (datetime.date)
+        :return: 字典，date -> 依 ID 排序的任務列表；沒有任務的日期不會出現
         """
-        獲取指定狀態的所有任務。
+        with self._lock.read():
+            buckets = self.build_day_buckets()
+            with self._day_buckets_lock:
+                day_ids = {day: sorted(buckets[day]) for day in range(start_date.toordinal(), end_date.toordinal() + 1) if day in buckets}
+            return {date.fromordinal(day): self.get_tasks_by_ids(ids) for day, ids in day_ids.items()}
+
+    @perf.timed("TaskManager.get_tasks_by_status")
+    def get_tasks_by_status(self, status, sort_column=None, sort_direction='ascending'):
+        """
+        獲取指定狀態的所有任務，並可選擇進行排序。
         :param status: 任務狀態 (str)
+        :param sort_column: 排序的欄位名稱，可選；未指定時保持原始順序
+        :param sort_direction: 排序方向 ('ascending' 或 'descending')
         :return: 任務列表
         """
-        if status not in STATUS_OPTIONS:
-            raise ValueError(f"Invalid status: {status}. Must be one of {STATUS_OPTIONS}")
-        return [task for task in self._tasks if task.get('status') == status]
+        with self._lock.read():
+            if status not in STATUS_OPTIONS:
+                raise ValueError(f"Invalid status: {status}. Must be one of {STATUS_OPTIONS}")
+            tasks = [task for task in self._tasks if task.get('status') == status]
+            self._sort_tasks(tasks, sort_column, sort_direction)
+            return tasks
+
+    @perf.timed("TaskManager.query_tasks")
+    def query_tasks(self, status=None, sort_column=None, sort_direction='ascending', include_on_hold=True, search=None, due_on=None):
+        """
+        依狀態與搜尋字串篩選並排序任務。
+        :param status: 任務狀態 (str)，None 表示所有任務
+        :param sort_column: 排序的欄位名稱，可選
+        :param sort_direction: 排序方向 ('ascending' 或 'descending')
+        :param include_on_hold: 查詢所有任務時是否包含 On hold 項目
+        :param search: 搜尋字串，可選；只保留內容或備註包含它的任務
+        :param due_on: 到期日 (datetime.date)，可選；只保留該日到期的任務
+        :return: 任務列表
+        """
+        with self._lock.read():
+            if due_on is not None:
+                # 由每日分組直接取得該日的任務，不必掃描全部任務
+                tasks = self.get_tasks_by_ids(sorted(self.get_task_ids_due_on(due_on)))
+                if status is None:
+                    tasks = [task for task in tasks if include_on_hold or task.get('status') != 'On hold']
+                else:
+                    if status not in STATUS_OPTIONS:
+                        raise ValueError(f"Invalid status: {status}. Must be one of {STATUS_OPTIONS}")
+                    tasks = [task for task in tasks if task.get('status') == status]
+            elif status is None:
+                tasks = [task for task in self._tasks if include_on_hold or task.get('status') != 'On hold']
+            else:
+                if status not in STATUS_OPTIONS:
+                    raise ValueError(f"Invalid status: {status}. Must be one of {STATUS_OPTIONS}")
+                tasks = [task for task in self._tasks if task.get('status') == status]
+            if search and search.strip():
+                # 先以搜尋結果縮小範圍，再排序，避免對不會顯示的任務計算排序鍵
+                matched_ids = self.search_task_ids(search.strip())
+                tasks = [task for task in tasks if task['id'] in matched_ids]
+            self._sort_tasks(tasks, sort_column, sort_direction, newest_first_by_default=(status is None))
+            return tasks
+
+    def query_task_ids(self, status=None, sort_column=None, sort_direction='ascending', include_on_hold=True, search=None, due_on=None):
+        """
+        與 query_tasks 相同，但只回傳任務 ID 的順序列表，供虛擬清單按需載入可見的列。
+        :return: 任務 ID 列表
+        """
+        return [task['id'] for task in self.query_tasks(status, sort_column, sort_direction, include_on_hold, search, due_on)]
 
+    @perf.timed("TaskManager.get_all_tasks_sorted")
     def get_all_tasks_sorted(self, sort_column=None, sort_direction='ascending'):
         """
         獲取所有任務，並可選擇進行排序。
@@ -130,33 +520,16 @@ class TaskManager:
         :param sort_direction: 排序方向 ('ascending' 或 'descending')
         :return: 排序後的任務列表
         """
-        tasks_to_sort = list(self._tasks) # 複製列表以避免修改原始數據
-        
+        with self._lock.read():
+            tasks_to_sort = list(self._tasks) # 複製列表以避免修改原始數據
+            self._sort_tasks(tasks_to_sort, sort_column, sort_direction, newest_first_by_default=True)
+            return tasks_to_sort
+
+    @staticmethod
+    @perf.timed("TaskManager.sort")
+    def _sort_tasks(tasks, sort_column, sort_direction, newest_first_by_default=False):
+        """就地排序任務列表；未指定欄位時可選擇預設按建立時間降序排序 (最新在前)。"""
         if sort_column:
-            def sort_key(task):
-                value = task.get(sort_column)
-                if sort_column in ['due_date', 'creation_time']:
-                    try:
-                        # 對日期時間字串進行轉換以便正確排序
-                        if sort_column == 'due_date':
-                            return datetime.strptime(str(value).split(' ')[0], '%Y-%m-%d').date() if value else datetime.max.date()
-                        if sort_column == 'creation_time':
-                            return datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S') if value else datetime.max
-                    except (ValueError, IndexError):
-                        # 對於無效日期，將其視為最大值，使其排在末尾
-                        return datetime.max.date() if sort_column == 'due_date' else datetime.max
-                elif sort_column == 'status':
-                    try:
-                        # 根據預定義的狀態順序進行排序
-                        return STATUS_OPTIONS.index(value)
-                    except ValueError:
-                        return len(STATUS_OPTIONS) # 未知狀態排在最後
-                # 對於其他字串類型，進行小寫轉換以實現不區分大小寫的排序
-                return str(value).lower() if value is not None else ''
-
-            tasks_to_sort.sort(key=sort_key, reverse=(sort_direction == 'descending'))
-        else:
-            # 預設按建立時間降序排序 (最新在前)
-            tasks_to_sort.sort(key=lambda x: datetime.strptime(x.get('creation_time', '1900-01-01 00:00:00'), '%Y-%m-%d %H:%M:%S') if x.get('creation_time') else datetime.min, reverse=True)
-            
-        return tasks_to_sort
\ No newline at end of file
+            tasks.sort(key=_task_sort_key(sort_column), reverse=(sort_direction == 'descending'))
+        elif newest_first_by_default:
+            tasks.sort(key=lambda x: datetime.strptime(x.get('creation_time', '1900-01-01 00:00:00'), '%Y-%m-%d %H:%M:%S') if x.get('creation_time') else datetime.min, reverse=True)
@@ -0,0 +1,140 @@
+# record_calender/thumbnails.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_THUMBNAIL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.thumbnails')
+THUMBNAIL_SIZE = (160, 160)
+MEMORY_CAPACITY = 64 # 記憶體中最多保留的縮圖數
+MAX_WORKERS = 2 # 解碼與縮放的背景執行緒數
+
+class ThumbnailCache:
+    """
+    附件縮圖快取。解碼與縮放在 ThreadPoolExecutor 中進行，結果依 (路徑, 修改時間, 尺寸) 存放在
+    記憶體中的 LRU（OrderedDict）以及磁碟上的 PNG 快取，下次啟動時不必重新解碼原始圖片。
+    回傳的是 PIL Image；轉成 Tk 的 PhotoImage 必須在主執行緒進行。
+    """
+
+    def __init__(self, cache_dir=DEFAULT_THUMBNAIL_DIR, size=THUMBNAIL_SIZE, memory_capacity=MEMORY_CAPACITY, max_workers=MAX_WORKERS):
+        """
+        :param cache_dir: 磁碟縮圖快取的目錄；None 表示不使用磁碟快取
+        :param size: 縮圖的最大尺寸 (寬, 高)
+        :param memory_capacity: 記憶體 LRU 的容量
+        :param max_workers: 背景執行緒數
+        """
+        self.cache_dir = cache_dir
+        self.size = tuple(size)
+        self.memory_capacity = memory_capacity
+        self._memory = OrderedDict() # key -> PIL Image，最近使用的在尾端
+        self._pending = {} # key -> Future，避免同一張圖同時解碼多次
+        self._lock = threading.Lock()
+        self._executor = None # 第一次需要時才建立執行緒池
+        self._max_workers = max_workers
+
+    def cache_key(self, path):
+        """回傳圖片的快取鍵 (絕對路徑, 修改時間 ns, 尺寸)；檔案不存在時回傳 None。"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return (os.path.abspath(path), mtime_ns, self.size)
+
+    def disk_cache_path(self, key):
+        """回傳快取鍵對應的磁碟縮圖檔路徑"""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.png")
+
+    def get(self, path):
+        """
+        若縮圖已在記憶體中則直接回傳（並標記為最近使用），否則回傳 None；不會讀取圖片。
+        """
+        key = self.cache_key(path)
+        if key is None:
+            return None
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+            return image
+
+    def load_async(self, path):
+        """
+        在背景執行緒載入縮圖。
+        :return: concurrent.futures.Future，結果為 PIL Image；檔案不存在或無法解碼時會帶有例外
+        """
+        key = self.cache_key(path)
+        with self._lock:
+            pending = self._pending.get(key) if key is not None else None
+            if pending is not None and not pending.done():
+                return pending
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="thumbnail")
+            future = self._executor.submit(self._load, path, key)
+            if key is not None:
+                self._pending[key] = future
+        return future
+
+    def _load(self, path, key):
+        """背景執行緒：依序嘗試記憶體、磁碟快取，最後才解碼原始圖片"""
+        try:
+            if key is None:
+                raise FileNotFoundError(f"Image file not found: {path}")
+            with self._lock:
+                image = self._memory.get(key)
+            if image is None:
+                image = self._decode(path, key)
+                self._remember(key, image)
+            return image
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _decode(self, path, key):
+        """讀取磁碟快取；沒有快取時解碼並縮放原始圖片，再寫入磁碟快取"""
+        from PIL import Image # 延遲導入，只有在需要顯示附件時才載入 PIL
+
+        cache_path = self.disk_cache_path(key) if self.cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with Image.open(cache_path) as cached:
+                    cached.load()
+                    return cached.copy()
+            except OSError:
+                pass # 快取檔損壞，重新產生
+
+        with Image.open(path) as original:
+            original.draft("RGB", self.size) # JPEG 可在解碼時直接縮小，省下大部分時間
+            image = original.copy()
+        image.thumbnail(self.size, Image.Resampling.LANCZOS)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        if cache_path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                temp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+                image.save(temp_path, format="PNG")
+                os.replace(temp_path, cache_path) # 原子替換，避免其他執行緒讀到寫到一半的檔案
+            except OSError:
+                pass # 無法寫入快取時仍回傳縮圖
+        return image
+
+    def _remember(self, key, image):
+        """放入記憶體 LRU，超過容量時移除最久未使用的項目"""
+        with self._lock:
+            self._memory[key] = image
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_capacity:
+                self._memory.popitem(last=False)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def shutdown(self):
+        """停止背景執行緒（不等待進行中的工作）"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
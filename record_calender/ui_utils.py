@@ -0,0 +1,71 @@
+# record_calender/ui_utils.py
+
+import tkinter as tk # 需要 Tkinter 來處理剪貼板和標籤
+from record_calender import utils
+from record_calender.utils import URL_PATTERN, URL_TAG, find_url_spans
+
+def _open_url_at_current(textbox, targets):
+    """開啟滑鼠位置所在連結對應的網址"""
+    tag_range = textbox.tag_prevrange(URL_TAG, "current + 1c")
+    if tag_range:
+        url = targets.get(str(textbox.index(tag_range[0])))
+        if url:
+            utils.open_url(url) # 經由模組查找，讓測試可以替換 utils.open_url
+
+def find_and_tag_urls(textbox, content=None, start_index="1.0"):
+    """
+    在 Textbox 中查找 URL 並應用超連結標籤。
+    所有連結共用一個 "url" 標籤（事件只綁定一次），點擊時由標籤範圍的起點查出對應的網址。
+    :param content: Textbox 目前的文字（可選）；呼叫端已有文字時傳入可省去一次讀取
+    :param start_index: content 在 Textbox 中的起始位置 ("行.欄")；不是 "1.0" 時表示附加在後面的一段文字，
+                        只標記這一段並保留先前的連結
+    """
+    textbox.configure(state="normal")
+    appending = start_index != "1.0"
+    if not appending:
+        textbox.tag_remove(URL_TAG, "1.0", tk.END)
+        textbox.tag_configure(URL_TAG, foreground="blue", underline=True)
+    if content is None:
+        content = textbox.get(start_index, "end-1c") # 不可 strip，否則開頭的空白會讓偏移量錯位
+
+    first_line, first_column = (int(part) for part in start_index.split("."))
+    spans = find_url_spans(content, first_line, first_column)
+    if spans:
+        # 一次呼叫加入所有範圍，避免每個連結一次 Tcl 往返
+        textbox.tag_add(URL_TAG, *[index for span_start, span_end, _ in spans for index in (span_start, span_end)])
+    targets = getattr(textbox, "_url_targets", None) if appending else None
+    if targets is None:
+        targets = textbox._url_targets = {} # 連結起點 -> 網址
+        textbox.tag_bind(URL_TAG, "<Button-1>", lambda e: _open_url_at_current(textbox, targets))
+        textbox.tag_bind(URL_TAG, "<Enter>", lambda e: textbox.config(cursor="hand2"))
+        textbox.tag_bind(URL_TAG, "<Leave>", lambda e: textbox.config(cursor=""))
+    targets.update((span_start, url) for span_start, _, url in spans)
+
+    textbox.configure(state="disabled")
+
+def copy_with_links(textbox, app_instance=None, content=None):
+    """複製包含超連結的文字到剪貼板；content 可傳入完整文字（例如只顯示了一部分的長備註）"""
+    if content is None:
+        content = textbox.get("1.0", tk.END)
+    content = content.strip()
+    urls = [match.group(0) for match in URL_PATTERN.finditer(content)]
+
+    clipboard_content = content
+    if urls:
+        clipboard_content += "\n\n連結:\n" + "\n".join(urls)
+        
+    if app_instance: # 確保只在 GUI 環境中執行剪貼板操作
+        app_instance.clipboard_clear()
+        app_instance.clipboard_append(clipboard_content)
+        app_instance.update_status("已複製文字和連結到剪貼板")
+    else:
+        # 非 GUI 環境下的替代處理，例如打印或記錄
+        print(f"Clipboard content (simulated): {clipboard_content}")
+
+def show_context_menu(event, textbox, app_instance, content=None):
+    """顯示右鍵菜單，提供複製功能"""
+    textbox.configure(state="normal")
+    menu = tk.Menu(app_instance, tearoff=0)
+    menu.add_command(label="複製", command=lambda: copy_with_links(textbox, app_instance, content))
+    menu.post(event.x_root, event.y_root)
+    textbox.configure(state="disabled")
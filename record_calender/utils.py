@@ -1,13 +1,22 @@
 # record_calender/utils.py
 
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
+from bisect import bisect_right
+from functools import lru_cache
 import re
 import webbrowser
-import tkinter as tk # 需要 Tkinter 來處理剪貼板和標籤
-import tkinter.font as tkfont # 處理字體
 
 STATUS_OPTIONS = ["Pending", "In progress", "Completed", "Cancelled", "On hold"]
 
+URL_PATTERN = re.compile(r'https?://[^\s]+') # 只編譯一次，供所有網址相關函數共用
+URL_TAG = "url"
+ATTACHMENT_MARK = "●" # 有附件圖片的任務在清單中顯示的標記
+NOTE_PREVIEW_CHARS = 60 # 清單中備註預覽的長度
+OVERDUE_TAG = "overdue"
+DUE_TODAY_TAG = "due_today"
+CLOSED_STATUSES = ("Completed", "Cancelled") # 這些狀態的任務不會標示為逾期或今日到期
+
+@lru_cache(maxsize=131072)
 def format_datetime(dt_str):
     """格式化 YYYY-MM-DD HH:MM:SS 字串為可讀格式，並包含星期幾"""
     if not dt_str:
@@ -22,6 +31,7 @@ def format_datetime(dt_str):
         except ValueError:
              return dt_str
 
+@lru_cache(maxsize=None) # 到期日的種類有限（每天一種），全部快取
 def format_date_with_weekday(date_str):
     """格式化 YYYY-MM-DD 字串為 YYYY-MM-DD (星期幾)"""
     if not date_str:
@@ -32,6 +42,68 @@ def format_date_with_weekday(date_str):
     except ValueError:
         return date_str
 
+def format_row(task):
+    """
+    將任務轉為清單一列的顯示值。
+    :return: (建立時間, 內容, 到期日, 狀態, 備註預覽, 附件標記)
+    """
+    status = task.get("status")
+    note = task.get("note", "")
+    note = str(note) if note is not None else ""
+    note_preview = note[:NOTE_PREVIEW_CHARS].replace("\n", " ")
+    if len(note) > NOTE_PREVIEW_CHARS:
+        note_preview += "..."
+    return (
+        format_datetime(task.get("creation_time")),
+        task.get("description", ""),
+        format_date_with_weekday(task.get("due_date")),
+        status if status in STATUS_OPTIONS else "未知狀態",
+        note_preview,
+        ATTACHMENT_MARK if task.get("image_path") else "", # 只看路徑，不讀取圖片
+    )
+
+def format_rows(tasks, cache=None, get_revision=None):
+    """
+    批次將任務轉為顯示值。提供 cache 與 get_revision 時，版本沒有改變的任務直接沿用快取的結果，
+    不會重新格式化（也就不會解析任何日期）。
+    :param tasks: 任務列表
+    :param cache: dict，任務 ID -> (版本, 顯示值)；會就地更新
+    :param get_revision: callable(task_id) -> 任務目前的版本
+    :return: 顯示值列表，順序與 tasks 相同
+    """
+    if cache is None or get_revision is None:
+        return [format_row(task) for task in tasks]
+    rows = []
+    for task in tasks:
+        task_id = task['id']
+        revision = get_revision(task_id)
+        cached = cache.get(task_id)
+        if cached is not None and cached[0] == revision:
+            rows.append(cached[1])
+            continue
+        row = format_row(task)
+        cache[task_id] = (revision, row)
+        rows.append(row)
+    return rows
+
+def due_tags(due_ordinal, status, today_ordinal):
+    """
+    依到期日序數與「今天」的序數決定列的標籤，不解析任何日期字串。
+    :param due_ordinal: 到期日的 date.toordinal()，None 表示沒有到期日
+    :param status: 任務狀態
+    :param today_ordinal: 今天的 date.toordinal()（由呼叫端快取）
+    :return: (OVERDUE_TAG,)、(DUE_TODAY_TAG,) 或 ()
+    """
+    if due_ordinal is None or status in CLOSED_STATUSES or due_ordinal > today_ordinal:
+        return ()
+    return (OVERDUE_TAG,) if due_ordinal < today_ordinal else (DUE_TODAY_TAG,)
+
+def ms_until_midnight(now=None):
+    """距離下一個本地午夜的毫秒數（至少 1 秒，避免在午夜前後重複觸發）"""
+    now = now or datetime.now()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+    return max(1000, int((next_midnight - now).total_seconds() * 1000) + 500)
+
 def is_past_due(date_str):
     """檢查給定日期字串是否在今天之前"""
     if not date_str:
@@ -42,31 +114,60 @@ def is_past_due(date_str):
     except ValueError:
         return False
 
-def find_and_tag_urls(textbox):
-    """在 Textbox 中查找 URL 並應用超連結標籤"""
-    textbox.configure(state="normal")
-    textbox.tag_remove("url", "1.0", tk.END)
-    textbox.tag_configure("url", foreground="blue", underline=True)
-    url_pattern = re.compile(r'https?://[^\s]+')
-    content = textbox.get("1.0", tk.END).strip()
-
-    for match in url_pattern.finditer(content):
-        start_char_index = match.start()
-        end_char_index = match.end()
-        try:
-            start_index = textbox.index(f"1.0 + {start_char_index}c")
-            end_index = textbox.index(f"1.0 + {end_char_index}c")
-        except tk.TclError:
-            continue
+def _line_starts(content):
+    """回傳每一行第一個字元在 content 中的偏移量。"""
+    starts = [0]
+    position = content.find("\n")
+    while position != -1:
+        starts.append(position + 1)
+        position = content.find("\n", position + 1)
+    return starts
 
-        textbox.tag_add("url", start_index, end_index)
-        url = match.group(0)
-        # 綁定事件時使用 lambda 確保 url 被正確捕獲
-        textbox.tag_bind("url", "<Button-1>", lambda e, target_url=url: open_url(target_url))
-        textbox.tag_bind("url", "<Enter>", lambda e: textbox.config(cursor="hand2"))
-        textbox.tag_bind("url", "<Leave>", lambda e: textbox.config(cursor=""))
+@lru_cache(maxsize=32)
+def find_url_spans(content, first_line=1, first_column=0):
+    """
+    找出文字中所有網址的位置；結果依內容快取，重複選取同一個任務時不必重新掃描。
+    偏移量只用一次掃描換行位置後以二分搜尋轉換，不需要逐一詢問 Tk 的 index。
+    :param content: 文字內容
+    :param first_line: content 第一個字元在 Textbox 中的行號（分段顯示時使用）
+    :param first_column: content 第一個字元在該行的欄位
+    :return: ((start_index, end_index, url), ...)，索引為 Tk 的 "行.欄" 格式
+    """
+    line_starts = None
+    spans = []
+    for match in URL_PATTERN.finditer(content):
+        if line_starts is None:
+            line_starts = _line_starts(content)
+        indices = []
+        for offset in match.span():
+            line = bisect_right(line_starts, offset) - 1
+            column = offset - line_starts[line] + (first_column if line == 0 else 0)
+            indices.append(f"{line + first_line}.{column}")
+        spans.append((indices[0], indices[1], match.group(0)))
+    return tuple(spans)
 
-    textbox.configure(state="disabled")
+def note_window_end(note, start, size):
+    """
+    計算備註分段顯示時，從 start 開始最多 size 個字元的一段在哪裡結束。
+    盡量在換行（其次是空白）之後切開，避免把網址切成兩半。
+    :return: 結束位置（不含）
+    """
+    end = start + size
+    if end >= len(note):
+        return len(note)
+    cut = note.rfind("\n", start, end)
+    if cut == -1:
+        cut = max(note.rfind(" ", start, end), note.rfind("\t", start, end))
+    return cut + 1 if cut != -1 else end
+
+def text_end_index(start_index, text):
+    """回傳在 start_index ("行.欄") 插入 text 後，文字結尾的 "行.欄" 索引。"""
+    line, column = (int(part) for part in start_index.split("."))
+    newlines = text.count("\n")
+    if newlines:
+        last_line_length = len(text) - text.rfind("\n") - 1
+        return f"{line + newlines}.{last_line_length}"
+    return f"{line}.{column + len(text)}"
 
 def open_url(url):
     """打開指定的 URL"""
@@ -78,31 +179,12 @@ def open_url(url):
         print(f"Error opening URL {url}: {e}") # 可以改為日誌記錄
         return False
 
-def copy_with_links(textbox, app_instance=None):
-    """複製包含超連結的文字到剪貼板"""
-    content = textbox.get("1.0", tk.END).strip()
-    url_pattern = re.compile(r'https?://[^\s]+')
-    urls = []
-
-    for match in url_pattern.finditer(content):
-        urls.append(match.group(0))
-
-    clipboard_content = content
-    if urls:
-        clipboard_content += "\n\n連結:\n" + "\n".join(urls)
-        
-    if app_instance: # 確保只在 GUI 環境中執行剪貼板操作
-        app_instance.clipboard_clear()
-        app_instance.clipboard_append(clipboard_content)
-        app_instance.update_status("已複製文字和連結到剪貼板")
-    else:
-        # 非 GUI 環境下的替代處理，例如打印或記錄
-        print(f"Clipboard content (simulated): {clipboard_content}")
-
-def show_context_menu(event, textbox, app_instance):
-    """顯示右鍵菜單，提供複製功能"""
-    textbox.configure(state="normal")
-    menu = tk.Menu(app_instance, tearoff=0)
-    menu.add_command(label="複製", command=lambda: copy_with_links(textbox, app_instance))
-    menu.post(event.x_root, event.y_root)
-    textbox.configure(state="disabled")
\ No newline at end of file
+# 依賴 Tkinter 的函數已移到 ui_utils；保留舊的存取方式（utils.find_and_tag_urls 等），
+# 只有在真的用到時才導入 tkinter，讓命令列等非 GUI 的程式不必載入 Tk
+_UI_HELPERS = ("find_and_tag_urls", "copy_with_links", "show_context_menu", "_open_url_at_current")
+
+def __getattr__(name):
+    if name in _UI_HELPERS:
+        from record_calender import ui_utils
+        return getattr(ui_utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,480 @@
+# record_calender/widgets.py
+
+import time
+from bisect import bisect_left
+from tkinter import ttk
+
+DEFAULT_ROW_HEIGHT = 20 # ttk Treeview 的預設列高（像素）
+
+def _longest_increasing_subsequence(values):
+    """回傳 values 中最長遞增子序列的索引集合（O(n log n)）。"""
+    tails = [] # tails[k] = 長度 k+1 的遞增子序列中，結尾值最小者的索引
+    tail_values = []
+    previous = [None] * len(values)
+    for index, value in enumerate(values):
+        position = bisect_left(tail_values, value)
+        if position == len(tail_values):
+            tails.append(index)
+            tail_values.append(value)
+        else:
+            tails[position] = index
+            tail_values[position] = value
+        previous[index] = tails[position - 1] if position else None
+    result = set()
+    index = tails[-1] if tails else None
+    while index is not None:
+        result.add(index)
+        index = previous[index]
+    return result
+
+def diff_rows(old_order, old_rows, new_rows):
+    """
+    比較目前顯示的列與新的列，只產生必要的 Treeview 操作。
+    :param old_order: 目前顯示的 iid 順序
+    :param old_rows: iid -> (values, tags)，目前顯示的內容
+    :param new_rows: 新的列 [(iid, values, tags), ...]，依顯示順序排列
+    :return: 操作列表：('delete', [iid, ...])、('item', iid, values, tags)、
+             ('move', iid, prev_iid)、('insert', iid, prev_iid, values, tags)；
+             prev_iid 為 None 表示放在最前面
+    """
+    new_iids = {iid for iid, _, _ in new_rows}
+    ops = []
+    removed = [iid for iid in old_order if iid not in new_iids]
+    if removed:
+        ops.append(('delete', removed))
+
+    # 保留下來的列中，舊位置呈遞增的最長子序列不需要移動，其餘的列才移動
+    old_positions = {iid: position for position, iid in enumerate(old_order)}
+    kept = [(index, old_positions[iid]) for index, (iid, _, _) in enumerate(new_rows) if iid in old_positions]
+    stay = {kept[i][0] for i in _longest_increasing_subsequence([position for _, position in kept])}
+
+    prev_iid = None
+    for index, (iid, values, tags) in enumerate(new_rows):
+        values, tags = tuple(values), tuple(tags)
+        if iid not in old_positions:
+            ops.append(('insert', iid, prev_iid, values, tags))
+        else:
+            if old_rows.get(iid) != (values, tags):
+                ops.append(('item', iid, values, tags))
+            if index not in stay:
+                ops.append(('move', iid, prev_iid))
+        prev_iid = iid
+    return ops
+
+def apply_row_ops(treeview, ops):
+    """將 diff_rows 產生的操作套用到 Treeview（或相容的物件）。"""
+    RowSyncJob(treeview, ops).step()
+
+class RowSyncJob:
+    """
+    可分段執行的 diff 套用工作，讓大量的列可以分成多個時間片插入，並可隨時取消。
+    on_op(op) 會在每個操作套用後被呼叫，讓呼叫端維護自己的狀態。
+    """
+
+    def __init__(self, treeview, ops, on_op=None, on_done=None, on_cancel=None):
+        self.treeview = treeview
+        self.ops = ops
+        self.total = len(ops)
+        self.done = 0
+        self.cancelled = False
+        self._on_op = on_op
+        self._on_done = on_done
+        self._on_cancel = on_cancel
+        self._last = (None, None) # 上一個放置的 (iid, index)，連續插入時不必向 Tk 查詢位置
+
+    @property
+    def finished(self):
+        return self.done >= self.total
+
+    def _index_after(self, prev_iid):
+        if prev_iid is None:
+            return 0
+        if self._last[0] == prev_iid:
+            return self._last[1] + 1
+        return self.treeview.index(prev_iid) + 1
+
+    def _apply(self, op):
+        kind = op[0]
+        if kind == 'delete':
+            self.treeview.delete(*op[1])
+            self._last = (None, None)
+        elif kind == 'item':
+            self.treeview.item(op[1], values=op[2], tags=op[3])
+        elif kind == 'move':
+            index = self._index_after(op[2])
+            if self.treeview.index(op[1]) < index:
+                index -= 1 # Tk 會先移除項目再計算位置
+            self.treeview.move(op[1], "", index)
+            self._last = (op[1], index)
+        elif kind == 'insert':
+            index = self._index_after(op[2])
+            self.treeview.insert("", index, iid=op[1], values=op[3], tags=op[4])
+            self._last = (op[1], index)
+
+    def step(self, budget=None):
+        """
+        套用操作直到完成或超過時間預算。
+        :param budget: 本次最多花費的秒數；None 表示一次做完
+        :return: True 如果所有操作都已套用
+        """
+        if self.cancelled:
+            return True
+        deadline = time.perf_counter() + budget if budget is not None else None
+        while self.done < self.total:
+            op = self.ops[self.done]
+            self._apply(op)
+            self.done += 1
+            if self._on_op:
+                self._on_op(op)
+            if deadline is not None and self.done % 64 == 0 and time.perf_counter() >= deadline:
+                break
+        if self.finished and self._on_done:
+            on_done, self._on_done = self._on_done, None
+            on_done()
+        return self.finished
+
+    def cancel(self):
+        """取消尚未套用的操作。"""
+        if not self.cancelled and not self.finished:
+            self.cancelled = True
+            if self._on_cancel:
+                self._on_cancel()
+
+class VirtualTreeview(ttk.Treeview):
+    """
+    支援虛擬清單模式的 Treeview。
+    一般模式下與 ttk.Treeview 完全相同；虛擬模式下只保留固定數量的「列槽」，
+    捲軸對應整個邏輯結果集，捲動時才透過 fetch_rows 取得可見範圍內的資料。
+    selection() / selection_set() / selection_remove() / see() 在虛擬模式下使用真實的任務 ID。
+    """
+
+    def __init__(self, master=None, fetch_rows=None, **kwargs):
+        """
+        :param fetch_rows: callable(task_ids) -> [(task_id, values, tags), ...]，回傳可見列的顯示資料
+        """
+        self._external_yscrollcommand = kwargs.pop('yscrollcommand', None)
+        super().__init__(master, yscrollcommand=self._on_native_yscroll, **kwargs)
+        self._fetch_rows = fetch_rows
+        self._virtual = False
+        self._row_ids = [] # 邏輯結果集中的任務 ID（已排序）
+        self._positions = {} # 任務 ID -> 在結果集中的位置
+        self._first = 0 # 可見範圍第一列在結果集中的位置
+        self._slots = [] # 固定的列槽 iid
+        self._attached = 0 # 目前掛在樹上的列槽數（永遠是 _slots 的前綴）
+        self._slot_ids = {} # 列槽 iid -> 目前顯示的任務 ID
+        self._selected_ids = set() # 以真實任務 ID 記錄的選取狀態
+        self._displayed_order = [] # 一般模式下目前顯示的 iid 順序
+        self._displayed_rows = {} # 一般模式下 iid -> (values, tags)，避免向 Tk 讀回每一列
+        self._order_stale = False # 差異更新被中途取消後，_displayed_order 需要重新讀取
+
+        # 使用專屬的 bindtag，讓內部綁定不會被外部的 bind() 覆蓋，且先於外部綁定執行
+        self._virtual_tag = f"VirtualTreeview{id(self)}"
+        self.bindtags((self._virtual_tag,) + self.bindtags())
+        self.bind_class(self._virtual_tag, "<Configure>", self._on_configure)
+        self.bind_class(self._virtual_tag, "<ButtonPress-1>", self._on_click)
+        self.bind_class(self._virtual_tag, "<<TreeviewSelect>>", self._on_select)
+        self.bind_class(self._virtual_tag, "<MouseWheel>", self._on_mousewheel)
+        self.bind_class(self._virtual_tag, "<Button-4>", lambda e: self._scroll_by(-3, e))
+        self.bind_class(self._virtual_tag, "<Button-5>", lambda e: self._scroll_by(3, e))
+        self.bind_class(self._virtual_tag, "<Up>", lambda e: self._on_arrow_key(-1))
+        self.bind_class(self._virtual_tag, "<Down>", lambda e: self._on_arrow_key(1))
+        self.bind_class(self._virtual_tag, "<Prior>", lambda e: self._scroll_by(-self._visible_count(), e))
+        self.bind_class(self._virtual_tag, "<Next>", lambda e: self._scroll_by(self._visible_count(), e))
+
+    # --- 模式切換 ---
+
+    @property
+    def virtual(self):
+        return self._virtual
+
+    def set_virtual(self, enabled):
+        """切換虛擬清單模式；切換時會清空目前的列，由呼叫端重新填充。"""
+        enabled = bool(enabled)
+        if enabled == self._virtual:
+            return
+        super().delete(*(set(self._slots) | set(super().get_children())))
+        self._slots = []
+        self._attached = 0
+        self._slot_ids = {}
+        self._row_ids = []
+        self._positions = {}
+        self._selected_ids = set()
+        self._displayed_order = []
+        self._displayed_rows = {}
+        self._order_stale = False
+        self._first = 0
+        self._virtual = enabled
+
+    def sync_rows(self, rows):
+        """
+        一般模式下以差異方式更新列：只對有變動的列呼叫 item/move/insert/delete，
+        並保留選取狀態與捲動位置。
+        :param rows: 新的列 [(iid, values, tags), ...]，依顯示順序排列
+        :return: 套用的操作列表
+        """
+        job = self.start_sync(rows)
+        job.step()
+        return job.ops
+
+    def start_sync(self, rows):
+        """
+        建立一個可分段執行的差異更新工作（見 RowSyncJob），供呼叫端以時間片方式套用。
+        :param rows: 新的列 [(iid, values, tags), ...]，依顯示順序排列
+        :return: RowSyncJob
+        """
+        if self._order_stale:
+            # 上一次的工作被中途取消，重新向 Tk 讀取實際順序（單次呼叫）
+            self._displayed_order = list(super().get_children())
+            self._order_stale = False
+
+        rows = [(str(iid), tuple(values), tuple(tags)) for iid, values, tags in rows]
+        anchor = None
+        if self._displayed_order:
+            first_index = int(round(super().yview()[0] * len(self._displayed_order)))
+            anchor = self._displayed_order[min(first_index, len(self._displayed_order) - 1)]
+        new_order = [iid for iid, _, _ in rows]
+        ops = diff_rows(self._displayed_order, self._displayed_rows, rows)
+
+        def on_op(op):
+            # 每個操作後同步內容快取，取消時內容仍與 Tk 一致
+            if op[0] == 'delete':
+                for iid in op[1]:
+                    self._displayed_rows.pop(iid, None)
+            elif op[0] == 'item':
+                self._displayed_rows[op[1]] = (op[2], op[3])
+            elif op[0] == 'insert':
+                self._displayed_rows[op[1]] = (op[3], op[4])
+
+        def on_done():
+            self._displayed_order = new_order
+            # 以原本最上方的列為錨點恢復捲動位置
+            if ops and anchor in self._displayed_rows and new_order:
+                super(VirtualTreeview, self).yview_moveto(new_order.index(anchor) / len(new_order))
+
+        def on_cancel():
+            self._order_stale = True
+
+        return RowSyncJob(self, ops, on_op=on_op, on_done=on_done, on_cancel=on_cancel)
+
+    def set_rows(self, task_ids):
+        """
+        虛擬模式下設定新的邏輯結果集，保留仍存在的選取項目與捲動位置。
+        :param task_ids: 排序後的任務 ID 列表
+        """
+        self._row_ids = list(task_ids)
+        self._positions = {task_id: position for position, task_id in enumerate(self._row_ids)}
+        self._selected_ids &= self._positions.keys()
+        self._first = self._clamp_first(self._first)
+        self._render()
+
+    def update_row_tags(self, tags_by_id):
+        """
+        只更新指定任務的列標籤（例如跨過午夜後逾期狀態改變），不重新取得或比較其他列。
+        :param tags_by_id: 任務 ID -> 新的標籤 tuple
+        """
+        if self._virtual:
+            for slot, task_id in self._slot_ids.items():
+                if task_id in tags_by_id:
+                    self.item(slot, tags=tags_by_id[task_id])
+            return
+        for task_id, tags in tags_by_id.items():
+            iid = str(task_id)
+            displayed = self._displayed_rows.get(iid)
+            if displayed is not None:
+                tags = tuple(tags)
+                self._displayed_rows[iid] = (displayed[0], tags)
+                super().item(iid, tags=tags)
+
+    def refresh(self):
+        """重新取得可見範圍內的資料（例如任務內容變更但順序未變時）。"""
+        if self._virtual:
+            self._render()
+
+    # --- 覆寫 Treeview 方法，讓外部程式碼以真實 ID 操作 ---
+
+    def selection(self, *args):
+        if not self._virtual or args:
+            return super().selection(*args)
+        ordered = sorted(self._selected_ids, key=self._positions.__getitem__)
+        return tuple(str(task_id) for task_id in ordered)
+
+    def selection_set(self, *items):
+        if not self._virtual:
+            return super().selection_set(*items)
+        self._selected_ids = set(self._to_task_ids(items))
+        self._apply_selection()
+
+    def selection_add(self, *items):
+        if not self._virtual:
+            return super().selection_add(*items)
+        self._selected_ids.update(self._to_task_ids(items))
+        self._apply_selection()
+
+    def selection_remove(self, *items):
+        if not self._virtual:
+            return super().selection_remove(*items)
+        self._selected_ids.difference_update(self._to_task_ids(items))
+        self._apply_selection()
+
+    def see(self, item):
+        if not self._virtual:
+            return super().see(item)
+        task_ids = self._to_task_ids((item,))
+        if not task_ids:
+            return
+        position = self._positions[task_ids[0]]
+        visible = self._visible_count()
+        if position < self._first:
+            self._scroll_to(position)
+        elif position >= self._first + visible:
+            self._scroll_to(position - visible + 1)
+
+    def yview(self, *args):
+        if not self._virtual:
+            return super().yview(*args)
+        if not args:
+            return self._fractions()
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * len(self._row_ids)))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= max(1, self._visible_count() - 1)
+            self._scroll_to(self._first + amount)
+        return None
+
+    # --- 內部實作 ---
+
+    def _to_task_ids(self, items):
+        task_ids = []
+        for item in items:
+            if isinstance(item, (list, tuple)):
+                task_ids.extend(self._to_task_ids(item))
+                continue
+            try:
+                task_id = int(item)
+            except (TypeError, ValueError):
+                continue
+            if task_id in self._positions:
+                task_ids.append(task_id)
+        return task_ids
+
+    def _visible_count(self):
+        """根據元件高度計算可見列數；尚未顯示時使用 height 選項。"""
+        configured = int(self.cget('height'))
+        height = self.winfo_height()
+        if height <= 1:
+            return configured
+        heading_height, row_height = 0, DEFAULT_ROW_HEIGHT
+        if self._attached:
+            bbox = super().bbox(self._slots[0])
+            if bbox:
+                heading_height, row_height = bbox[1], max(1, bbox[3])
+        return max(1, (height - heading_height) // row_height)
+
+    def _clamp_first(self, first):
+        return max(0, min(first, len(self._row_ids) - self._visible_count()))
+
+    def _fractions(self):
+        total = len(self._row_ids)
+        if not total:
+            return (0.0, 1.0)
+        visible = self._visible_count()
+        return (self._first / total, min(1.0, (self._first + visible) / total))
+
+    def _ensure_slots(self, count):
+        while len(self._slots) < count:
+            slot = super().insert("", "end", iid=f"slot-{len(self._slots)}")
+            super().detach(slot)
+            self._slots.append(slot)
+
+    def _render(self):
+        """以固定的列槽顯示結果集中從 _first 開始的可見範圍。"""
+        visible = self._visible_count()
+        self._ensure_slots(visible)
+        window_ids = self._row_ids[self._first:self._first + visible]
+        rows = self._fetch_rows(window_ids) if (self._fetch_rows and window_ids) else []
+
+        self._slot_ids = {}
+        for index, (task_id, values, tags) in enumerate(rows):
+            slot = self._slots[index]
+            self._slot_ids[slot] = task_id
+            self.item(slot, values=values, tags=tags)
+            if index >= self._attached:
+                super().move(slot, "", index) # 重新掛上先前卸下的列槽
+        for slot in self._slots[len(rows):self._attached]:
+            super().detach(slot)
+        self._attached = len(rows)
+        self._apply_selection()
+        if self._external_yscrollcommand:
+            self._external_yscrollcommand(*self._fractions())
+
+    def _apply_selection(self):
+        """讓列槽的 Tk 選取狀態與 _selected_ids 一致。"""
+        wanted = [slot for slot, task_id in self._slot_ids.items() if task_id in self._selected_ids]
+        if set(wanted) != set(super().selection()):
+            super().selection_set(wanted)
+
+    def _scroll_to(self, first):
+        first = self._clamp_first(first)
+        if first != self._first:
+            self._first = first
+            self._render()
+
+    def _scroll_by(self, amount, event=None):
+        if not self._virtual:
+            return None
+        self._scroll_to(self._first + amount)
+        return "break"
+
+    def _on_mousewheel(self, event):
+        if not self._virtual:
+            return None
+        step = -1 if event.delta > 0 else 1
+        if abs(event.delta) >= 120: # Windows 每格 120，macOS 為較小的整數
+            step *= abs(event.delta) // 120
+        return self._scroll_by(step * 3)
+
+    def _on_arrow_key(self, direction):
+        """在可見範圍邊緣按上下鍵時捲動視窗並移動選取。"""
+        if not self._virtual:
+            return None
+        focus = self.focus()
+        if focus not in self._slot_ids:
+            return None
+        position = self._positions[self._slot_ids[focus]] + direction
+        if not 0 <= position < len(self._row_ids):
+            return "break"
+        task_id = self._row_ids[position]
+        self.see(str(task_id))
+        self._selected_ids = {task_id}
+        self._apply_selection()
+        for slot, slot_task_id in self._slot_ids.items():
+            if slot_task_id == task_id:
+                self.focus(slot)
+        return "break"
+
+    def _on_click(self, event):
+        # 沒有按 Ctrl/Shift 的點擊會取代選取，因此清除可見範圍外的舊選取
+        if self._virtual and not (event.state & 0x5):
+            self._selected_ids = set()
+        return None
+
+    def _on_select(self, event):
+        if not self._virtual:
+            return None
+        visible_ids = set(self._slot_ids.values())
+        selected_slots = super().selection()
+        self._selected_ids = (self._selected_ids - visible_ids) | {self._slot_ids[slot] for slot in selected_slots if slot in self._slot_ids}
+        return None
+
+    def _on_configure(self, event):
+        if self._virtual:
+            self._first = self._clamp_first(self._first)
+            self._render()
+        return None
+
+    def _on_native_yscroll(self, first, last):
+        # 虛擬模式下捲軸由 _render 控制；Tk 自己回報的列槽範圍沒有意義
+        if not self._virtual and self._external_yscrollcommand:
+            self._external_yscrollcommand(first, last)
@@ -0,0 +1,84 @@
+# tests/test_backup.py
+
+import io
+import os
+from datetime import datetime, timedelta
+from record_calender import cli
+from record_calender.backup import BackupStore
+from record_calender.data_manager import TaskDataManager
+
+def make_tasks(count):
+    return [{'id': i, 'description': f"任務 {i} with some text", 'due_date': None, 'status': 'Pending', 'note': '',
+             'creation_time': "2025-05-20 12:00:00", 'image_path': None} for i in range(count)]
+
+def test_backup_and_restore_are_deduplicated(tmp_path):
+    """測試快照可以完整還原；只修改一個任務時只寫入一個新區塊，內容不變時不建立快照。"""
+    store = BackupStore(str(tmp_path / "backups"))
+    tasks = make_tasks(5000)
+    first = store.backup(tasks, datetime(2025, 5, 20, 10))
+    full_size = store.disk_usage()
+
+    tasks[2500]['status'] = 'Completed'
+    del tasks[100]
+    second = store.backup(tasks, datetime(2025, 5, 20, 11))
+    assert store.disk_usage() - full_size < full_size / 8 # 只多了兩個區塊與快照清單
+    assert store.backup(tasks, datetime(2025, 5, 20, 12)) is None
+
+    assert store.snapshot_ids() == [first, second]
+    assert store.restore(first) == make_tasks(5000)
+    assert store.restore('latest') == tasks
+
+def test_prune_keeps_recent_and_one_per_day(tmp_path):
+    """測試保留規則：一天內全部保留，較舊的每天保留一份，超過保留期限的刪除；不再被引用的區塊會被刪除。"""
+    store = BackupStore(str(tmp_path / "backups"))
+    now = datetime(2025, 6, 1, 12)
+    times = [now - timedelta(hours=hours) for hours in (400 * 24, 50, 49, 30, 3, 2, 1)]
+    for index, taken in enumerate(times):
+        store.backup(make_tasks(index + 1), taken)
+    removed = store.prune(now)
+    assert len(removed) == 2 # 超過期限的一份，以及同一天（50、49 小時前）較舊的一份
+    assert store.restore(store.snapshot_ids()[0]) == make_tasks(3)
+    chunk_count = sum(len(files) for _, _, files in os.walk(tmp_path / "backups" / "chunks"))
+    assert chunk_count == 5
+
+def test_prune_keeps_latest_when_data_is_unchanged(tmp_path):
+    """測試資料超過保留期限都沒有變更時，最新的快照仍會保留，不會刪除所有備份。"""
+    store = BackupStore(str(tmp_path / "backups"))
+    start = datetime(2025, 1, 1)
+    tasks = make_tasks(10)
+    store.backup(make_tasks(5), start)
+    latest = store.backup(tasks, start + timedelta(hours=1))
+    now = start + timedelta(weeks=30)
+    assert store.backup(tasks, now) is None
+    assert len(store.prune(now)) == 1
+    assert store.snapshot_ids() == [latest]
+    assert store.restore('latest') == tasks
+
+def test_save_tasks_backs_up_hourly(tmp_path):
+    """測試 save_tasks 在距離上次備份超過間隔時自動備份。"""
+    data_manager = TaskDataManager(str(tmp_path / "tasks.json"))
+    data_manager.save_tasks(make_tasks(3))
+    data_manager.save_tasks(make_tasks(4)) # 一小時內，不再備份
+    assert len(data_manager.backups.snapshot_ids()) == 1
+    data_manager._last_backup -= timedelta(hours=2)
+    data_manager.save_tasks(make_tasks(5))
+    assert [len(data_manager.backups.restore(i)) for i in data_manager.backups.snapshot_ids()] == [3, 5]
+    assert TaskDataManager(str(tmp_path / "other.json"), backup_interval=None).save_tasks([]) is True
+    assert not (tmp_path / "other.json.backups").exists()
+
+def test_cli_backup_restore(tmp_path, capsys):
+    """測試命令列的 backup list / restore：還原前會先備份目前的資料。"""
+    data_file = str(tmp_path / "tasks.json")
+    TaskDataManager(data_file).save_tasks(make_tasks(2))
+    (tmp_path / "tasks.json").write_text("broken {", encoding='utf-8')
+    out = io.StringIO()
+    assert cli.main(["--data-file", data_file, "backup", "list"], out=out) == 0
+    [snapshot_id] = [line.split("\t")[0] for line in out.getvalue().splitlines()]
+    assert cli.main(["--data-file", data_file, "backup", "create"], out=out) == 1 # 損壞的資料檔不會被備份成空的快照
+    assert cli.main(["--data-file", data_file, "backup", "restore", snapshot_id], out=out) == 0
+    assert len(TaskDataManager(data_file).load_tasks()) == 2
+    assert TaskDataManager(data_file).backups.snapshot_ids() == [snapshot_id]
+    [corrupt] = [path for path in tmp_path.iterdir() if ".corrupt-" in path.name]
+    assert corrupt.read_text(encoding='utf-8') == "broken {"
+    assert cli.main(["--data-file", data_file, "backup", "restore", "missing"], out=out) == 1
+    assert "not found" in capsys.readouterr().err
@@ -0,0 +1,35 @@
+# tests/test_benchmarks.py
+
+import json
+import os
+import subprocess
+import sys
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks')
+
+def run_script(name, *args):
+    return subprocess.run([sys.executable, os.path.join(BENCHMARKS_DIR, name), *args],
+                          capture_output=True, text=True, timeout=120)
+
+def test_dataset_is_reproducible(tmp_path):
+    """測試相同的任務數與種子產生相同的資料檔，且可以被 TaskDataManager 載入。"""
+    first, second = tmp_path / "a.json", tmp_path / "b.json"
+    assert run_script("dataset.py", "300", "-o", str(first)).returncode == 0
+    assert run_script("dataset.py", "300", "-o", str(second)).returncode == 0
+    assert first.read_bytes() == second.read_bytes()
+    tasks = json.loads(first.read_text(encoding='utf-8'))
+    assert [task['id'] for task in tasks] == list(range(300))
+    assert any("https://" in task['note'] for task in tasks)
+
+def test_run_benchmarks_writes_json_and_compares(tmp_path):
+    """測試效能測試輸出 JSON 結果，並能與基準比較。"""
+    output = tmp_path / "results.json"
+    result = run_script("run_benchmarks.py", "--sizes", "200", "--repeat", "1", "--no-excel", "--output", str(output))
+    assert result.returncode == 0, result.stderr
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert {"load_tasks", "save_tasks", "get_all_tasks_sorted[due_date]", "get_tasks_by_status[Pending]"} <= set(report['results']['200'])
+
+    result = run_script("run_benchmarks.py", "--sizes", "200", "--repeat", "1", "--no-excel",
+                        "--baseline", str(output), "--threshold", "1000", "--fail-on-regression")
+    assert result.returncode == 0, result.stderr
+    assert "0 regression(s)" in result.stdout
@@ -0,0 +1,33 @@
+# tests/test_calendar_view.py
+
+from datetime import date
+from record_calender.calendar_view import month_grid_dates, week_dates, shift_month, summarize_day, MONTH_GRID_DAYS
+
+def test_month_grid_starts_on_monday_and_covers_month():
+    """測試月檢視的日期從週一開始，固定 42 格並涵蓋整個月份。"""
+    dates = month_grid_dates(2025, 6)
+    assert len(dates) == MONTH_GRID_DAYS
+    assert dates[0] == date(2025, 5, 26)
+    assert dates[0].weekday() == 0
+    assert date(2025, 6, 1) in dates and date(2025, 6, 30) in dates
+
+def test_week_dates_and_shift_month():
+    """測試週檢視的日期與跨年的月份平移。"""
+    assert week_dates(date(2025, 6, 15)) == [date(2025, 6, day) for day in range(9, 16)]
+    assert shift_month(2025, 12, 1) == (2026, 1)
+    assert shift_month(2025, 1, -1) == (2024, 12)
+    assert shift_month(2025, 6, -18) == (2023, 12)
+
+def test_summarize_day_marks_overdue_open_tasks():
+    """測試只有過去日期中仍未完成的任務會被標示為逾期。"""
+    tasks = [
+        {"description": "A", "status": "Completed"},
+        {"description": "B", "status": "Pending"},
+        {"description": "C", "status": "Pending"},
+        {"description": "D", "status": "Cancelled"},
+    ]
+    today = date(2025, 6, 15)
+    assert summarize_day(tasks, date(2025, 6, 14), today) == (4, ["A", "B", "C"], True)
+    assert summarize_day(tasks, today, today)[2] is False
+    assert summarize_day(tasks[:1], date(2025, 6, 1), today)[2] is False
+    assert summarize_day([], date(2025, 6, 1), today) == (0, [], False)
@@ -0,0 +1,116 @@
+# tests/test_cli.py
+
+import io
+import json
+import subprocess
+import sys
+import pytest
+from unittest.mock import patch
+from record_calender import cli
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager
+
+@pytest.fixture
+def data_file(tmp_path):
+    return str(tmp_path / "tasks.json")
+
+def run(data_file, *args):
+    out = io.StringIO()
+    code = cli.main(["--data-file", data_file, *args], out=out)
+    return code, out.getvalue()
+
+def test_add_list_update_delete(data_file):
+    """測試新增、列出、修改與刪除，並寫入資料檔。"""
+    assert run(data_file, "add", "買牛奶", "--due", "2025-05-25") == (0, "0\n")
+    assert run(data_file, "add", "Write\treport", "--note", "https://example.com") == (0, "1\n")
+
+    code, output = run(data_file, "list", "--sort", "id")
+    assert code == 0
+    assert output.splitlines() == ["0\tPending\t2025-05-25\t買牛奶", "1\tPending\t\tWrite report"]
+
+    assert run(data_file, "update", "1", "--status", "Completed")[0] == 0
+    assert run(data_file, "list", "--status", "Pending")[1] == "0\tPending\t2025-05-25\t買牛奶\n"
+    assert run(data_file, "delete", "0")[0] == 0
+    tasks = TaskManager(TaskDataManager(data_file)).get_tasks()
+    assert [(task['id'], task['status']) for task in tasks] == [(1, "Completed")]
+
+def test_list_filters_and_json_output(data_file):
+    """測試依到期日篩選、隱藏 On hold、限制筆數與 JSON 輸出。"""
+    run(data_file, "add", "A", "--due", "2025-05-25")
+    run(data_file, "add", "B", "--due", "2025-05-26")
+    run(data_file, "add", "C", "--due", "2025-05-25")
+    run(data_file, "update", "2", "--status", "On hold")
+
+    code, output = run(data_file, "list", "--due-on", "2025-05-25", "--sort", "id", "--format", "json")
+    assert code == 0
+    assert [task['description'] for task in json.loads(output)] == ["A", "C"]
+    output = run(data_file, "list", "--hide-on-hold", "--sort", "id", "--desc", "--format", "jsonl")[1]
+    assert [json.loads(line)['id'] for line in output.splitlines()] == [1, 0]
+    assert len(run(data_file, "list", "--limit", "2")[1].splitlines()) == 2
+
+def test_search(data_file):
+    """測試搜尋內容與備註（不區分大小寫）。"""
+    run(data_file, "add", "Buy milk")
+    run(data_file, "add", "Read", "--note", "MILK tea")
+    run(data_file, "add", "Other")
+    output = run(data_file, "search", "milk", "--sort", "id")[1]
+    assert [line.split("\t")[0] for line in output.splitlines()] == ["0", "1"]
+
+def test_errors_return_non_zero(data_file, capsys):
+    """測試無效的輸入回傳 1 並輸出錯誤訊息。"""
+    assert run(data_file, "add", "Bad date", "--due", "2025/05/25")[0] == 1
+    assert run(data_file, "update", "5", "--status", "Completed")[0] == 1
+    assert run(data_file, "delete", "5")[0] == 1
+    assert "5" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        run(data_file, "list", "--status", "Unknown")
+
+def test_delete_many_saves_once(data_file, capsys):
+    """測試一次刪除多個 ID 只寫一次檔，寫檔失敗時回傳 1。"""
+    for description in "ABCD":
+        run(data_file, "add", description)
+    with patch.object(TaskDataManager, 'save_tasks', autospec=True, side_effect=TaskDataManager.save_tasks) as save_tasks:
+        assert run(data_file, "delete", "0", "2", "3")[0] == 0
+    assert save_tasks.call_count == 1
+    assert [task['id'] for task in TaskManager(TaskDataManager(data_file)).get_tasks()] == [1]
+
+    with patch.object(TaskDataManager, 'save_tasks', return_value=(False, OSError("disk full"))):
+        assert run(data_file, "delete", "1")[0] == 1
+    assert "disk full" in capsys.readouterr().err
+    assert [task['id'] for task in TaskManager(TaskDataManager(data_file)).get_tasks()] == [1]
+
+def test_failed_save_returns_non_zero(tmp_path, data_file, capsys):
+    """測試 add、update 與 import 儲存失敗時回傳 1，不輸出新任務的 ID。"""
+    run(data_file, "add", "A")
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(json.dumps({'description': "B"}), encoding='utf-8')
+    with patch.object(TaskDataManager, 'save_tasks', return_value=(False, OSError("disk full"))):
+        assert run(data_file, "add", "C") == (1, "")
+        assert run(data_file, "update", "0", "--status", "Completed")[0] == 1
+        assert run(data_file, "import", str(path))[0] == 1
+    assert capsys.readouterr().err.count("disk full") == 3
+    assert [task['description'] for task in TaskManager(TaskDataManager(data_file)).get_tasks()] == ["A"]
+    missing_dir = str(tmp_path / "missing" / "tasks.json")
+    assert run(missing_dir, "add", "D") == (1, "")
+
+def test_export_and_import(tmp_path, data_file):
+    """測試匯出與匯入沿用 task_io。"""
+    run(data_file, "add", "A", "--due", "2025-05-25")
+    path = str(tmp_path / "tasks.jsonl")
+    assert run(data_file, "export", path)[0] == 0
+    target = str(tmp_path / "target.json")
+    assert run(target, "import", path)[0] == 0
+    assert [task['description'] for task in TaskManager(TaskDataManager(target)).get_tasks()] == ["A"]
+
+def test_cli_does_not_import_tk(data_file):
+    """測試命令列不會載入 tkinter 或其他 GUI 套件。"""
+    code = (
+        "import sys\n"
+        "from record_calender import cli, utils\n"
+        f"cli.main(['--data-file', {data_file!r}, 'add', 'x'])\n"
+        f"cli.main(['--data-file', {data_file!r}, 'list', '--status', 'Pending'])\n"
+        "loaded = [name for name in ('tkinter', 'customtkinter', 'tkcalendar', 'PIL') if name in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
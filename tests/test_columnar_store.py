@@ -0,0 +1,90 @@
+# tests/test_columnar_store.py
+
+import json
+import pytest
+from datetime import date
+from unittest.mock import Mock
+from record_calender.columnar_store import ColumnarTaskStore, TaskRow, measure_memory_per_task
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager
+
+SAMPLE_TASKS = [
+    {"id": 0, "description": "Task 1", "due_date": "2025-06-01", "status": "Pending", "note": "", "creation_time": "2025-05-20 10:00:00", "image_path": None},
+    {"id": 1, "description": "Task 2", "due_date": None, "status": "Completed", "note": "https://example.com", "creation_time": None, "image_path": "a.png"},
+    {"id": 5, "description": "Task 3", "due_date": "not-a-date", "status": "Weird", "note": "x", "creation_time": "yesterday", "image_path": None, "next_handler": "Alice"},
+]
+
+@pytest.fixture
+def store():
+    return ColumnarTaskStore([dict(task) for task in SAMPLE_TASKS])
+
+def test_rows_round_trip(store):
+    """測試欄位式儲存能無損還原每一列，包括無法解析的原始值與額外欄位。"""
+    assert len(store) == 3
+    assert store.to_dicts() == SAMPLE_TASKS
+    assert isinstance(store[0], TaskRow)
+    assert store[2]['next_handler'] == "Alice"
+
+def test_row_view_updates_columns(store):
+    """測試透過列視圖寫入會更新底層欄位。"""
+    row = store[0]
+    row['status'] = "In progress"
+    row['due_date'] = "2025-07-04"
+    assert store[0]['status'] == "In progress"
+    assert store[0]['due_date'] == "2025-07-04"
+    assert store._due[0] == date(2025, 7, 4).toordinal()
+
+def test_row_view_survives_deletion(store):
+    """測試刪除前面的列後，既有的列視圖仍指向原本的任務。"""
+    last = store[2]
+    del store[0]
+    assert len(store) == 2
+    assert last['id'] == 5
+    removed = store[0]
+    del store[0]
+    with pytest.raises(KeyError):
+        removed['id']
+
+def test_insert_in_middle_matches_list(store):
+    """測試在任意位置插入與 list.insert 的結果相同，既有的列視圖仍指向原本的任務。"""
+    last = store[2]
+    expected = [dict(task) for task in SAMPLE_TASKS]
+    for index, task_id in ((0, 10), (2, 11), (-1, 12), (99, 13), (-99, 14)):
+        task = {"id": task_id, "description": f"Inserted {task_id}", "status": "Pending"}
+        store.insert(index, dict(task))
+        expected.insert(index, dict(task, due_date=None, note='', creation_time=None, image_path=None))
+        assert [row['id'] for row in store] == [task['id'] for task in expected]
+    assert store.to_dicts() == [{field: task[field] for field in store[i]} for i, task in enumerate(expected)]
+    assert last['id'] == 5 and last['next_handler'] == "Alice"
+    del store[3]
+    assert last['id'] == 5
+
+def test_task_manager_with_columnar_storage(tmp_path):
+    """測試 TaskManager 使用欄位式儲存時的 CRUD 與儲存。"""
+    data_file = tmp_path / "tasks.json"
+    data_file.write_text(json.dumps(SAMPLE_TASKS[:2]), encoding='utf-8')
+    manager = TaskManager(TaskDataManager(data_file=str(data_file)), storage='columnar')
+
+    task = manager.add_task("New task", "2025-08-01", "note")
+    assert task['id'] == 2
+    assert manager.update_task(task['id'], status="Completed")['status'] == "Completed"
+    assert len(manager.get_tasks_by_status("Completed")) == 2
+    assert manager.delete_task(0) is True
+    assert [t['id'] for t in manager.get_all_tasks_sorted('due_date')] == [2, 1]
+
+    saved = json.loads(data_file.read_text(encoding='utf-8'))
+    assert [t['id'] for t in saved] == [1, 2]
+    assert saved[1]['due_date'] == "2025-08-01"
+
+def test_task_manager_invalid_storage():
+    """測試未知的儲存方式會拋出錯誤。"""
+    mock_dm = Mock(spec=TaskDataManager)
+    mock_dm.load_tasks.return_value = []
+    with pytest.raises(ValueError, match="Invalid storage"):
+        TaskManager(mock_dm, storage='sqlite')
+
+def test_measure_memory_per_task():
+    """測試記憶體量測回報欄位式儲存比 list-of-dict 更省記憶體。"""
+    report = measure_memory_per_task(20000)
+    assert report['tasks'] == 20000
+    assert report['columnar_bytes_per_task'] < report['dict_bytes_per_task']
@@ -3,6 +3,8 @@
 import pytest
 import os
 import json
+import glob
+import shutil
 from record_calender.data_manager import TaskDataManager
 
 # 測試用檔案路徑，確保不影響真實數據
@@ -17,6 +19,9 @@ def temp_data_manager():
     yield manager
     if os.path.exists(TEST_DATA_FILE):
         os.remove(TEST_DATA_FILE)
+    shutil.rmtree(f"{TEST_DATA_FILE}.backups", ignore_errors=True)
+    for path in glob.glob(f"{TEST_DATA_FILE}.corrupt-*"):
+        os.remove(path)
 
 def test_load_tasks_empty_file(temp_data_manager):
     """測試從空檔案載入任務。"""
@@ -50,6 +55,10 @@ def test_load_tasks_corrupted_file(temp_data_manager):
     tasks = temp_data_manager.load_tasks()
     assert tasks == [] # 應該返回空列表
     assert temp_data_manager.get_next_id() == 0
+    # 損壞的檔案被保留下來，之後的儲存不會讓資料完全消失
+    [corrupt_file] = glob.glob(f"{TEST_DATA_FILE}.corrupt-*")
+    with open(corrupt_file, 'r', encoding='utf-8') as f:
+        assert f.read() == "this is not json {"
 
 def test_get_next_id(temp_data_manager):
     """測試獲取下一個 ID 的邏輯。"""
@@ -0,0 +1,69 @@
+# tests/test_exporter.py
+
+import threading
+import pytest
+from unittest.mock import Mock
+from record_calender.exporter import (ExportCancelled, ExportJob, EXCEL_HEADERS, export_tasks_to_excel,
+                                      iter_tasks, task_export_row)
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager
+
+TASKS = [
+    {'id': 1, 'description': "Task A", 'due_date': "2025-05-25", 'status': "Pending", 'note': "", 'creation_time': "2025-05-20 10:00:00"},
+    {'id': 2, 'description': "Task B", 'due_date': None, 'status': "Weird", 'note': None, 'creation_time': None},
+    {'id': 3, 'description': "Task C", 'due_date': "2025-05-21", 'status': "Completed", 'note': "bell\x07", 'creation_time': "2025-05-20 11:00:00"},
+]
+
+@pytest.fixture
+def task_manager():
+    mock_dm = Mock(spec=TaskDataManager)
+    mock_dm.load_tasks.return_value = [dict(task) for task in TASKS]
+    return TaskManager(mock_dm)
+
+def test_task_export_row():
+    """測試匯出列的欄位順序與空值、未知狀態的處理。"""
+    assert task_export_row(TASKS[0]) == [1, "Task A", "2025-05-25", "Pending", "", "2025-05-20 10:00:00"]
+    assert task_export_row(TASKS[1]) == [2, "Task B", "", "未知狀態", "", ""]
+    assert len(task_export_row(TASKS[0])) == len(EXCEL_HEADERS)
+
+def test_iter_tasks_follows_given_order(task_manager):
+    """測試只匯出目前分頁時依給定的 ID 順序產生任務，並略過已刪除的任務。"""
+    assert [task['id'] for task in iter_tasks(task_manager)] == [1, 2, 3]
+    ids = task_manager.query_task_ids(sort_column='due_date')
+    assert [task['id'] for task in iter_tasks(task_manager, ids + [99])] == ids
+
+def test_export_job_reports_result_and_cancel():
+    """測試背景匯出工作回報進度、結果與取消。"""
+    job = ExportJob(lambda progress, cancel_event: progress(5) or 5).start()
+    job.join(5)
+    assert job.is_finished() and job.result == 5 and job.done == 5 and job.error is None
+
+    started = threading.Event()
+    def slow_export(progress, cancel_event):
+        started.set()
+        cancel_event.wait(5)
+        raise ExportCancelled()
+    job = ExportJob(slow_export).start()
+    started.wait(5)
+    job.cancel()
+    job.join(5)
+    assert job.cancelled
+
+def test_export_to_excel_streams_rows(tmp_path, task_manager):
+    """測試以 write-only 模式寫出的檔案內容，以及取消時不會留下檔案。"""
+    openpyxl = pytest.importorskip("openpyxl")
+    filepath = tmp_path / "tasks.xlsx"
+    progress = []
+    count = export_tasks_to_excel(iter_tasks(task_manager), str(filepath), progress.append, progress_every=2)
+    assert count == 3 and progress == [2, 3]
+    workbook = openpyxl.load_workbook(filepath, read_only=True)
+    rows = list(workbook.active.iter_rows(values_only=True))
+    workbook.close()
+    assert list(rows[0]) == EXCEL_HEADERS
+    assert rows[3][4] == "bell" # 非法控制字元已移除
+
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(ExportCancelled):
+        export_tasks_to_excel(iter_tasks(task_manager), str(tmp_path / "cancelled.xlsx"), cancel_event=cancel_event)
+    assert list(tmp_path.iterdir()) == [filepath]
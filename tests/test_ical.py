@@ -0,0 +1,111 @@
+# tests/test_ical.py
+
+import io
+import pytest
+from record_calender import ical, task_io
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager
+
+def test_fold_and_unfold_round_trip():
+    """測試折行不超過 75 個位元組、不切斷多位元組字元，且可還原。"""
+    line = "DESCRIPTION:" + "中文備註與 English text, mixed; " * 20
+    folded = ical.fold_line(line)
+    physical = folded.split("\r\n")[:-1]
+    assert len(physical) > 1
+    assert all(len(part.encode('utf-8')) <= 75 for part in physical)
+    assert all(part.startswith(" ") for part in physical[1:])
+    assert list(ical.unfold_lines(io.StringIO(folded, newline=''))) == [(1, line)]
+    assert ical.fold_line("SUMMARY:short") == "SUMMARY:short\r\n"
+
+def test_escape_round_trip():
+    text = "a,b;c\\d\nsecond line"
+    assert ical.escape_text(text) == r"a\,b\;c\\d\nsecond line"
+    assert ical.unescape_text(ical.escape_text(text)) == text
+
+def test_parse_content_line_with_quoted_params():
+    name, params, value = ical.parse_content_line('dtstart;TZID="Asia/Taipei:x";VALUE=DATE-TIME:20250525T100000')
+    assert (name, params, value) == ("DTSTART", {'TZID': "Asia/Taipei:x", 'VALUE': "DATE-TIME"}, "20250525T100000")
+
+@pytest.fixture
+def task_manager(tmp_path):
+    task_manager = TaskManager(TaskDataManager(str(tmp_path / "tasks.json")))
+    task_manager.add_task("Task A", "2025-05-25", "note, with; special\nchars")
+    task_manager.add_task("No due date")
+    task_manager.add_task("On hold task", "2025-06-01")
+    task_manager.update_task(2, status="On hold")
+    return task_manager
+
+@pytest.mark.parametrize("component", [ical.VTODO, ical.VEVENT])
+def test_export_import_round_trip(tmp_path, task_manager, component):
+    """測試只匯出有到期日的任務，匯入後內容與狀態相同，再次匯入時依 UID 略過。"""
+    path = str(tmp_path / "tasks.ics")
+    assert task_io.export_tasks(task_manager, path, component=component) == 2
+    content = open(path, encoding='utf-8', newline='').read()
+    assert content.startswith("BEGIN:VCALENDAR\r\n") and content.count(f"BEGIN:{component}") == 2
+
+    target = TaskManager(TaskDataManager(str(tmp_path / "target.json")))
+    assert task_io.import_tasks(target, path) == (2, 0, [])
+    imported = target.get_tasks()
+    originals = [task_manager.get_task_by_id(0), task_manager.get_task_by_id(2)]
+    for original, task in zip(originals, imported):
+        for field in ('description', 'due_date', 'status', 'note', 'creation_time'):
+            assert task[field] == original[field]
+        assert task['uid'] == ical.task_uid(original)
+
+    assert task_io.import_tasks(target, path) == (0, 2, []) # 重複的 UID 只是略過，不算錯誤
+    # 匯出原本就是自己的任務，也不會重複匯入
+    assert task_io.import_tasks(task_manager, path)[:2] == (0, 2)
+
+def test_reimport_is_not_an_error(tmp_path, task_manager, capsys):
+    """測試再次匯入同一個 .ics 時，略過的重複資料另外計數，命令列以 0 結束。"""
+    path = str(tmp_path / "tasks.ics")
+    task_io.export_tasks(task_manager, path)
+    target = str(tmp_path / "target.json")
+    assert task_io.main(["import", path, "--data-file", target]) == 0
+    assert task_io.main(["import", path, "--data-file", target]) == 0
+    assert capsys.readouterr().out.splitlines()[-1] == "已匯入 0 個待辦事項，略過 2 筆重複的資料，0 筆資料有錯誤"
+
+ICS = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VTODO\r
+UID:a@example.com\r
+SUMMARY:Folded summary th\r
+ at continues\r
+DUE;TZID=Asia/Taipei:20250525T100000\r
+STATUS:IN-PROCESS\r
+CREATED:20250101T080000Z\r
+BEGIN:VALARM\r
+DESCRIPTION:alarm text\r
+END:VALARM\r
+END:VTODO\r
+BEGIN:VEVENT\r
+UID:b@example.com\r
+SUMMARY:Meeting\r
+DTSTART:20250601T090000Z\r
+STATUS:CANCELLED\r
+END:VEVENT\r
+BEGIN:VTODO\r
+UID:a@example.com\r
+SUMMARY:Duplicate in file\r
+END:VTODO\r
+BEGIN:VTODO\r
+UID:c@example.com\r
+DUE;VALUE=DATE:20250601\r
+END:VTODO\r
+BEGIN:VJOURNAL\r
+SUMMARY:ignored\r
+END:VJOURNAL\r
+END:VCALENDAR\r
+"""
+
+def test_import_foreign_calendar(tmp_path):
+    """測試匯入其他行事曆程式的檔案：折行、時區日期、狀態對應、巢狀元件、檔案內重複與缺少標題。"""
+    path = tmp_path / "other.ics"
+    path.write_bytes(ICS.encode('utf-8'))
+    task_manager = TaskManager(TaskDataManager(str(tmp_path / "tasks.json")))
+    assert task_io.import_tasks(task_manager, str(path)) == (2, 1, [(24, "Task description cannot be empty.")])
+    todo, event = task_manager.get_tasks()
+    assert todo['description'] == "Folded summary that continues"
+    assert (todo['due_date'], todo['status'], todo['note']) == ("2025-05-25", "In progress", '')
+    assert todo['creation_time'] == "2025-01-01 08:00:00"
+    assert (event['description'], event['due_date'], event['status']) == ("Meeting", "2025-06-01", "Cancelled")
@@ -0,0 +1,28 @@
+# tests/test_main.py
+
+from unittest.mock import Mock
+from record_calender.data_manager import TaskDataManager
+from record_calender.main import StartupTimer, load_task_manager
+
+def test_startup_timer_reports_once():
+    """測試啟動計時器記錄各階段並只輸出一次摘要。"""
+    output = Mock()
+    timer = StartupTimer(output=output)
+    timer.mark("import")
+    timer.record("load", 0.25)
+    timer.finish()
+    timer.finish()
+    lines = [call.args[0] for call in output.call_args_list]
+    assert lines[0] == "啟動時間:"
+    assert any(line.strip().startswith("import") for line in lines)
+    assert any("250.0 ms" in line for line in lines)
+    assert timer.finished
+
+def test_load_task_manager_records_load_time():
+    """測試背景載入函數建立 TaskManager 並記錄載入耗時。"""
+    mock_dm = Mock(spec=TaskDataManager)
+    mock_dm.load_tasks.return_value = [{"id": 0, "description": "A", "status": "Pending"}]
+    timer = StartupTimer(output=Mock())
+    task_manager = load_task_manager(mock_dm, timer)
+    assert task_manager.get_task_by_id(0)['description'] == "A"
+    assert [name for name, _ in timer.durations] == ["load"]
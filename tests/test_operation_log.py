@@ -0,0 +1,45 @@
+# tests/test_operation_log.py
+
+import pytest
+from record_calender.operation_log import OperationLog
+
+def test_ring_buffer_keeps_latest_entries():
+    """測試超過容量時只保留最新的項目。"""
+    log = OperationLog(capacity=3)
+    for i in range(5):
+        log.log(f"op {i}")
+    assert len(log) == 3
+    assert log.total_logged == 5
+    assert [entry.split(" - ")[1] for entry in log.entries()] == ["op 2", "op 3", "op 4"]
+
+def test_pages_cover_buffer_in_order():
+    """測試分頁讀取由舊到新，且頁碼超出範圍時取最接近的一頁。"""
+    log = OperationLog(capacity=100)
+    for i in range(25):
+        log.log(f"op {i}")
+    assert log.page_count(10) == 3
+    pages = [log.get_page(page, 10) for page in range(3)]
+    assert [entry.split(" - ")[1] for page in pages for entry in page] == [f"op {i}" for i in range(25)]
+    assert log.get_page(99, 10) == pages[2]
+    assert log.get_page(-1, 10) == pages[0]
+    assert OperationLog(capacity=5).get_page(0, 10) == []
+
+def test_writes_rotated_log_file_in_background(tmp_path):
+    """測試背景寫入日誌檔，並在超過大小時輪替。"""
+    log_file = tmp_path / "operations.log"
+    log = OperationLog(capacity=10, log_file=str(log_file), max_bytes=200, backup_count=2)
+    for i in range(30):
+        log.log(f"operation number {i}")
+    log.close()
+    log.log("after close") # 關閉後仍可記錄到記憶體，不會寫檔
+
+    assert (tmp_path / "operations.log.1").exists()
+    written = "".join(path.read_text(encoding='utf-8') for path in sorted(tmp_path.iterdir()))
+    assert "operation number 29" in written
+    assert "after close" not in written
+    assert log.entries()[-1].endswith("after close")
+
+def test_invalid_capacity():
+    """測試容量必須為正數。"""
+    with pytest.raises(ValueError, match="capacity"):
+        OperationLog(capacity=0)
@@ -0,0 +1,70 @@
+# tests/test_perf.py
+
+import json
+import pytest
+from record_calender import perf
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager
+
+@pytest.fixture
+def enabled():
+    """每個測試開始時清除統計並啟用計時，結束時恢復原本的狀態"""
+    was_enabled = perf.is_enabled()
+    perf.reset()
+    perf.enable()
+    yield
+    perf.reset()
+    if not was_enabled:
+        perf.disable()
+
+def test_disabled_records_nothing(enabled):
+    """測試關閉時 span / timed / record 都不記錄，span 回傳共用的空物件。"""
+    perf.disable()
+    assert perf.span("a") is perf.span("b")
+    with perf.span("a"):
+        pass
+    assert perf.timed("b")(lambda x: x * 2)(21) == 42
+    perf.record("c", 1.0)
+    assert perf.stats() == {}
+
+def test_summary_percentiles_over_rolling_window(enabled):
+    """測試次數、p50、p95、最大值；百分位數只看最近 WINDOW 次。"""
+    for ms in range(1, 101):
+        perf.record("span", ms / 1000)
+    summary = perf.stats()["span"]
+    assert summary['count'] == 100
+    assert (summary['p50_ms'], summary['p95_ms'], summary['max_ms']) == pytest.approx((51, 96, 100))
+
+    stats = perf.SpanStats(window=3)
+    for seconds in (9.0, 0.001, 0.002, 0.003):
+        stats.add(seconds)
+    summary = stats.summary()
+    assert summary['count'] == 4 and summary['max_ms'] == pytest.approx(3) # 9 秒已經滑出視窗
+    assert summary['total_ms'] == pytest.approx(9006)
+
+def test_timed_records_exceptions_and_hot_paths(enabled, tmp_path):
+    """測試被計時的函式拋出例外時仍會記錄；載入、儲存、排序與查詢都有計時。"""
+    @perf.timed("failing")
+    def failing():
+        raise ValueError("boom")
+    with pytest.raises(ValueError):
+        failing()
+    task_manager = TaskManager(TaskDataManager(str(tmp_path / "tasks.json"), backup_interval=None))
+    task_manager.add_task("A", "2025-06-01")
+    task_manager.get_all_tasks_sorted('due_date')
+    task_manager.query_tasks('Pending')
+    names = set(perf.stats())
+    assert {"failing", "TaskDataManager.load_tasks", "TaskDataManager.save_tasks", "TaskManager.sort",
+            "TaskManager.get_all_tasks_sorted", "TaskManager.query_tasks"} <= names
+    assert "TaskManager.sort" in perf.format_table()
+
+def test_dump_json(enabled, tmp_path):
+    """測試匯出的 JSON 包含執行環境與各區段的統計。"""
+    with perf.span("populate"):
+        pass
+    path = tmp_path / "perf.json"
+    perf.dump(str(path))
+    report = json.loads(path.read_text(encoding='utf-8'))
+    assert report['enabled'] is True
+    assert report['spans']['populate']['count'] == 1
+    assert set(report['spans']['populate']) == {'count', 'total_ms', 'p50_ms', 'p95_ms', 'max_ms', 'last_ms'}
@@ -0,0 +1,119 @@
+# tests/test_reminders.py
+
+import pytest
+from datetime import datetime, date, timedelta
+from record_calender.reminders import ReminderScheduler, DUE_TODAY, DUE_SOON, MAX_TIMER_MS
+
+class FakeTimer:
+    """模擬 Tk 的 after/after_cancel，記錄目前掛著的計時器。"""
+
+    def __init__(self):
+        self.pending = {}
+        self.armed = 0
+        self._next_id = 0
+
+    def after(self, delay_ms, callback):
+        self._next_id += 1
+        self.armed += 1
+        self.pending[self._next_id] = (delay_ms, callback)
+        return self._next_id
+
+    def after_cancel(self, handle):
+        self.pending.pop(handle, None)
+
+    def fire(self):
+        (handle, (_, callback)), = self.pending.items()
+        del self.pending[handle]
+        callback()
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+DAY = date(2025, 5, 20)
+
+@pytest.fixture
+def setup():
+    timer = FakeTimer()
+    clock = Clock(datetime(2025, 5, 20, 8, 0))
+    fired = []
+    scheduler = ReminderScheduler(timer.after, timer.after_cancel,
+                                  lambda task_id, kind, fire_time: fired.append((task_id, kind)), clock=clock)
+    return scheduler, timer, clock, fired
+
+def test_single_timer_targets_earliest_reminder(setup):
+    """測試只會掛一個計時器，且對準最早的提醒。"""
+    scheduler, timer, clock, fired = setup
+    scheduler.load([(1, (DAY + timedelta(days=1)).toordinal(), "Pending"), (2, DAY.toordinal(), "Pending")])
+    assert len(scheduler) == 4
+    assert len(timer.pending) == 1
+    assert scheduler.next_fire_time() == datetime(2025, 5, 20, 9, 0)
+    (delay, _), = timer.pending.values()
+    assert delay == 60 * 60 * 1000
+
+    clock.now = datetime(2025, 5, 20, 9, 0)
+    timer.fire()
+    assert fired == [(2, DUE_TODAY)]
+    assert scheduler.next_fire_time() == datetime(2025, 5, 20, 17, 0)
+    assert len(timer.pending) == 1
+
+def test_past_and_closed_tasks_are_not_scheduled(setup):
+    """測試已過的提醒時間、已完成/取消與沒有到期日的任務不會排程。"""
+    scheduler, timer, clock, fired = setup
+    clock.now = datetime(2025, 5, 20, 12, 0)
+    scheduler.load([(1, DAY.toordinal(), "Pending"), (2, DAY.toordinal(), "Completed"),
+                    (3, None, "Pending"), (4, (DAY - timedelta(days=1)).toordinal(), "Pending")])
+    assert len(scheduler) == 1
+    assert scheduler.next_fire_time() == datetime(2025, 5, 20, 17, 0)
+
+def test_updated_and_deleted_tasks_use_lazy_deletion(setup):
+    """測試修改或刪除任務後，舊的提醒不會觸發，計時器會重新對準。"""
+    scheduler, timer, clock, fired = setup
+    scheduler.load([(1, DAY.toordinal(), "Pending"), (2, (DAY + timedelta(days=2)).toordinal(), "Pending")])
+    scheduler.set_task(1, (DAY + timedelta(days=1)).toordinal(), "Pending") # 延後一天
+    assert len(scheduler) == 4
+    assert scheduler.next_fire_time() == datetime(2025, 5, 21, 9, 0)
+    scheduler.set_task(1, (DAY + timedelta(days=1)).toordinal(), "Completed")
+    assert scheduler.next_fire_time() == datetime(2025, 5, 22, 9, 0)
+    scheduler.remove_task(2)
+    assert len(scheduler) == 0
+    assert scheduler.next_fire_time() is None
+    assert timer.pending == {}
+
+    clock.now = datetime(2025, 5, 23)
+    scheduler.set_task(3, (DAY + timedelta(days=3)).toordinal(), "Pending")
+    clock.now = datetime(2025, 5, 23, 18, 0)
+    timer.fire()
+    assert fired == [(3, DUE_TODAY), (3, DUE_SOON)] # 錯過的提醒在下一次觸發時一起送出
+    assert len(scheduler) == 0
+
+def test_unchanged_earliest_reminder_keeps_timer(setup):
+    """測試新增較晚的提醒時不會重新設定計時器。"""
+    scheduler, timer, clock, fired = setup
+    scheduler.load([(1, DAY.toordinal(), "Pending")])
+    armed = timer.armed
+    for task_id in range(2, 50):
+        scheduler.set_task(task_id, (DAY + timedelta(days=task_id)).toordinal(), "Pending")
+    assert timer.armed == armed
+
+def test_long_delays_are_split(setup):
+    """測試很遠的提醒不會超過計時器的最長等待時間，提前醒來時只會重新掛上計時器。"""
+    scheduler, timer, clock, fired = setup
+    scheduler.set_task(1, (DAY + timedelta(days=60)).toordinal(), "Pending")
+    (delay, _), = timer.pending.values()
+    assert delay == MAX_TIMER_MS
+    clock.now += timedelta(milliseconds=MAX_TIMER_MS)
+    timer.fire()
+    assert fired == []
+    assert len(timer.pending) == 1
+
+def test_stale_entries_are_compacted(setup):
+    """測試反覆修改同一個任務時，堆積不會無限成長。"""
+    scheduler, timer, clock, fired = setup
+    for i in range(1000):
+        scheduler.set_task(1, (DAY + timedelta(days=1 + i % 7)).toordinal(), "Pending")
+    assert len(scheduler) == 2
+    assert len(scheduler._heap) < 200
@@ -0,0 +1,65 @@
+# tests/test_rwlock.py
+
+import threading
+import time
+import pytest
+from record_calender.rwlock import ReadWriteLock
+
+def test_readers_share_and_writer_excludes():
+    """測試多個讀取者可同時持有，寫入者等待所有讀取者釋放。"""
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+    def reader():
+        with lock.read():
+            inside.wait() # 三個讀取者必須同時在鎖內才能通過
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert not any(thread.is_alive() for thread in threads)
+
+    events = []
+    lock.acquire_read()
+    writer = threading.Thread(target=lambda: (lock.acquire_write(), events.append('write'), lock.release_write()))
+    writer.start()
+    time.sleep(0.05)
+    assert events == [] # 讀取者還在，寫入者等待
+    lock.release_read()
+    writer.join(5)
+    assert events == ['write']
+
+def test_waiting_writer_blocks_new_readers_but_not_reentrant_ones():
+    """測試寫入者等待時新的讀取者排在後面，但已持有讀取鎖的執行緒可以重入。"""
+    lock = ReadWriteLock()
+    order = []
+    lock.acquire_read()
+    writer = threading.Thread(target=lambda: (lock.acquire_write(), order.append('writer'), lock.release_write()))
+    writer.start()
+    time.sleep(0.05)
+    reader = threading.Thread(target=lambda: (lock.acquire_read(), order.append('reader'), lock.release_read()))
+    reader.start()
+    time.sleep(0.05)
+    with lock.read(): # 重入不會死結
+        pass
+    assert order == []
+    lock.release_read()
+    writer.join(5)
+    reader.join(5)
+    assert order == ['writer', 'reader']
+
+def test_writer_reentry_and_no_upgrade():
+    """測試寫入者可以重入與讀取；讀取者不能升級為寫入者。"""
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write(), lock.read():
+            assert lock.is_write_locked()
+        assert lock.is_write_locked()
+    assert not lock.is_write_locked()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    with pytest.raises(RuntimeError):
+        lock.release_write()
+    with pytest.raises(RuntimeError):
+        lock.release_read()
@@ -0,0 +1,80 @@
+# tests/test_search_index.py
+
+import pytest
+from unittest.mock import Mock
+from record_calender import search_index
+from record_calender.search_index import SearchIndex
+from record_calender.task_manager import TaskManager
+from record_calender.data_manager import TaskDataManager
+
+TEXTS = {
+    1: "Weekly report\nhttps://example.com/report",
+    2: "週會 會議記錄",
+    3: "Buy milk",
+    4: "ab",
+}
+
+@pytest.fixture
+def index():
+    idx = SearchIndex()
+    idx.add_many(TEXTS.items())
+    return idx
+
+def search(idx, query, texts=TEXTS):
+    return idx.search(query, texts.get)
+
+def test_search_latin_and_cjk_substrings(index):
+    """測試中英文子字串搜尋，不區分大小寫。"""
+    assert search(index, "REPORT") == {1}
+    assert search(index, "example.com/rep") == {1}
+    assert search(index, "會議") == {2}
+    assert search(index, "會") == {2}
+    assert search(index, "b") == {3, 4}
+    assert search(index, "ab") == {4}
+    assert search(index, "nothing") == set()
+    assert search(index, "  ") == set()
+
+def test_candidates_are_verified(index):
+    """測試所有 gram 都出現但不連續時，驗證步驟會排除誤判。"""
+    texts = {**TEXTS, 5: "milk buy"}
+    index.add(5, texts[5])
+    assert search(index, "buy milk", texts) == {3}
+
+def test_incremental_add_and_remove(index):
+    """測試增量新增與移除。"""
+    index.add(3, TEXTS[3]) # 重複加入不會產生重複項目
+    index.remove(3, TEXTS[3])
+    assert search(index, "milk") == set()
+    index.add(3, "Buy oat milk")
+    assert search(index, "oat milk", {3: "Buy oat milk"}) == {3}
+
+def test_long_text_overflow(monkeypatch):
+    """測試超過索引長度上限的內容仍能被搜尋到。"""
+    monkeypatch.setattr(search_index, "MAX_INDEXED_CHARS", 10)
+    texts = {1: "short", 2: "0123456789 tail needle"}
+    idx = SearchIndex()
+    idx.add_many(texts.items())
+    assert search(idx, "needle", texts) == {2}
+    idx.remove(2, texts[2])
+    assert search(idx, "needle", texts) == set()
+
+def test_task_manager_search_stays_in_sync():
+    """測試 TaskManager 在新增、修改、刪除後搜尋結果保持正確。"""
+    mock_dm = Mock(spec=TaskDataManager)
+    mock_dm.load_tasks.return_value = [
+        {"id": 0, "description": "Deploy server", "due_date": None, "status": "Pending", "note": "", "creation_time": None, "image_path": None},
+    ]
+    manager = TaskManager(mock_dm)
+    mock_dm.get_next_id.side_effect = iter(range(1, 100))
+    assert manager.search_task_ids("deploy") == {0}
+
+    task = manager.add_task("Write report", note="需要預算")
+    assert manager.search_task_ids("預算") == {task['id']}
+    manager.update_task(task['id'], note="已完成")
+    assert manager.search_task_ids("預算") == set()
+    assert manager.search_task_ids("完成") == {task['id']}
+    manager.delete_task(0)
+    assert manager.search_task_ids("deploy") == set()
+
+    assert [t['id'] for t in manager.query_tasks(search="report")] == [task['id']]
+    assert manager.query_task_ids("Completed", search="report") == []
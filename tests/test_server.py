@@ -0,0 +1,140 @@
+# tests/test_server.py
+
+import asyncio
+import json
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager
+from record_calender.server import TaskServer
+
+def encode_request(method, path, data=None, close=False):
+    body = json.dumps(data).encode('utf-8') if data is not None else b''
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+    if close:
+        head += "Connection: close\r\n"
+    return head.encode('latin-1') + b"\r\n" + body
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    status = int(lines[0].split()[1])
+    length = next(int(line.split(':')[1]) for line in lines if line.lower().startswith('content-length'))
+    body = await reader.readexactly(length)
+    return status, json.loads(body) if body else None
+
+class Client:
+    """測試用的 keep-alive 客戶端"""
+
+    def __init__(self, port):
+        self.port = port
+
+    async def __aenter__(self):
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', self.port)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.writer.close()
+
+    async def request(self, method, path, data=None):
+        self.writer.write(encode_request(method, path, data))
+        return await read_response(self.reader)
+
+def run_with_server(tmp_path, scenario):
+    """啟動伺服器（隨機埠號）、執行 scenario(server)，結束後停止伺服器"""
+    data_file = str(tmp_path / "tasks.json")
+    async def main():
+        server = await TaskServer(TaskManager(TaskDataManager(data_file)), port=0).start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.stop()
+    return asyncio.run(main()), data_file
+
+def test_crud_and_persistence(tmp_path):
+    """測試新增、查詢、修改、刪除，以及回應後資料已寫入檔案。"""
+    async def scenario(server):
+        async with Client(server.port) as client:
+            status, task = await client.request("POST", "/tasks", {"description": "Buy milk", "due_date": "2025-05-25"})
+            assert status == 201 and task['id'] == 0
+            assert (await client.request("POST", "/tasks", {"description": "Read"}))[0] == 201
+            # 回應時已經儲存
+            assert [t['description'] for t in TaskManager(TaskDataManager(server.task_manager.data_manager.data_file)).get_tasks()] == ["Buy milk", "Read"]
+
+            status, task = await client.request("PATCH", "/tasks/1", {"status": "Completed"})
+            assert (status, task['status']) == (200, "Completed")
+            status, body = await client.request("GET", "/tasks?status=Pending")
+            assert [t['id'] for t in body['tasks']] == [0]
+            status, body = await client.request("GET", "/tasks?due_on=2025-05-25&sort=id&limit=1")
+            assert (body['total'], [t['id'] for t in body['tasks']]) == (1, [0])
+            assert (await client.request("GET", "/tasks/0"))[1]['description'] == "Buy milk"
+            assert (await client.request("DELETE", "/tasks/0")) == (200, {'deleted': 0})
+            assert (await client.request("GET", "/tasks/0"))[0] == 404
+    _, data_file = run_with_server(tmp_path, scenario)
+    tasks = TaskManager(TaskDataManager(data_file)).get_tasks()
+    assert [(t['id'], t['status']) for t in tasks] == [(1, "Completed")]
+
+def test_errors(tmp_path):
+    """測試無效的請求回傳 4xx，且連線仍可繼續使用。"""
+    async def scenario(server):
+        async with Client(server.port) as client:
+            assert (await client.request("POST", "/tasks", {"description": ""}))[0] == 400
+            assert (await client.request("POST", "/tasks", {"description": "x", "due_date": "2025/05/25"}))[0] == 400
+            assert (await client.request("POST", "/tasks", {"description": 5}))[0] == 400
+            assert (await client.request("PATCH", "/tasks/9", {"status": "Completed"}))[0] == 404
+            assert (await client.request("GET", "/tasks?status=Unknown"))[0] == 400
+            assert (await client.request("GET", "/tasks/abc"))[0] == 400
+            assert (await client.request("PUT", "/tasks"))[0] == 405
+            assert (await client.request("GET", "/unknown"))[0] == 404
+            assert (await client.request("GET", "/tasks"))[0] == 200
+    run_with_server(tmp_path, scenario)
+
+def test_pipelining_and_batched_saves(tmp_path):
+    """測試 pipelining：一次送出多個請求，回應依序返回；多個客戶端的寫入合併成少數幾次儲存。"""
+    async def scenario(server):
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        requests = [encode_request("POST", "/tasks", {"description": f"Task {i}"}) for i in range(20)]
+        requests.append(encode_request("GET", "/tasks?sort=id", close=True))
+        writer.write(b''.join(requests))
+        responses = [await read_response(reader) for _ in requests]
+        writer.close()
+        assert [body['id'] for _, body in responses[:20]] == list(range(20))
+        assert len(responses[-1][1]['tasks']) == 20
+
+        async def add_many(name):
+            async with Client(server.port) as client:
+                for i in range(10):
+                    assert (await client.request("POST", "/tasks", {"description": f"{name} {i}"}))[0] == 201
+        batches_before = server.batches
+        await asyncio.gather(*(add_many(f"client {n}") for n in range(10)))
+        assert len(server.task_manager.get_tasks()) == 120
+        assert server.batches - batches_before < 100
+    run_with_server(tmp_path, scenario)
+
+def test_long_poll_changes(tmp_path):
+    """測試長輪詢：等待中的請求在有變更時返回，since 之後的變更依序列出。"""
+    async def scenario(server):
+        async with Client(server.port) as poller, Client(server.port) as client:
+            assert (await poller.request("GET", "/changes?since=0&timeout=0"))[1] == {'version': 0, 'reset': False, 'changes': []}
+            poll = asyncio.create_task(poller.request("GET", "/changes?since=0&timeout=5"))
+            await asyncio.sleep(0.05)
+            assert not poll.done()
+            await client.request("POST", "/tasks", {"description": "New"})
+            status, body = await asyncio.wait_for(poll, 5)
+            assert body['version'] == 1
+            assert [(c['version'], c['event'], c['task']['description']) for c in body['changes']] == [(1, 'added', 'New')]
+
+            await client.request("PATCH", "/tasks/0", {"note": "n"})
+            await client.request("DELETE", "/tasks/0")
+            body = (await poller.request("GET", "/changes?since=1"))[1]
+            assert [c['event'] for c in body['changes']] == ['updated', 'deleted']
+            assert (await poller.request("GET", "/changes?since=99"))[1]['reset'] is True
+    run_with_server(tmp_path, scenario)
+
+def test_change_log_overflow_requests_reset(tmp_path):
+    """測試變更超過保留數量後，過舊的 since 會收到 reset。"""
+    data_file = str(tmp_path / "tasks.json")
+    server = TaskServer(TaskManager(TaskDataManager(data_file)), change_log_size=2)
+    server.version = 5
+    server._changes.extend([(4, 'added', {}), (5, 'added', {})])
+    assert server.changes_since(3) == ([{'version': 4, 'event': 'added', 'task': {}}, {'version': 5, 'event': 'added', 'task': {}}], False)
+    assert server.changes_since(2) == ([], True)
+    assert server.changes_since(5) == ([], False)
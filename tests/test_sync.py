@@ -0,0 +1,173 @@
+# tests/test_sync.py
+
+import io
+import json
+import os
+import pytest
+from unittest.mock import patch
+from record_calender import cli, sync
+from record_calender.data_manager import TaskDataManager
+
+def task(task_id, description, **fields):
+    data = {'id': task_id, 'description': description, 'due_date': None, 'status': 'Pending', 'note': '',
+            'creation_time': f"2025-05-20 12:00:{task_id % 60:02d}", 'image_path': None}
+    data.update(fields)
+    return data
+
+def write(path, tasks):
+    path.write_text(json.dumps(tasks, ensure_ascii=False), encoding='utf-8')
+
+def read(path):
+    return {item['id']: item for item in json.loads(path.read_text(encoding='utf-8'))}
+
+@pytest.fixture
+def files(tmp_path):
+    local, remote = tmp_path / "laptop.json", tmp_path / "desktop.json"
+    tasks = [task(0, "A"), task(1, "B"), task(2, "C"), task(3, "D")]
+    write(local, tasks)
+    write(remote, tasks)
+    sync.sync_files(str(local), str(remote)) # 建立基準
+    return local, remote
+
+def test_task_hash_ignores_field_order():
+    """測試雜湊與欄位順序無關，內容不同則雜湊不同。"""
+    assert sync.task_hash({'id': 1, 'description': "x"}) == sync.task_hash({'description': "x", 'id': 1})
+    assert sync.task_hash({'id': 1, 'description': "x"}) != sync.task_hash({'id': 1, 'description': "y"})
+    assert sync.changed_ids({1: 'a', 2: 'b', 3: 'c'}, {1: 'a', 2: 'x', 4: 'd'}) == {2, 3, 4}
+
+def test_non_conflicting_changes_flow_both_ways(files):
+    """測試兩邊各自的新增、修改、刪除都會同步到另一邊，而且只比較有變更的任務。"""
+    local, remote = files
+    tasks = read(local)
+    tasks[0]['status'] = "Completed"
+    del tasks[3]
+    write(local, list(tasks.values()))
+    tasks = read(remote)
+    tasks[1]['note'] = "from desktop"
+    tasks[7] = task(7, "New on desktop")
+    write(remote, list(tasks.values()))
+
+    result = sync.sync_files(str(local), str(remote))
+    assert result.conflicts == []
+    assert result.compared == 4 # 只比較變更過的 0、1、3、7
+    for path in (local, remote):
+        merged = read(path)
+        assert sorted(merged) == [0, 1, 2, 7]
+        assert merged[0]['status'] == "Completed"
+        assert merged[1]['note'] == "from desktop"
+    # 再次同步沒有任何變更
+    again = sync.sync_files(str(local), str(remote))
+    assert (again.compared, again.local_changed, again.remote_changed) == (0, False, False)
+
+def test_field_level_merge_and_conflicts(files):
+    """測試同一任務的不同欄位分別合併；同一欄位兩邊都改時依 prefer 決定並回報。"""
+    local, remote = files
+    tasks = read(local)
+    tasks[2].update(status="Completed", description="C (laptop)")
+    write(local, list(tasks.values()))
+    tasks = read(remote)
+    tasks[2].update(note="desktop note", description="C (desktop)")
+    write(remote, list(tasks.values()))
+
+    result = sync.sync_files(str(local), str(remote), prefer=sync.PREFER_REMOTE)
+    assert [(c.task_id, c.field, c.chosen) for c in result.conflicts] == [(2, 'description', "C (desktop)")]
+    for path in (local, remote):
+        merged = read(path)[2]
+        assert (merged['status'], merged['note'], merged['description']) == ("Completed", "desktop note", "C (desktop)")
+
+def test_edit_wins_over_delete_and_id_collisions_are_renumbered(files):
+    """測試一邊刪除、另一邊修改時保留修改；兩邊各自新增相同 ID 的不同任務時，遠端的任務改用新 ID。"""
+    local, remote = files
+    tasks = read(local)
+    del tasks[1]
+    tasks[4] = task(4, "Laptop task", creation_time="2025-06-01 08:00:00")
+    write(local, list(tasks.values()))
+    tasks = read(remote)
+    tasks[1]['note'] = "edited"
+    tasks[4] = task(4, "Desktop task", creation_time="2025-06-01 09:00:00")
+    write(remote, list(tasks.values()))
+
+    result = sync.sync_files(str(local), str(remote))
+    assert [(c.task_id, c.field) for c in result.conflicts] == [(1, None)]
+    assert result.renumbered == {4: 5}
+    for path in (local, remote):
+        merged = read(path)
+        assert merged[1]['note'] == "edited"
+        assert (merged[4]['description'], merged[5]['description']) == ("Laptop task", "Desktop task")
+    manager = TaskDataManager(str(local))
+    manager.load_tasks()
+    assert manager.get_next_id() == 6
+
+def test_first_sync_without_base_merges_copies(tmp_path):
+    """測試第一次同步（沒有基準）：相同 ID 且建立時間相同視為同一任務，不同的欄位依 prefer 決定。"""
+    local, remote = tmp_path / "a.json", tmp_path / "b.json"
+    write(local, [task(0, "A", status="Completed"), task(1, "Only local")])
+    write(remote, [task(0, "A", note="remote note"), task(2, "Only remote")])
+    result = sync.sync_files(str(local), str(remote), dry_run=True)
+    assert not (tmp_path / "a.json").read_text(encoding='utf-8').count("Only remote")
+    result = sync.sync_files(str(local), str(remote))
+    assert {(c.field, c.chosen) for c in result.conflicts} == {('status', "Completed"), ('note', '')}
+    assert sorted(read(local)) == sorted(read(remote)) == [0, 1, 2]
+
+def test_cli_sync(files, capsys):
+    """測試命令列的 sync 子命令。"""
+    local, remote = files
+    tasks = read(remote)
+    tasks[0]['status'] = "Cancelled"
+    write(remote, list(tasks.values()))
+    out = io.StringIO()
+    assert cli.main(["--data-file", str(local), "sync", str(remote)], out=out) == 0
+    assert read(local)[0]['status'] == "Cancelled"
+    assert "本機: 1 更新" in capsys.readouterr().err
+
+def test_unchanged_files_are_not_reread(files, monkeypatch):
+    """測試檔案簽章沒變時不重新讀取；full=True 會忽略簽章重新比較。"""
+    import os
+    local, remote = files
+    tasks = read(remote)
+    tasks[0]['description'] = "Z" # 同樣長度的修改
+    stat = os.stat(remote)
+    write(remote, list(tasks.values()))
+    os.utime(remote, ns=(stat.st_atime_ns, stat.st_mtime_ns)) # 保留原本的修改時間與大小
+    assert os.path.getsize(remote) == stat.st_size
+
+    monkeypatch.setattr(sync, "manifest", lambda tasks: pytest.fail("should not hash unchanged files"))
+    result = sync.sync_files(str(local), str(remote))
+    assert (result.compared, result.local_changed) == (0, False)
+    monkeypatch.undo()
+    result = sync.sync_files(str(local), str(remote), full=True)
+    assert result.compared == 1
+
+def test_unreadable_side_aborts_sync(files):
+    """測試一邊的資料檔損壞或遺失時中止同步，另一邊與基準都不被修改。"""
+    local, remote = files
+    base_path = sync.default_base_path(str(local), str(remote))
+    remote_before, base_before = remote.read_text(encoding='utf-8'), open(base_path, encoding='utf-8').read()
+    local.write_text("[{not json", encoding='utf-8')
+    with pytest.raises(ValueError, match="decode"):
+        sync.sync_files(str(local), str(remote))
+    local.unlink()
+    with pytest.raises(FileNotFoundError):
+        sync.sync_files(str(local), str(remote))
+    assert remote.read_text(encoding='utf-8') == remote_before
+    assert open(base_path, encoding='utf-8').read() == base_before
+    assert not [name for name in os.listdir(local.parent) if name.endswith(".backups")]
+
+def test_failed_save_keeps_base(files, capsys):
+    """測試儲存失敗時拋出例外且不更新基準，下次同步仍會傳遞變更。"""
+    local, remote = files
+    base_path = sync.default_base_path(str(local), str(remote))
+    base_before = open(base_path, encoding='utf-8').read()
+    tasks = read(remote)
+    tasks[0]['status'] = "Cancelled"
+    write(remote, list(tasks.values()))
+    with patch.object(TaskDataManager, 'save_tasks', return_value=(False, OSError("disk full"))):
+        with pytest.raises(OSError, match="disk full"):
+            sync.sync_files(str(local), str(remote))
+    assert open(base_path, encoding='utf-8').read() == base_before
+    assert sync.sync_files(str(local), str(remote)).local_changed
+    assert read(local)[0]['status'] == "Cancelled"
+    out = io.StringIO()
+    local.write_text("{}", encoding='utf-8')
+    assert cli.main(["--data-file", str(local), "sync", str(remote)], out=out) == 1
+    assert "錯誤" in capsys.readouterr().err
@@ -0,0 +1,126 @@
+# tests/test_task_io.py
+
+import json
+import threading
+import pytest
+from datetime import date
+from record_calender.data_manager import TaskDataManager
+from record_calender.task_manager import TaskManager
+from record_calender import task_io
+from record_calender.exporter import ExportCancelled
+
+@pytest.fixture
+def task_manager(tmp_path):
+    return TaskManager(TaskDataManager(str(tmp_path / "tasks.json")))
+
+def make_tasks(task_manager):
+    task_manager.add_task("Task A", "2025-05-25", "note, with \"quotes\"\nand newline")
+    task_manager.add_task("任務 B")
+    task_manager.update_task(1, status="Completed")
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_round_trip(tmp_path, task_manager, extension):
+    """測試匯出後再匯入，內容相同但分配新的 ID。"""
+    make_tasks(task_manager)
+    path = str(tmp_path / f"tasks.{extension}")
+    assert task_io.export_tasks(task_manager, path) == 2
+
+    target = TaskManager(TaskDataManager(str(tmp_path / "target.json")))
+    target.add_task("Existing")
+    assert task_io.import_tasks(target, path) == (2, 0, [])
+    imported = target.get_tasks()[1:]
+    assert [task['id'] for task in imported] == [1, 2]
+    for original, task in zip(task_manager.get_tasks(), imported):
+        for field in ('description', 'due_date', 'status', 'note', 'creation_time'):
+            assert task[field] == original[field]
+    # 已儲存到資料檔
+    assert len(TaskManager(TaskDataManager(str(tmp_path / "target.json"))).get_tasks()) == 3
+
+def test_export_selected_ids_in_order(tmp_path, task_manager):
+    """測試只匯出指定的任務，並依給定的順序。"""
+    make_tasks(task_manager)
+    path = str(tmp_path / "tasks.jsonl")
+    assert task_io.export_tasks(task_manager, path, task_ids=[1, 5, 0]) == 2
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['id'] for line in f] == [1, 0]
+
+def test_import_reports_row_errors(tmp_path, task_manager):
+    """測試無效的資料被略過，並回報所在的行號。"""
+    path = tmp_path / "tasks.jsonl"
+    path.write_text("\n".join([
+        json.dumps({'description': "ok", 'status': "in PROGRESS"}),
+        "{not json",
+        "",
+        json.dumps({'description': ""}),
+        json.dumps({'description': "bad date", 'due_date': "2025/05/25"}),
+        json.dumps({'description': "bad status", 'status': "Done"}),
+        json.dumps(["not", "an", "object"]),
+        json.dumps({'description': "ok 2", 'due_date': "2025-05-26", 'creation_time': "2025-01-01 08:00:00"}),
+    ]), encoding='utf-8')
+    added, _, errors = task_io.import_tasks(task_manager, str(path), chunk_size=3)
+    assert added == 2
+    assert [line for line, _ in errors] == [2, 4, 5, 6, 7]
+    assert "Invalid due date format" in errors[2][1]
+    tasks = task_manager.get_tasks()
+    assert tasks[0]['status'] == "In progress"
+    assert tasks[1]['creation_time'] == "2025-01-01 08:00:00"
+    assert task_manager.get_task_ids_due_on(date(2025, 5, 26)) == {tasks[1]['id']}
+
+def test_csv_line_numbers_and_header(tmp_path, task_manager):
+    """測試 CSV 的行號考慮多行欄位，且缺少 description 欄位時拒絕匯入。"""
+    path = tmp_path / "tasks.csv"
+    path.write_text('description,note\n"multi","line1\nline2"\n,empty\nok,\n', encoding='utf-8')
+    added, _, errors = task_io.import_tasks(task_manager, str(path))
+    assert added == 2
+    assert errors == [(4, "Task description cannot be empty.")]
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("title\nx\n", encoding='utf-8')
+    with pytest.raises(ValueError, match="description"):
+        task_io.import_tasks(task_manager, str(bad))
+
+def test_import_cancel_keeps_added_tasks(tmp_path, task_manager):
+    """測試取消匯入時，已加入的任務仍會儲存。"""
+    path = tmp_path / "tasks.jsonl"
+    path.write_text("\n".join(json.dumps({'description': f"task {i}"}) for i in range(10)), encoding='utf-8')
+    cancel_event = threading.Event()
+    with pytest.raises(task_io.ImportCancelled):
+        task_io.import_tasks(task_manager, str(path), chunk_size=4, progress=lambda processed, added: cancel_event.set(), cancel_event=cancel_event)
+    assert len(TaskManager(TaskDataManager(str(tmp_path / "tasks.json"))).get_tasks()) == 4
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl", "ics"])
+def test_export_progress_and_cancel(tmp_path, task_manager, extension):
+    """測試匯出回報進度，取消時不留下輸出檔或暫存檔。"""
+    for i in range(5):
+        task_manager.add_task(f"task {i}", "2025-05-25")
+    path = tmp_path / f"tasks.{extension}"
+    progress = []
+    assert task_io.write_tasks(task_manager.get_tasks(), str(path), progress=progress.append, progress_every=2) == 5
+    assert progress == [2, 4, 5]
+
+    path.unlink()
+    cancel_event = threading.Event()
+    with pytest.raises(ExportCancelled):
+        task_io.write_tasks(task_manager.get_tasks(), str(path), progress=lambda done: cancel_event.set(),
+                            cancel_event=cancel_event, progress_every=2)
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(ExportCancelled):
+        task_io.export_tasks(task_manager, str(path), cancel_event=cancel_event)
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(path.name)]
+
+def test_detect_format():
+    assert task_io.detect_format("a.CSV") == "csv"
+    assert task_io.detect_format("a.ndjson") == "jsonl"
+    with pytest.raises(ValueError):
+        task_io.detect_format("a.xlsx")
+
+def test_main_import_and_export(tmp_path, capsys):
+    """測試命令列匯入與匯出。"""
+    data_file = str(tmp_path / "tasks.json")
+    source = tmp_path / "in.csv"
+    source.write_text("description,due_date\nA,2025-05-25\nB,bad\n", encoding='utf-8')
+    assert task_io.main(["import", str(source), "--data-file", data_file]) == 1
+    assert "第 3 行" in capsys.readouterr().out
+    assert task_io.main(["export", str(tmp_path / "out.jsonl"), "--data-file", data_file]) == 0
+    assert len((tmp_path / "out.jsonl").read_text(encoding='utf-8').splitlines()) == 1
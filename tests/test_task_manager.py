@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import Mock, patch
-from datetime import datetime
+from datetime import datetime, date
 from record_calender.task_manager import TaskManager, STATUS_OPTIONS
 from record_calender.data_manager import TaskDataManager
 
@@ -71,8 +71,22 @@ def test_delete_task_success(task_manager_instance, mock_data_manager):
     deleted = task_manager_instance.delete_task(task['id'])
     assert deleted is True
     assert len(task_manager_instance.get_tasks()) == 0
+    assert task_manager_instance.task_count() == 0
     mock_data_manager.save_tasks.assert_called_once()
 
+@pytest.mark.parametrize("storage", ["list", "columnar"])
+def test_delete_keeps_id_index(mock_data_manager, storage):
+    """測試刪除中間的任務後，ID 索引只移除該任務，其他任務仍能正確查到。"""
+    task_manager = TaskManager(mock_data_manager, storage=storage)
+    for i in range(5):
+        task_manager.add_task(f"Task {i}")
+    assert task_manager.get_task_by_id(4)['description'] == "Task 4" # 建立索引
+    assert task_manager.delete_task(1) and task_manager.delete_task(3)
+    assert task_manager.get_task_by_id(1) is None
+    assert [task_manager.get_task_by_id(i)['description'] for i in (0, 2, 4)] == ["Task 0", "Task 2", "Task 4"]
+    task_manager.update_task(4, description="Task 4 updated")
+    assert task_manager.get_tasks()[-1]['description'] == "Task 4 updated"
+
 def test_delete_task_not_found(task_manager_instance):
     """測試刪除不存在的任務。"""
     deleted = task_manager_instance.delete_task(999)
@@ -111,4 +125,203 @@ def test_get_all_tasks_sorted(task_manager_instance, mock_data_manager):
     sorted_tasks = task_manager_instance.get_all_tasks_sorted(sort_column="description", sort_direction="descending")
     assert sorted_tasks[0]['description'] == "Task C"
     assert sorted_tasks[1]['description'] == "Task B"
-    assert sorted_tasks[2]['description'] == "Task A"
\ No newline at end of file
+    assert sorted_tasks[2]['description'] == "Task A"
+def test_query_task_ids_and_get_tasks_by_ids(task_manager_instance):
+    """測試只回傳排序後 ID 的查詢，以及依 ID 批次取得可見範圍的任務。"""
+    task_b = task_manager_instance.add_task("Task B", "2025-05-22")
+    task_a = task_manager_instance.add_task("Task A", "2025-05-21")
+    task_c = task_manager_instance.add_task("Task C", "2025-05-23")
+    task_manager_instance.update_task(task_c['id'], status="On hold")
+
+    assert task_manager_instance.query_task_ids(None, "due_date") == [task_a['id'], task_b['id'], task_c['id']]
+    assert task_manager_instance.query_task_ids(None, "due_date", include_on_hold=False) == [task_a['id'], task_b['id']]
+    assert task_manager_instance.query_task_ids("Pending", "description", "descending") == [task_b['id'], task_a['id']]
+
+    window = task_manager_instance.get_tasks_by_ids([task_c['id'], 999, task_a['id']])
+    assert [task['description'] for task in window] == ["Task C", "Task A"]
+
+def test_data_version_changes_only_on_mutation(task_manager_instance):
+    """測試資料版本只在新增、修改、刪除時遞增，讀取不會改變它。"""
+    version = task_manager_instance.data_version
+    task = task_manager_instance.add_task("Versioned task")
+    assert task_manager_instance.data_version == version + 1
+
+    task_manager_instance.get_all_tasks_sorted("description")
+    task_manager_instance.update_task(999, description="Missing")
+    assert task_manager_instance.data_version == version + 1
+
+    task_manager_instance.update_task(task['id'], status="Completed")
+    assert task_manager_instance.data_version == version + 2
+    task_manager_instance.delete_task(task['id'])
+    assert task_manager_instance.data_version == version + 3
+
+def test_day_buckets_follow_changes(task_manager_instance):
+    """測試每日分組在新增、修改到期日、刪除後保持正確，且只回傳範圍內的日期。"""
+    task_a = task_manager_instance.add_task("Task A", "2025-06-15")
+    task_b = task_manager_instance.add_task("Task B", "2025-06-15")
+    task_c = task_manager_instance.add_task("Task C", "2025-06-20")
+    task_manager_instance.add_task("No date")
+
+    by_day = task_manager_instance.get_tasks_by_day(date(2025, 6, 1), date(2025, 6, 30))
+    assert {day: [t['description'] for t in tasks] for day, tasks in by_day.items()} == {
+        date(2025, 6, 15): ["Task A", "Task B"],
+        date(2025, 6, 20): ["Task C"],
+    }
+
+    task_manager_instance.update_task(task_b['id'], due_date="2025-07-01")
+    task_manager_instance.delete_task(task_c['id'])
+    task_d = task_manager_instance.add_task("Task D", "2025-06-15")
+    assert task_manager_instance.get_task_ids_due_on(date(2025, 6, 15)) == {task_a['id'], task_d['id']}
+    assert task_manager_instance.get_task_ids_due_on(date(2025, 6, 20)) == set()
+    assert list(task_manager_instance.get_tasks_by_day(date(2025, 7, 1), date(2025, 7, 1))) == [date(2025, 7, 1)]
+
+    task_manager_instance.update_task(task_d['id'], status="On hold")
+    assert task_manager_instance.query_task_ids(due_on=date(2025, 6, 15), include_on_hold=False) == [task_a['id']]
+    assert task_manager_instance.query_task_ids("On hold", due_on=date(2025, 6, 15)) == [task_d['id']]
+
+def test_update_task_image_path(task_manager_instance, tmp_path):
+    """測試設定與移除附件圖片，不存在的檔案會拋出錯誤。"""
+    task = task_manager_instance.add_task("With image")
+    image = tmp_path / "photo.png"
+    image.write_bytes(b"png")
+    assert task_manager_instance.update_task(task['id'], image_path=str(image))['image_path'] == str(image)
+    with pytest.raises(ValueError, match="Image file not found"):
+        task_manager_instance.update_task(task['id'], image_path=str(tmp_path / "missing.png"))
+    assert task_manager_instance.update_task(task['id'], image_path="")['image_path'] is None
+
+def test_failed_update_changes_nothing(task_manager_instance):
+    """測試任一參數無效時整個更新都不生效：任務、搜尋、每日分組、版本號都保持原樣。"""
+    task = task_manager_instance.add_task("Milk", "2025-06-15")
+    task_manager_instance.build_search_index()
+    version = task_manager_instance.data_version
+    revision = task_manager_instance.get_task_revision(task['id'])
+    with pytest.raises(ValueError, match="Invalid status"):
+        task_manager_instance.update_task(task['id'], description="Bread", due_date="2025-07-01", status="Unknown")
+    assert (task['description'], task['due_date'], task['status']) == ("Milk", "2025-06-15", "Pending")
+    assert task_manager_instance.search_task_ids("milk") == {task['id']}
+    assert task_manager_instance.search_task_ids("bread") == set()
+    assert task_manager_instance.get_task_ids_due_on(date(2025, 6, 15)) == {task['id']}
+    assert task_manager_instance.data_version == version
+    assert task_manager_instance.get_task_revision(task['id']) == revision
+
+def test_task_revision_changes_per_task(task_manager_instance):
+    """測試任務版本只在該任務被修改時遞增。"""
+    task_a = task_manager_instance.add_task("Task A")
+    task_b = task_manager_instance.add_task("Task B")
+    revision_a = task_manager_instance.get_task_revision(task_a['id'])
+    revision_b = task_manager_instance.get_task_revision(task_b['id'])
+    task_manager_instance.update_task(task_a['id'], status="Completed")
+    assert task_manager_instance.get_task_revision(task_a['id']) == revision_a + 1
+    assert task_manager_instance.get_task_revision(task_b['id']) == revision_b
+    task_manager_instance.delete_task(task_b['id'])
+    assert task_manager_instance.get_task_revision(task_b['id']) == revision_b + 1
+
+def test_get_task_due_ordinal(task_manager_instance):
+    """測試從到期日索引取得序數，修改到期日後隨之更新。"""
+    task = task_manager_instance.add_task("Due", "2025-06-15")
+    no_date = task_manager_instance.add_task("No date")
+    assert task_manager_instance.get_task_due_ordinal(task['id']) == date(2025, 6, 15).toordinal()
+    assert task_manager_instance.get_task_due_ordinal(no_date['id']) is None
+    task_manager_instance.update_task(task['id'], due_date="2025-06-16")
+    assert task_manager_instance.get_task_due_ordinal(task['id']) == date(2025, 6, 16).toordinal()
+
+def test_listeners_are_notified(task_manager_instance):
+    """測試新增、修改、刪除任務時會通知監聽器。"""
+    events = []
+    listener = lambda event, task: events.append((event, task['id'], task['description']))
+    task_manager_instance.add_listener(listener)
+    task = task_manager_instance.add_task("Task A", "2025-05-25")
+    task_manager_instance.update_task(task['id'], description="Task B")
+    task_manager_instance.update_task(task['id']) # 沒有變更時不通知
+    task_manager_instance.delete_task(task['id'])
+    task_manager_instance.delete_task(task['id'])
+    assert events == [('added', 0, "Task A"), ('updated', 0, "Task B"), ('deleted', 0, "Task B")]
+    task_manager_instance.remove_listener(listener)
+    task_manager_instance.add_task("Task C")
+    assert len(events) == 3
+
+def test_add_tasks_bulk(task_manager_instance, mock_data_manager):
+    """測試批次新增：逐筆驗證、回報錯誤的索引，並且只儲存一次。"""
+    events = []
+    task_manager_instance.add_listener(lambda event, task: events.append((event, task['id'])))
+    version = task_manager_instance.data_version
+    added, errors = task_manager_instance.add_tasks_bulk([
+        {'id': 42, 'description': "A", 'due_date': "2025-05-25", 'status': "completed"},
+        {'description': "  "},
+        {'description': "B", 'due_date': "25-05-2025"},
+        {'description': "C", 'note': None},
+    ])
+    assert [task['id'] for task in added] == [0, 1]
+    assert added[0]['status'] == "Completed" and added[1]['note'] == ''
+    assert [index for index, _ in errors] == [1, 2]
+    assert task_manager_instance.data_version == version + 1
+    mock_data_manager.save_tasks.assert_called_once()
+    assert events == [('added', 0), ('added', 1)]
+    assert task_manager_instance.search_task_ids("C") == {1}
+
+    mock_data_manager.save_tasks.reset_mock()
+    task_manager_instance.add_tasks_bulk([{'description': "D"}], save=False)
+    mock_data_manager.save_tasks.assert_not_called()
+
+def test_concurrent_mutations_keep_invariants(tmp_path):
+    """壓力測試：多個執行緒同時新增、修改、刪除與查詢，ID 不重複，索引與任務列表一致。"""
+    from concurrent.futures import ThreadPoolExecutor
+    data_manager = TaskDataManager(str(tmp_path / "tasks.json"))
+    task_manager = TaskManager(data_manager)
+    task_manager.autosave = False # 每次都寫檔會讓測試太慢；另一個測試涵蓋同時寫檔
+    task_manager.build_search_index()
+    task_manager.build_day_buckets()
+    errors = []
+
+    def worker(seed):
+        try:
+            created = []
+            for i in range(200):
+                task = task_manager.add_task(f"worker {seed} task {i}", f"2025-05-{i % 28 + 1:02d}")
+                created.append(task['id'])
+                if i % 3 == 0:
+                    task_manager.update_task(created[-1], status="Completed", due_date=f"2025-06-{i % 28 + 1:02d}")
+                if i % 5 == 0:
+                    assert task_manager.delete_task(created.pop(0))
+                # 讀取者看到的狀態必須一致
+                tasks = task_manager.query_tasks(status="Completed", due_on=date(2025, 6, 1))
+                assert all(task['status'] == "Completed" and task['due_date'] == "2025-06-01" for task in tasks)
+                task_manager.search_task_ids(f"worker {seed}")
+            return created
+        except Exception as e:
+            errors.append(e)
+            raise
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        remaining = [task_id for ids in pool.map(worker, range(8)) for task_id in ids]
+
+    assert errors == []
+    tasks = task_manager.get_tasks()
+    ids = [task['id'] for task in tasks]
+    assert len(ids) == len(set(ids)) == len(remaining)
+    assert sorted(ids) == sorted(remaining)
+    assert max(ids) < 8 * 200 # 沒有 ID 被跳過或重複分配
+    # 增量維護的索引與重新建立的結果相同
+    expected_days = {}
+    for task in tasks:
+        expected_days.setdefault(date.fromisoformat(task['due_date']).toordinal(), set()).add(task['id'])
+    assert task_manager.build_day_buckets() == expected_days
+    assert task_manager.search_task_ids("task") == set(ids)
+
+def test_concurrent_saves_produce_valid_file(tmp_path):
+    """壓力測試：同時新增並各自儲存時，資料檔始終是完整的 JSON，最後包含所有任務。"""
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+    data_file = tmp_path / "tasks.json"
+    task_manager = TaskManager(TaskDataManager(str(data_file)))
+
+    def worker(seed):
+        for i in range(20):
+            task_manager.add_task(f"{seed}-{i}")
+        return len(json.loads(data_file.read_text(encoding='utf-8')))
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        counts = list(pool.map(worker, range(6)))
+    assert all(count >= 20 for count in counts)
+    saved = json.loads(data_file.read_text(encoding='utf-8'))
+    assert sorted(task['id'] for task in saved) == list(range(120))
@@ -0,0 +1,72 @@
+# tests/test_thumbnails.py
+
+import os
+import pytest
+from record_calender.thumbnails import ThumbnailCache
+
+@pytest.fixture
+def image_files(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"image{i}.png"
+        path.write_bytes(b"fake")
+        paths.append(str(path))
+    return paths
+
+def test_memory_cache_is_lru(image_files, monkeypatch):
+    """測試記憶體快取超過容量時移除最久未使用的縮圖，且命中時不會再解碼。"""
+    cache = ThumbnailCache(cache_dir=None, memory_capacity=2)
+    decoded = []
+    monkeypatch.setattr(cache, "_decode", lambda path, key: decoded.append(path) or f"thumb:{os.path.basename(path)}")
+    try:
+        assert cache.get(image_files[0]) is None
+        assert cache.load_async(image_files[0]).result(timeout=5) == "thumb:image0.png"
+        cache.load_async(image_files[1]).result(timeout=5)
+        assert cache.get(image_files[0]) == "thumb:image0.png" # image0 變成最近使用
+        cache.load_async(image_files[2]).result(timeout=5)
+        assert cache.get(image_files[1]) is None
+        assert cache.get(image_files[0]) == "thumb:image0.png"
+        assert cache.load_async(image_files[0]).result(timeout=5) == "thumb:image0.png"
+        assert decoded == image_files
+    finally:
+        cache.shutdown()
+
+def test_modified_file_gets_new_key(image_files):
+    """測試檔案修改時間改變後，快取鍵也會改變；不存在的檔案沒有快取鍵。"""
+    cache = ThumbnailCache(cache_dir=None)
+    key = cache.cache_key(image_files[0])
+    stat = os.stat(image_files[0])
+    os.utime(image_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.cache_key(image_files[0]) != key
+    assert cache.cache_key(image_files[0] + ".missing") is None
+
+def test_missing_file_fails_future(tmp_path):
+    """測試附件不存在時 Future 帶有例外，而不是阻塞或崩潰。"""
+    cache = ThumbnailCache(cache_dir=None)
+    try:
+        with pytest.raises(FileNotFoundError):
+            cache.load_async(str(tmp_path / "missing.png")).result(timeout=5)
+    finally:
+        cache.shutdown()
+
+def test_decode_writes_disk_cache(tmp_path):
+    """測試實際解碼會縮小圖片並寫入磁碟快取，第二個實例直接讀取快取。"""
+    Image = pytest.importorskip("PIL.Image")
+    source = tmp_path / "big.png"
+    Image.new("RGB", (800, 400), "red").save(source)
+    cache_dir = tmp_path / "thumbs"
+
+    cache = ThumbnailCache(cache_dir=str(cache_dir), size=(100, 100))
+    try:
+        image = cache.load_async(str(source)).result(timeout=10)
+    finally:
+        cache.shutdown()
+    assert image.size == (100, 50)
+    cached_path = cache.disk_cache_path(cache.cache_key(str(source)))
+    assert os.path.exists(cached_path)
+
+    second = ThumbnailCache(cache_dir=str(cache_dir), size=(100, 100))
+    try:
+        assert second.load_async(str(source)).result(timeout=10).size == (100, 50)
+    finally:
+        second.shutdown()
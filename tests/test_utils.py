@@ -29,8 +29,10 @@ class MockTextbox:
     def tag_configure(self, tag, **kwargs):
         pass # 簡單模擬，不實際配置
 
-    def tag_add(self, tag, start, end):
-        self._tags.append({'tag': tag, 'start': start, 'end': end})
+    def tag_add(self, tag, *indices):
+        # 與 Tk 相同，可一次傳入多組 (start, end)
+        for start, end in zip(indices[0::2], indices[1::2]):
+            self._tags.append({'tag': tag, 'start': start, 'end': end})
 
     def tag_bind(self, tag, event, func):
         if tag not in self._binds:
@@ -76,6 +78,49 @@ def test_format_date_with_weekday_empty():
 def test_format_date_with_weekday_invalid():
     assert utils.format_date_with_weekday("bad-date") == "bad-date"
 
+# 測試 format_rows
+def test_format_rows_values():
+    tasks = [
+        {"id": 1, "description": "A", "due_date": "2025-05-20", "status": "Pending", "note": "x" * 61, "creation_time": "2025-05-20 14:30:00", "image_path": "a.png"},
+        {"id": 2, "description": "B", "due_date": None, "status": "Weird", "note": "line1\nline2", "creation_time": None, "image_path": None},
+    ]
+    assert utils.format_rows(tasks) == [
+        ("2025-05-20 14:30:00 (Tue)", "A", "2025-05-20 (Tue)", "Pending", "x" * 60 + "...", utils.ATTACHMENT_MARK),
+        ("無時間", "B", "無到期日", "未知狀態", "line1 line2", ""),
+    ]
+
+def test_format_rows_cache_skips_unchanged_tasks():
+    """測試版本沒變的任務直接使用快取，完全不解析日期；版本改變時才重新格式化。"""
+    task = {"id": 7, "description": "Cached", "due_date": "2031-01-02", "status": "Pending", "note": "", "creation_time": "2031-01-02 03:04:05"}
+    revisions = {7: 0}
+    cache = {}
+    first = utils.format_rows([task], cache, revisions.get)
+    with patch('record_calender.utils.datetime') as mock_datetime:
+        mock_datetime.strptime.side_effect = AssertionError("should not parse")
+        assert utils.format_rows([task], cache, revisions.get) == first
+    task["description"] = "Changed"
+    revisions[7] = 1
+    assert utils.format_rows([task], cache, revisions.get)[0][1] == "Changed"
+
+def test_date_formatting_is_memoized():
+    utils.format_date_with_weekday.cache_clear()
+    utils.format_date_with_weekday("2025-05-20")
+    utils.format_date_with_weekday("2025-05-20")
+    assert utils.format_date_with_weekday.cache_info().hits == 1
+
+def test_due_tags_from_ordinals():
+    """測試以序數計算逾期/今日到期標籤，已完成或取消的任務不標示。"""
+    today = date(2025, 6, 15).toordinal()
+    assert utils.due_tags(today - 1, "Pending", today) == (utils.OVERDUE_TAG,)
+    assert utils.due_tags(today, "In progress", today) == (utils.DUE_TODAY_TAG,)
+    assert utils.due_tags(today + 1, "Pending", today) == ()
+    assert utils.due_tags(today - 1, "Completed", today) == ()
+    assert utils.due_tags(None, "Pending", today) == ()
+
+def test_ms_until_midnight():
+    assert utils.ms_until_midnight(datetime(2025, 6, 15, 23, 59, 0)) == 60500
+    assert utils.ms_until_midnight(datetime(2025, 6, 15, 23, 59, 59, 900000)) == 1000
+
 # 測試 is_past_due
 def test_is_past_due_future_date():
     future_date = (date.today() + timedelta(days=1)).strftime('%Y-%m-%d')
@@ -106,8 +151,8 @@ def test_find_and_tag_urls_with_url():
     mock_textbox = MockTextbox("Visit Google at https://www.google.com and then this: http://example.com/path")
     utils.find_and_tag_urls(mock_textbox)
     assert len(mock_textbox._tags) == 2
-    assert {'tag': 'url', 'start': '1.0+17c', 'end': '1.0+40c'} in mock_textbox._tags
-    assert {'tag': 'url', 'start': '1.0+56c', 'end': '1.0+79c'} in mock_textbox._tags
+    assert {'tag': 'url', 'start': '1.16', 'end': '1.38'} in mock_textbox._tags
+    assert {'tag': 'url', 'start': '1.54', 'end': '1.77'} in mock_textbox._tags
     # 驗證綁定是否存在
     assert "url" in mock_textbox._binds
     assert "<Button-1>" in mock_textbox._binds["url"]
@@ -136,12 +181,58 @@ def test_find_and_tag_urls_with_url():
     for url in urls:
         start = text.index(url)
         end = start + len(url)
-        tag = {'tag': 'url', 'start': f'1.0+{start}c', 'end': f'1.0+{end}c'}
+        tag = {'tag': 'url', 'start': f'1.{start}', 'end': f'1.{end}'}
         assert tag in mock_textbox._tags
     # 驗證綁定是否存在
     assert "url" in mock_textbox._binds
     assert "<Button-1>" in mock_textbox._binds["url"]
 
+def test_find_url_spans_multiline():
+    """測試多行內容的偏移量轉換為 Tk 的 行.欄 索引，且結果依內容快取。"""
+    content = "  first https://a.example\n\nsee http://b.example/x?y=1 and https://c.example"
+    spans = utils.find_url_spans(content)
+    assert spans == (
+        ('1.8', '1.25', 'https://a.example'),
+        ('3.4', '3.26', 'http://b.example/x?y=1'),
+        ('3.31', '3.48', 'https://c.example'),
+    )
+    assert utils.find_url_spans(content) is spans
+
+def test_find_and_tag_urls_appends_chunk():
+    """測試分段顯示時，附加的一段只標記自己的網址並保留先前的連結。"""
+    first_chunk = "see https://a.example\n"
+    second_chunk = "x https://b.example"
+    mock_textbox = MockTextbox(first_chunk)
+    utils.find_and_tag_urls(mock_textbox, first_chunk)
+    start_index = utils.text_end_index("1.0", first_chunk)
+    assert start_index == "2.0"
+    utils.find_and_tag_urls(mock_textbox, second_chunk, start_index)
+    assert [(t['start'], t['end']) for t in mock_textbox._tags] == [('1.4', '1.21'), ('2.2', '2.19')]
+    assert mock_textbox._url_targets == {'1.4': 'https://a.example', '2.2': 'https://b.example'}
+
+def test_note_window_end_cuts_at_line_or_space():
+    """測試備註分段會在換行或空白後切開，不會切斷網址。"""
+    note = "line one\nline two https://example.com/long"
+    assert utils.note_window_end(note, 0, 100) == len(note)
+    assert utils.note_window_end(note, 0, 12) == 9 # 在第一個換行之後
+    assert utils.note_window_end(note, 9, 20) == 18 # 沒有換行時在空白之後
+    assert utils.note_window_end("x" * 50, 0, 20) == 20 # 沒有可切的地方時硬切
+    assert utils.text_end_index("3.5", "abc") == "3.8"
+    assert utils.text_end_index("3.5", "ab\ncd\nxyz") == "5.3"
+
+def test_find_and_tag_urls_each_link_opens_its_own_url():
+    """測試點擊不同連結會開啟各自的網址，而不是最後一個。"""
+    content = "https://first.example then https://second.example"
+    mock_textbox = MockTextbox(content)
+    utils.find_and_tag_urls(mock_textbox)
+    click = mock_textbox._binds["url"]["<Button-1>"]
+    for tag, expected in zip(mock_textbox._tags, ["https://first.example", "https://second.example"]):
+        mock_textbox.tag_prevrange = Mock(return_value=(tag['start'], tag['end']))
+        mock_textbox.index = lambda index: index
+        with patch('record_calender.utils.webbrowser.open_new_tab') as mock_open:
+            click(None)
+            mock_open.assert_called_once_with(expected)
+
 def test_copy_with_links_with_url():
     mock_textbox = MockTextbox("Text with link https://example.com.")
     mock_app = Mock()
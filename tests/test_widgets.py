@@ -0,0 +1,100 @@
+# tests/test_widgets.py
+
+import pytest
+from record_calender.widgets import diff_rows, apply_row_ops, RowSyncJob
+
+class MockTreeview:
+    """以 list 模擬 Treeview 的列順序，並記錄每一次呼叫。"""
+    def __init__(self, rows=()):
+        self.order = []
+        self.values = {}
+        self.calls = []
+        for iid, values, tags in rows:
+            self.order.append(iid)
+            self.values[iid] = (tuple(values), tuple(tags))
+
+    def delete(self, *iids):
+        self.calls.append(('delete', iids))
+        for iid in iids:
+            self.order.remove(iid)
+            del self.values[iid]
+
+    def item(self, iid, values=None, tags=None):
+        self.calls.append(('item', iid))
+        self.values[iid] = (tuple(values), tuple(tags))
+
+    def index(self, iid):
+        return self.order.index(iid)
+
+    def move(self, iid, parent, index):
+        self.calls.append(('move', iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        self.calls.append(('insert', iid))
+        self.order.insert(index, iid)
+        self.values[iid] = (tuple(values), tuple(tags))
+
+def rows_for(ids, changed=()):
+    return [(str(i), (f"task {i}" + (" *" if i in changed else ""),), ()) for i in ids]
+
+def sync(old_ids, new_rows):
+    old_rows = rows_for(old_ids)
+    tree = MockTreeview(old_rows)
+    ops = diff_rows(tree.order, dict(tree.values), new_rows)
+    apply_row_ops(tree, ops)
+    assert tree.order == [iid for iid, _, _ in new_rows]
+    assert all(tree.values[iid] == (tuple(values), tuple(tags)) for iid, values, tags in new_rows)
+    return tree
+
+def test_diff_rows_unchanged_list_issues_no_calls():
+    """測試內容和順序都沒變時不會產生任何 Tk 呼叫。"""
+    tree = sync(range(10), rows_for(range(10)))
+    assert tree.calls == []
+
+def test_diff_rows_single_value_change():
+    """測試只有一列內容改變時只更新該列。"""
+    tree = sync(range(10), rows_for(range(10), changed={4}))
+    assert tree.calls == [('item', '4')]
+
+def test_diff_rows_insert_delete_and_move():
+    """測試新增、刪除與移動只針對有差異的列。"""
+    new_ids = [0, 1, 7, 2, 3, 5, 6, 8, 10]
+    tree = sync(range(9), rows_for(new_ids))
+    assert ('delete', ('4',)) in tree.calls
+    assert ('insert', '10') in tree.calls
+    assert [call for call in tree.calls if call[0] == 'move'] == [('move', '7')]
+
+def test_diff_rows_reversed_order():
+    """測試反轉排序後能得到正確的順序。"""
+    sync(range(20), rows_for(reversed(range(20))))
+
+@pytest.mark.parametrize("old_ids, new_ids", [
+    ([], [3, 1, 2]),
+    ([3, 1, 2], []),
+    ([1, 2, 3, 4, 5], [5, 4, 9, 1, 3]),
+    ([5, 1, 4, 2, 3], [1, 2, 3, 4, 5]),
+    ([9, 1, 2], [1, 9, 2]),
+    ([9, 8, 1, 2, 3], [1, 2, 8, 3, 9]),
+])
+def test_diff_rows_matches_target_order(old_ids, new_ids):
+    """測試各種變化下套用操作後的順序與內容都與目標一致。"""
+    sync(old_ids, rows_for(new_ids, changed={1}))
+
+def test_row_sync_job_runs_in_chunks_and_cancels():
+    """測試差異更新工作可以分段執行，並在取消後停止套用剩餘操作。"""
+    tree = MockTreeview()
+    ops = diff_rows([], {}, rows_for(range(500)))
+    applied = []
+    job = RowSyncJob(tree, ops, on_op=applied.append)
+    assert job.step(budget=0) is False # 第一個時間片用完就暫停
+    assert 0 < job.done < job.total
+    assert tree.order == [str(i) for i in range(job.done)]
+
+    cancelled = []
+    job._on_cancel = lambda: cancelled.append(True)
+    job.cancel()
+    assert cancelled == [True]
+    assert job.step() is True
+    assert len(tree.order) == len(applied) < 500